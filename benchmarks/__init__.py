@@ -0,0 +1,4 @@
+"""Performance benchmarks for UniVo.
+
+Each module is runnable on its own, e.g. ``python -m benchmarks.ui_render``.
+"""
@@ -0,0 +1,88 @@
+"""Per-category grid load: sprite atlas vs. one file per pictogram.
+
+For every category of a synthetic catalog, loads all thumbnails either
+file by file (the current approach) or by cutting the category atlas,
+and reports file-open counts and load-time percentiles.
+
+File opens are counted with an audit hook, so anything that opens a
+``.png`` while loading is included.
+
+Usage::
+
+    python -m benchmarks.atlas_load --categories 20 --per-category 60
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+from benchmarks.harness import Timings, build_synthetic_catalog, report
+from univo.core.database import resolve_resource
+from univo.core.domain import Category
+from univo.core.services import PictogramService
+
+_opens = 0
+
+
+def _count_opens(event: str, args: tuple[Any, ...]) -> None:
+    global _opens  # noqa: PLW0603
+    if event == "open" and str(args[0]).endswith(".png"):
+        _opens += 1
+
+
+def load_per_file(service: PictogramService, category: Category) -> int:
+    """Decodes every pictogram image of a category individually."""
+    for pictogram in category:
+        path = pictogram.thumbnail_path or pictogram.image_path
+        if path:
+            with Image.open(resolve_resource(path)) as img:
+                img.load()
+    return len(category)
+
+
+def load_atlas(service: PictogramService, category: Category) -> int:
+    """Decodes a category by cutting its atlas."""
+    atlas = service.get_atlas(category.id)
+    return len(atlas.load()) if atlas else 0
+
+
+def main() -> None:
+    """Runs both loaders over every category and prints the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--per-category", type=int, default=60)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    sys.addaudithook(_count_opens)
+    global _opens  # noqa: PLW0603
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_synthetic_catalog(
+            Path(tmp), args.categories, args.per_category, atlases=True
+        )
+        service = PictogramService(db)
+        categories = [c for c in service.categories if c.id != "base"]
+
+        for name, loader in (("per-file", load_per_file), ("atlas", load_atlas)):
+            timings = Timings(f"{name} category load")
+            opens: list[int] = []
+            for _ in range(args.rounds):
+                for category in categories:
+                    _opens = 0
+                    with timings.measure():
+                        loaded = loader(service, category)
+                    assert loaded == len(category)
+                    opens.append(_opens)
+            report(
+                f"{name} | {args.per_category} pictograms/category, "
+                f"{max(opens)} file opens/category",
+                [timings]
+            )
+
+
+if __name__ == "__main__":
+    main()
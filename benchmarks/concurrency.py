@@ -0,0 +1,237 @@
+"""Concurrent read load on the service, optionally during reseeding.
+
+Reader threads issue a random mix of ``categories``,
+``get_category_by_id`` and ``service[id]`` calls, as Textual workers and
+Toga handlers do, while a reseeder keeps copying images into (and
+deleting them from) a subcategory of the first category and syncing
+it, as the resource watcher would. Reports throughput and latency percentiles per
+operation, and fails on any error or torn read.
+
+The thread-safety contract checked for ``PictogramService`` and
+``DatabaseManager``:
+
+1. No call raises, whatever runs concurrently.
+2. Categories other than the reseeded one always read complete: looked
+   up by id they hold all their pictograms and children, and each
+   pictogram resolves through ``service[id]``.
+3. Every result is internally consistent: ``categories`` yields each
+   category once with children that name it as their parent, and a
+   category never lists a pictogram twice.
+
+Usage::
+
+    python -m benchmarks.concurrency --threads 16 --seconds 5
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from benchmarks.harness import Timings, build_synthetic_catalog, report, write_png
+from univo.core.database import DatabaseManager
+from univo.core.services import PictogramService
+
+OPERATIONS = ("categories", "get_category_by_id", "__getitem__")
+
+
+@dataclass(slots=True)
+class StressResult:
+    """What a stress run measured and every contract violation it saw."""
+    timings: dict[str, Timings]
+    elapsed: float
+    reseeds: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def operations(self) -> int:
+        """Total number of calls made by the readers."""
+        return sum(len(series) for series in self.timings.values())
+
+    @property
+    def throughput(self) -> float:
+        """Reader calls per second, across all threads."""
+        return self.operations / self.elapsed if self.elapsed else 0.0
+
+
+class _Stress:
+    """Shared state of one stress run: the service, what readers should
+    see, and the violations they found."""
+    def __init__(self, db: DatabaseManager, reseed: bool) -> None:
+        self.db = db
+        self.service = PictogramService(db)
+        self.churn = f"{self.service.default_category.id}/churn"
+        self.churn_dir = db.resources_dir / self.churn
+        if reseed:
+            self.churn_dir.mkdir(parents=True, exist_ok=True)
+            write_png(self.churn_dir / "seed.png")
+            self.service.refresh(db.sync_resources([self.churn]))
+
+        categories = list(self.service.categories)
+        self.expected = {
+            category.id: [p.id for p in category]
+            for category in categories
+            if category.id != self.churn
+        }
+        self.expected_children = {
+            category.id: [c.id for c in category.children]
+            for category in categories
+        }
+        self.pictogram_ids = [
+            pic_id for ids in self.expected.values() for pic_id in ids
+        ]
+        self.category_ids = list(self.expected)
+        self.errors: list[str] = []
+        self.stop = threading.Event()
+        self.reseeds = 0
+
+    def check_categories(self, _rng: random.Random) -> None:
+        seen: set[str] = set()
+        for category in self.service.categories:
+            if category.id in seen:
+                self.errors.append(f"categories yielded {category.id!r} twice")
+            seen.add(category.id)
+            for child in category.children:
+                if child.parent_id != category.id:
+                    self.errors.append(
+                        f"{child.id!r} is not a child of {category.id!r}"
+                    )
+            ids = [p.id for p in category]
+            if len(ids) != len(set(ids)):
+                self.errors.append(f"{category.id!r} lists a pictogram twice")
+        if missing := self.expected.keys() - seen:
+            self.errors.append(f"categories missed {sorted(missing)}")
+
+    def check_category(self, rng: random.Random) -> None:
+        cat_id = rng.choice(self.category_ids)
+        category = self.service.get_category_by_id(cat_id)
+        if (
+            category is None
+            or [p.id for p in category] != self.expected[cat_id]
+            or [c.id for c in category.children] != self.expected_children[cat_id]
+        ):
+            self.errors.append(f"torn read of category {cat_id!r}")
+
+    def check_pictogram(self, rng: random.Random) -> None:
+        pic_id = rng.choice(self.pictogram_ids)
+        pictogram = self.service[pic_id]
+        if pictogram is None or pictogram.id != pic_id:
+            self.errors.append(f"torn read of pictogram {pic_id!r}")
+
+    def reader(
+        self, seed: int, timings: dict[str, Timings], start_line: threading.Barrier
+    ) -> None:
+        rng = random.Random(seed)
+        calls: dict[str, Callable[[random.Random], None]] = {
+            "categories": self.check_categories,
+            "get_category_by_id": self.check_category,
+            "__getitem__": self.check_pictogram,
+        }
+        start_line.wait()
+        while not self.stop.is_set():
+            name = rng.choice(OPERATIONS)
+            try:
+                with timings[name].measure():
+                    calls[name](rng)
+            except Exception as exc:
+                self.errors.append(f"{name} raised {exc!r}")
+            # Hand the GIL over between calls, like an event-driven UI
+            time.sleep(0)
+
+    def reseeder(self) -> None:
+        index = 0
+        while not self.stop.is_set():
+            image = self.churn_dir / f"img_{index % 8}.png"
+            if image.exists():
+                image.unlink()
+            else:
+                write_png(image, rgb=(index % 256, 0, 0))
+            try:
+                self.service.refresh(self.db.sync_resources([self.churn]))
+            except Exception as exc:
+                self.errors.append(f"reseed raised {exc!r}")
+            self.reseeds += 1
+            index += 1
+
+
+def run_stress(
+    db: DatabaseManager,
+    threads: int = 8,
+    seconds: float = 2.0,
+    reseed: bool = True
+) -> StressResult:
+    """Hammers a fresh service on ``db`` from ``threads`` readers.
+
+    Args:
+        db: Database to read. With ``reseed``, images are written into a
+            ``<first category>/churn`` folder of its resources directory.
+        threads: Number of reader threads.
+        seconds: How long the readers run.
+        reseed: Whether to keep syncing a changing category meanwhile.
+    """
+    stress = _Stress(db, reseed)
+    start_line = threading.Barrier(threads + 1)
+    per_thread = [{name: Timings(name) for name in OPERATIONS} for _ in range(threads)]
+    workers = [
+        threading.Thread(
+            target=stress.reader, args=(seed, timings, start_line), daemon=True
+        )
+        for seed, timings in enumerate(per_thread)
+    ]
+    if reseed:
+        workers.append(threading.Thread(target=stress.reseeder, daemon=True))
+    for worker in workers:
+        worker.start()
+    start_line.wait()
+    started = time.perf_counter()
+    time.sleep(seconds)
+    stress.stop.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    merged = {name: Timings(name) for name in OPERATIONS}
+    for timings in per_thread:
+        for name, series in timings.items():
+            merged[name].samples.extend(series.samples)
+    return StressResult(merged, elapsed, stress.reseeds, stress.errors)
+
+
+def main() -> None:
+    """Runs the stress test with and without reseeding and prints the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--per-category", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        seeded = build_synthetic_catalog(workdir, args.categories, args.per_category)
+        db = DatabaseManager(
+            seeded.db_path,
+            resources_dir=workdir / "resources",
+            cache_dir=seeded.cache_dir
+        )
+        failed = False
+        for reseed in (False, True):
+            result = run_stress(db, args.threads, args.seconds, reseed)
+            title = (
+                f"{args.threads} readers{', reseeding' if reseed else ''}: "
+                f"{result.throughput:,.0f} calls/s"
+                + (f", {result.reseeds} reseeds" if reseed else "")
+            )
+            report(title, list(result.timings.values()))
+            for error in result.errors[:10]:
+                print(f"  ERROR {error}")
+            failed |= bool(result.errors)
+        if failed:
+            raise SystemExit("Thread-safety contract violated")
+
+
+if __name__ == "__main__":
+    main()
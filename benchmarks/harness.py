@@ -0,0 +1,155 @@
+"""Shared helpers for UniVo benchmarks.
+
+Provides timing collection with percentile reporting and builders for
+synthetic catalogs of arbitrary size.
+"""
+import statistics
+import struct
+import time
+import zlib
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from univo.core.database import DatabaseManager
+
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass(slots=True)
+class Timings:
+    """A named series of measured durations, in seconds."""
+    name: str
+    samples: list[float] = field(default_factory=list)
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """Times the body of the ``with`` block and records it as a sample."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.append(time.perf_counter() - start)
+
+    def percentile(self, pct: int) -> float:
+        """Returns the given percentile (1-99) of the recorded samples."""
+        if len(self.samples) < 2:  # noqa: PLR2004
+            return self.samples[0] if self.samples else 0.0
+        cuts = statistics.quantiles(self.samples, n=100, method="inclusive")
+        return cuts[pct - 1]
+
+    def __len__(self) -> int:
+        """Returns the number of recorded samples."""
+        return len(self.samples)
+
+    def __str__(self) -> str:
+        """One report line with percentiles in milliseconds."""
+        cols = "  ".join(
+            f"p{pct}={self.percentile(pct) * 1000:8.2f}ms" for pct in PERCENTILES
+        )
+        worst = max(self.samples, default=0.0) * 1000
+        return f"{self.name:<28} n={len(self):<4} {cols}  max={worst:8.2f}ms"
+
+
+def report(title: str, timings: list[Timings]) -> None:
+    """Prints a titled block of percentile lines."""
+    print(f"\n== {title} ==")
+    for series in timings:
+        print(series)
+
+
+def write_png(
+    path: Path,
+    size: int = 64,
+    rgb: tuple[int, int, int] = (0, 0, 0)
+) -> None:
+    """Writes a solid-colour RGB PNG without any imaging dependency."""
+    row = b"\x00" + bytes(rgb) * size
+    raw = zlib.compress(row * size)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        body = tag + data
+        return (
+            struct.pack(">I", len(data)) + body
+            + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+        )
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", raw)
+        + chunk(b"IEND", b"")
+    )
+
+
+def build_synthetic_catalog(
+    workdir: Path,
+    categories: int,
+    per_category: int,
+    atlases: bool = False,
+    locales: Sequence[str] = ()
+) -> DatabaseManager:
+    """Creates a database holding a synthetic catalog under ``workdir``.
+
+    The catalog has a ``base`` category with yes/no plus ``categories``
+    categories of ``per_category`` pictograms, each backed by a real PNG.
+    Assets, thumbnails and (optionally) atlases are generated as seeding
+    would. Each of ``locales`` gets translated labels; regional locales
+    ('pt-BR') translate only every other pictogram, so lookups also
+    exercise the fallback to the language ('pt').
+    """
+    image_dir = workdir / "images"
+    image_dir.mkdir(parents=True, exist_ok=True)
+    db = DatabaseManager(str(workdir / "bench.db"), atlases=atlases)
+
+    rows: list[tuple[str, str, str, str, str]] = []
+    cat_rows = [("base", "Base")]
+    for pic_id in ("yes", "no"):
+        image = image_dir / f"{pic_id}.png"
+        write_png(image)
+        rows.append((pic_id, "base", pic_id.capitalize(), pic_id, str(image)))
+
+    for c in range(categories):
+        cat_id = f"cat{c}"
+        cat_rows.append((cat_id, f"Category {c}"))
+        for p in range(per_category):
+            pic_id = f"{cat_id}_pic{p}"
+            image = image_dir / f"{pic_id}.png"
+            write_png(image, rgb=(c % 256, p % 256, 128))
+            rows.append((pic_id, cat_id, f"Pic {p}", f"Pic {p}", str(image)))
+
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM pictograms")
+        cursor.execute("DELETE FROM categories")
+        cursor.execute("DELETE FROM pictogram_labels")
+        cursor.execute("DELETE FROM category_labels")
+        cursor.executemany(
+            "INSERT INTO categories (id, name) VALUES (?, ?)", cat_rows
+        )
+        cursor.executemany(
+            "INSERT INTO pictograms "
+            "(id, category_id, label, voice_command, icon_path) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        for locale in locales:
+            step = 2 if "-" in locale else 1
+            cursor.executemany(
+                "INSERT INTO pictogram_labels "
+                "(pictogram_id, locale, label, voice_command) VALUES (?, ?, ?, ?)",
+                [
+                    (pic_id, locale, f"{label} [{locale}]", None)
+                    for pic_id, _, label, _, _ in rows[::step]
+                ]
+            )
+            cursor.executemany(
+                "INSERT INTO category_labels (category_id, locale, name) "
+                "VALUES (?, ?, ?)",
+                [(cat_id, locale, f"{name} [{locale}]") for cat_id, name in cat_rows]
+            )
+        conn.commit()
+    db.refresh_thumbnails()
+    return db
@@ -0,0 +1,116 @@
+"""Locale switch on a large catalog: cold load vs. cached catalog.
+
+Switches a bilingual user back and forth between two languages and
+reports switch-time percentiles and SQL statements per switch. A cold
+switch loads the catalog of the new locale in bulk; a warm switch is
+served from the per-locale cache.
+
+For comparison, the ``per-pictogram`` series resolves every label with
+its own fallback query, as a naive localized lookup would.
+
+Usage::
+
+    python -m benchmarks.locale_switch --categories 50 --per-category 100
+"""
+import argparse
+import sqlite3
+import tempfile
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+
+from benchmarks.harness import Timings, build_synthetic_catalog, report
+from univo.core.database import DatabaseManager
+from univo.core.repositories import locale_chain
+from univo.core.services import PictogramService
+
+LOCALES = ("en", "pt", "pt-BR")
+
+
+class CountingDatabase(DatabaseManager):
+    """A DatabaseManager counting the SQL statements it executes."""
+    statements = 0
+
+    @contextmanager
+    def get_connection(self) -> Generator[sqlite3.Connection]:
+        """Opens a connection that counts every executed statement."""
+        with super().get_connection() as conn:
+            conn.set_trace_callback(self._count)
+            yield conn
+
+    def _count(self, statement: str) -> None:
+        self.statements += 1
+
+
+def per_pictogram_switch(db: DatabaseManager, locale: str) -> int:
+    """Resolves every label with one fallback query per pictogram."""
+    chain = locale_chain(locale)
+    marks = ", ".join("?" * len(chain))
+    resolved = 0
+    with db.get_connection() as conn:
+        ids = [row["id"] for row in conn.execute("SELECT id FROM pictograms")]
+        for pic_id in ids:
+            row = conn.execute(
+                f"SELECT label FROM pictogram_labels "
+                f"WHERE pictogram_id = ? AND locale IN ({marks}) "
+                f"ORDER BY length(locale) DESC LIMIT 1",
+                (pic_id, *chain)
+            ).fetchone()
+            if row is None:
+                conn.execute(
+                    "SELECT label FROM pictograms WHERE id = ?", (pic_id,)
+                ).fetchone()
+            resolved += 1
+    return resolved
+
+
+def main() -> None:
+    """Switches locales repeatedly and prints the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--per-category", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_synthetic_catalog(
+            Path(tmp), args.categories, args.per_category, locales=LOCALES
+        )
+        db = CountingDatabase(str(Path(tmp) / "bench.db"))
+        service = PictogramService(db)
+        size = len(service.catalog.pictograms)
+
+        cold, warm = Timings("cold switch"), Timings("cached switch")
+        naive = Timings("per-pictogram switch")
+        statements: dict[str, list[int]] = {t.name: [] for t in (cold, warm, naive)}
+        for i in range(args.rounds):
+            locale = ("pt-BR", "en")[i % 2]
+
+            service.invalidate()
+            db.statements = 0
+            with cold.measure():
+                service.set_locale(locale)
+            statements[cold.name].append(db.statements)
+
+            service.set_locale(("en", "pt-BR")[i % 2])
+            db.statements = 0
+            with warm.measure():
+                service.set_locale(locale)
+                catalog = service.catalog
+            assert len(catalog.pictograms) == size
+            statements[warm.name].append(db.statements)
+
+            db.statements = 0
+            with naive.measure():
+                per_pictogram_switch(db, locale)
+            statements[naive.name].append(db.statements)
+
+        report(
+            f"{size} pictograms | SQL statements per switch: "
+            + ", ".join(f"{name} {max(n)}" for name, n in statements.items()),
+            [cold, warm, naive]
+        )
+
+
+if __name__ == "__main__":
+    main()
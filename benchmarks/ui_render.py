@@ -0,0 +1,166 @@
+"""Headless render benchmarks for the Toga and Textual UIs.
+
+Drives ``UniVoTUIApp`` through Textual's ``run_test`` pilot and
+``UniVoTogaApp`` through Toga's dummy backend on synthetic catalogs of
+increasing size, reporting percentiles for:
+
+- home render (category list),
+- category open (pictogram grid),
+- navigation round-trip (category -> home -> category),
+- pictogram press handling (speech from a pre-synthesized silent cache).
+
+Usage::
+
+    python -m benchmarks.ui_render --sizes 5x10,20x50,50x100 --rounds 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from benchmarks.harness import Timings, build_synthetic_catalog, report
+from univo.core.services import PictogramService
+from univo.core.tts import AudioCache, NullPlayer, SilentEngine, SpeechService
+
+os.environ.setdefault("TOGA_BACKEND", "toga_dummy")
+
+TUI_SIZE = (160, 50)
+
+
+def _series() -> list[Timings]:
+    return [
+        Timings("home render"),
+        Timings("category open"),
+        Timings("round-trip"),
+        Timings("pictogram press"),
+    ]
+
+
+def silent_speech(audio_dir: Path, service: PictogramService) -> SpeechService:
+    """A speech service with every voice command already synthesized."""
+    speech = SpeechService(SilentEngine(), AudioCache(audio_dir), NullPlayer())
+    speech.prepare(service.voice_commands)
+    speech.wait()
+    return speech
+
+
+async def bench_tui(
+    service: PictogramService,
+    speech: SpeechService,
+    rounds: int
+) -> list[Timings]:
+    """Measures the Textual UI through the ``run_test`` pilot."""
+    from textual.widgets import Button  # noqa: PLC0415
+
+    from univo.ui.tui.app import UniVoTUIApp  # noqa: PLC0415
+
+    home, open_, trip, press = series = _series()
+    category_ids = [c.id for c in service.categories if c.id != "base"]
+    app = UniVoTUIApp(service, speech)
+
+    async with app.run_test(size=TUI_SIZE) as pilot:
+        for i in range(rounds):
+            cat_id = category_ids[i % len(category_ids)]
+
+            app.current_category_id = None
+            with home.measure():
+                await app.refresh_view()
+                await pilot.pause()
+
+            app.current_category_id = cat_id
+            with open_.measure():
+                await app.refresh_view()
+                await pilot.pause()
+
+            with trip.measure():
+                app.query_one("#btn-home", Button).press()
+                await pilot.pause()
+                app.query_one(f"#cat-{cat_id}", Button).press()
+                await pilot.pause()
+            assert app.current_category_id == cat_id
+
+            category = service.get_category_by_id(cat_id)
+            assert category is not None
+            button = app.query_one(f"#btn-{category[0].id}", Button)
+            with press.measure():
+                button.press()
+                await pilot.pause()
+    return series
+
+
+def bench_toga(app: Any, service: PictogramService, rounds: int) -> list[Timings]:
+    """Measures the Toga UI on the dummy backend."""
+    home, open_, trip, press = series = _series()
+    category_ids = [c.id for c in service.categories if c.id != "base"]
+    app.service = service
+
+    for i in range(rounds):
+        cat_id = category_ids[i % len(category_ids)]
+
+        with home.measure():
+            app.go_home(None)
+        with open_.measure():
+            app.select_category(cat_id)
+        with trip.measure():
+            app.go_home(None)
+            app.select_category(cat_id)
+
+        category = service.get_category_by_id(cat_id)
+        assert category is not None
+        handler = app.create_handler(category[0])
+        with press.measure():
+            app.loop.run_until_complete(handler(None))
+    return series
+
+
+def parse_sizes(text: str) -> list[tuple[int, int]]:
+    """Parses ``CATSxPICS`` pairs, e.g. ``5x10,20x50``."""
+    sizes = []
+    for item in text.split(","):
+        cats, pics = item.lower().split("x")
+        sizes.append((int(cats), int(pics)))
+    return sizes
+
+
+def main() -> None:
+    """Runs the benchmark matrix and prints a percentile report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=parse_sizes,
+        default=parse_sizes("5x10,20x50,50x100"),
+        help="Catalog sizes as CATEGORIESxPICTOGRAMS (default: 5x10,20x50,50x100)"
+    )
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--ui", choices=["both", "toga", "tui"], default="both")
+    args = parser.parse_args()
+
+    toga_app: Any = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for cats, pics in args.sizes:
+            workdir = Path(tmp) / f"{cats}x{pics}"
+            service = PictogramService(build_synthetic_catalog(workdir, cats, pics))
+            label = f"{cats} categories x {pics} pictograms"
+
+            if args.ui in ("both", "tui"):
+                speech = silent_speech(Path(tmp) / "audio", service)
+                tui_series = asyncio.run(bench_tui(service, speech, args.rounds))
+                report(f"Textual | {label}", tui_series)
+
+            if args.ui in ("both", "toga"):
+                if toga_app is None:
+                    # toga.App is a process-wide singleton; build it once
+                    from univo.ui.toga.app import UniVoTogaApp  # noqa: PLC0415
+                    toga_app = UniVoTogaApp(
+                        "UniVo",
+                        "org.univo.bench",
+                        service=service,
+                        speech=silent_speech(Path(tmp) / "audio", service)
+                    )
+                report(f"Toga | {label}", bench_toga(toga_app, service, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
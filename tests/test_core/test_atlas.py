@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from univo.core.database import DatabaseManager
+from univo.core.services import PictogramService
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def resources_dir(tmp_path: Path) -> Path:
+    folder = tmp_path / "resources" / "food"
+    folder.mkdir(parents=True)
+    for name, colour in (("apple", "red"), ("bread", "brown"), ("milk", "white")):
+        Image.new("RGB", (300, 300), colour).save(folder / f"{name}.png")
+    return tmp_path / "resources"
+
+@pytest.fixture
+def service(tmp_path: Path, resources_dir: Path) -> PictogramService:
+    return PictogramService(DatabaseManager(
+        str(tmp_path / "test_univo.db"),
+        resources_dir=resources_dir,
+        cache_dir=tmp_path / "cache",
+        atlases=True
+    ))
+
+def test_atlas_covers_category(service: PictogramService) -> None:
+    category = service.get_category_by_id("food")
+    atlas = service.get_atlas("food")
+    assert category is not None and atlas is not None
+    assert len(atlas) == len(category)
+
+    images = atlas.load()
+    opaque = 255
+    for pictogram in category:
+        assert pictogram.asset_hash is not None
+        assert pictogram.asset_hash in atlas
+        assert images[pictogram.asset_hash].getpixel((0, 0))[3] == opaque
+
+def test_atlas_rebuilt_when_source_changes(
+    service: PictogramService,
+    resources_dir: Path
+) -> None:
+    before = service.get_atlas("food")
+    source = resources_dir / "food" / "apple.png"
+    Image.new("RGB", (300, 300), "green").save(source)
+    os.utime(source, ns=(0, 1))
+
+    assert isinstance(service.db, DatabaseManager)
+    service.db.refresh_thumbnails()
+    after = service.get_atlas("food")
+    assert before is not None and after is not None
+    assert after.path != before.path
+
+def test_no_atlas_when_disabled(tmp_path: Path, resources_dir: Path) -> None:
+    service = PictogramService(DatabaseManager(
+        str(tmp_path / "plain.db"),
+        resources_dir=resources_dir,
+        cache_dir=tmp_path / "cache"
+    ))
+    assert service.get_atlas("food") is None
+
+def test_unreadable_image_left_out(tmp_path: Path, resources_dir: Path) -> None:
+    apple = (resources_dir / "food" / "apple.png").read_bytes()
+    (resources_dir / "food" / "broken.png").write_bytes(apple[:64])
+    service = PictogramService(DatabaseManager(
+        str(tmp_path / "broken.db"),
+        resources_dir=resources_dir,
+        cache_dir=tmp_path / "cache",
+        atlases=True
+    ))
+    broken = service["broken"]
+    atlas = service.get_atlas("food")
+    assert broken is not None and atlas is not None
+    assert broken.asset_hash not in atlas
+    assert len(atlas) == len(["apple", "bread", "milk"])
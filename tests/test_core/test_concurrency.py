@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from benchmarks.concurrency import run_stress
+from benchmarks.harness import build_synthetic_catalog
+from univo.core.database import DatabaseManager
+
+
+def test_reads_stay_whole_while_reseeding(tmp_path: Path) -> None:
+    seeded = build_synthetic_catalog(tmp_path, categories=4, per_category=5)
+    db = DatabaseManager(
+        seeded.db_path,
+        resources_dir=tmp_path / "resources",
+        cache_dir=seeded.cache_dir
+    )
+    result = run_stress(db, threads=4, seconds=0.5, reseed=True)
+    # Errors include every torn read the readers saw
+    assert result.errors == []
+    assert result.operations > 0
+    assert result.reseeds > 0
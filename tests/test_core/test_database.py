@@ -1,8 +1,12 @@
+import shutil
+import sqlite3
 from pathlib import Path
+from typing import Any
 
 import pytest
 
-from univo.core.database import DatabaseManager
+from univo.core.database import MAX_PARAMS, RESOURCES_DIR, DatabaseManager
+from univo.core.services import PictogramService
 
 
 @pytest.fixture
@@ -73,3 +77,206 @@ def test_manual_insert(db_manager: DatabaseManager) -> None:
         cursor.execute("SELECT * FROM categories WHERE id = 'test_cat'")
         row = cursor.fetchone()
         assert row['name'] == "Test Category"
+
+def test_duplicate_images_share_one_asset(tmp_path: Path) -> None:
+    """Copies of the same image resolve to a single canonical asset."""
+    image = (RESOURCES_DIR / "base" / "yes.png").read_bytes()
+    for folder in ("feelings", "base"):
+        (tmp_path / "res" / folder).mkdir(parents=True)
+        (tmp_path / "res" / folder / f"{folder}_ok.png").write_bytes(image)
+
+    mgr = DatabaseManager(
+        str(tmp_path / "dedup.db"),
+        resources_dir=tmp_path / "res",
+        cache_dir=tmp_path / "cache"
+    )
+    with mgr.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM assets")
+        assert cursor.fetchone()[0] == 1
+        cursor.execute("SELECT COUNT(DISTINCT asset_hash) FROM pictograms")
+        assert cursor.fetchone()[0] == 1
+
+    service = PictogramService(mgr)
+    first, second = service["feelings_ok"], service["base_ok"]
+    assert first is not None and second is not None
+    assert first.asset_hash == second.asset_hash
+    assert first.image_path == second.image_path
+
+@pytest.mark.parametrize("progressive", [False, True])
+def test_same_file_name_in_two_folders(tmp_path: Path, progressive: bool) -> None:
+    """Each folder's copy gets its own pictogram, sharing one asset."""
+    image = (RESOURCES_DIR / "base" / "yes.png").read_bytes()
+    for folder in ("food", "drinks"):
+        (tmp_path / "res" / folder).mkdir(parents=True)
+        (tmp_path / "res" / folder / "juice.png").write_bytes(image)
+    (tmp_path / "res" / "food" / "labels.pt-BR.json").write_text(
+        '{"juice": "Suco"}', encoding="utf-8"
+    )
+
+    mgr = DatabaseManager(
+        str(tmp_path / "same.db"),
+        resources_dir=tmp_path / "res",
+        cache_dir=tmp_path / "cache",
+        progressive=progressive
+    )
+    while mgr.seed_pending():
+        pass
+    service = PictogramService(mgr, locale="pt-BR")
+    assert {
+        cat_id: [p.id for p in service.pictograms_under(cat_id)]
+        for cat_id in ("drinks", "food")
+    } == {"drinks": ["juice"], "food": ["food/juice"]}
+    drinks, food = service["juice"], service["food/juice"]
+    assert drinks is not None and food is not None
+    assert (drinks.label, food.label) == ("Juice", "Suco")
+    assert drinks.asset_hash == food.asset_hash
+
+def test_same_name_with_two_extensions(tmp_path: Path) -> None:
+    """Images differing only in extension get a pictogram each."""
+    image = (RESOURCES_DIR / "base" / "yes.png").read_bytes()
+    (tmp_path / "res" / "food").mkdir(parents=True)
+    # Distinct bytes, so each pictogram keeps an asset of its own
+    names = ("x.png", "x.jpg", "x.jpeg", "x.JPG")
+    for name in names[:2]:
+        (tmp_path / "res" / "food" / name).write_bytes(image + name.encode())
+
+    mgr = DatabaseManager(
+        str(tmp_path / "ext.db"),
+        resources_dir=tmp_path / "res",
+        cache_dir=tmp_path / "cache"
+    )
+    for name in names[2:]:
+        (tmp_path / "res" / "food" / name).write_bytes(image + name.encode())
+    mgr.sync_resources(["food"])
+    service = PictogramService(mgr)
+    assert sorted(p.id for p in service.pictograms_under("food")) == [
+        "food/x", "food/x.jpeg", "food/x.png", "x"
+    ]
+    for pic_id, name in zip(
+        ("food/x.png", "x", "food/x.jpeg", "food/x"), names, strict=True
+    ):
+        pictogram = service[pic_id]
+        assert pictogram is not None
+        assert pictogram.image_path is not None
+        assert pictogram.image_path.endswith(f"/{name}")
+
+def test_big_subtree_stays_under_the_parameter_limit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Refreshing and dropping a huge subtree binds ids in chunks."""
+    for index in range(MAX_PARAMS + 100):
+        (tmp_path / "res" / "big" / f"sub{index}").mkdir(parents=True)
+    connect = sqlite3.connect
+
+    def limited(*args: Any, **kwargs: Any) -> sqlite3.Connection:
+        conn: sqlite3.Connection = connect(*args, **kwargs)
+        # The default of SQLite releases before 3.32
+        conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", limited)
+    mgr = DatabaseManager(
+        str(tmp_path / "big.db"),
+        resources_dir=tmp_path / "res",
+        cache_dir=tmp_path / "cache"
+    )
+    service = PictogramService(mgr)
+    subtree = [c.id for c in service.subtree("big")]
+    assert len(subtree) == MAX_PARAMS + 101
+    service.refresh(subtree)
+    assert len(service.subtree("big")) == len(subtree)
+
+    shutil.rmtree(tmp_path / "res" / "big")
+    service.refresh(mgr.sync_resources(["big"]))
+    assert service.get_category_by_id("big") is None
+    assert list(service.categories) == []
+
+def test_seed_labels(db_manager: DatabaseManager) -> None:
+    """Bundled labels.<locale>.json files are seeded as translations."""
+    service = PictogramService(db_manager, locale="pt-BR")
+    yes, drink = service["yes"], service["drink"]
+    assert yes is not None and drink is not None
+    assert (yes.label, yes.voice_command) == ("Sim", "Sim")
+    assert (drink.label, drink.voice_command) == ("Beber", "Quero beber")
+    category = service.get_category_by_id("food")
+    assert category is not None
+    assert category.name == "Comida"
+
+def test_nested_categories(tmp_path: Path) -> None:
+    """Nested folders seed a hierarchy kept in the closure table."""
+    image = (RESOURCES_DIR / "base" / "yes.png").read_bytes()
+    for folder, name in (
+        ("food", "food"), ("food/fruit", "apple"), ("food/fruit/citrus", "lemon")
+    ):
+        (tmp_path / "res" / folder).mkdir(parents=True)
+        (tmp_path / "res" / folder / f"{name}.png").write_bytes(image)
+
+    mgr = DatabaseManager(
+        str(tmp_path / "nested.db"),
+        resources_dir=tmp_path / "res",
+        cache_dir=tmp_path / "cache"
+    )
+    service = PictogramService(mgr)
+    assert [c.id for c in service.root_categories] == ["food"]
+    assert [c.id for c in service.subtree("food")] == [
+        "food", "food/fruit", "food/fruit/citrus"
+    ]
+    assert [c.name for c in service.breadcrumbs("food/fruit/citrus")] == [
+        "Food", "Fruit", "Citrus"
+    ]
+    assert [p.id for p in service.pictograms_under("food/fruit")] == [
+        "apple", "lemon"
+    ]
+    fruit = service.get_category_by_id("food/fruit")
+    assert fruit is not None
+    assert [c.id for c in fruit.children] == ["food/fruit/citrus"]
+
+    # Moving a subtree re-links every descendant
+    with mgr.get_connection() as conn:
+        conn.execute(
+            "UPDATE categories SET parent_id = NULL WHERE id = 'food/fruit'"
+        )
+        conn.commit()
+    assert service.repository.ancestor_ids("food/fruit/citrus") == [
+        "food/fruit", "food/fruit/citrus"
+    ]
+    assert service.repository.subtree_ids("food") == ["food"]
+    # The service keeps reading its snapshot until told to refresh
+    assert [c.id for c in service.breadcrumbs("food/fruit/citrus")] == [
+        "food", "food/fruit", "food/fruit/citrus"
+    ]
+    service.refresh(["food", "food/fruit"])
+    assert [c.id for c in service.subtree("food")] == ["food"]
+
+def test_migrate_to_normalized_paths(tmp_path: Path) -> None:
+    """Older databases are upgraded to per-category folders in place."""
+    db_path = str(tmp_path / "old.db")
+    mgr = DatabaseManager(db_path, cache_dir=tmp_path / "cache")
+    pictograms = PictogramService(mgr).catalog.pictograms.values()
+    before = {p.id: (p.image_path, p.voice_command) for p in pictograms}
+    # Rewind to the layout before schema 1
+    with mgr.get_connection() as conn:
+        conn.executescript("""
+            UPDATE pictograms SET icon_path = (
+                SELECT path FROM pictogram_files f WHERE f.id = pictograms.id
+            ), file_name = NULL, voice_command = label;
+            UPDATE categories SET dir = NULL;
+            PRAGMA user_version = 0;
+        """)
+
+    mgr = DatabaseManager(db_path, cache_dir=tmp_path / "cache")
+    with mgr.get_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+        assert conn.execute(
+            "SELECT COUNT(*) FROM pictograms "
+            "WHERE icon_path IS NOT NULL OR voice_command = label"
+        ).fetchone()[0] == 0
+        row = conn.execute("SELECT dir FROM categories WHERE id = 'base'").fetchone()
+        assert row["dir"] == "resources/pictograms/base"
+
+    catalog = PictogramService(mgr).catalog
+    pictograms = catalog.pictograms.values()
+    assert {p.id: (p.image_path, p.voice_command) for p in pictograms} == before
+    yes = catalog["yes"]
+    assert yes.voice_command is yes.label
@@ -1,6 +1,6 @@
 import pytest
 
-from univo.core.domain import Category, Pictogram
+from univo.core.domain import Catalog, Category, Pictogram, Sentence
 
 
 def test_pictogram_and_category() -> None:
@@ -50,3 +50,56 @@ def test_pictogram_and_category() -> None:
     assert cat.p2 == p2
     with pytest.raises(AttributeError):
         _ = cat.nonexistent
+
+def test_sentence() -> None:
+    """Verify Sentence behaves like an editable sequence of pictograms."""
+    want = Pictogram(id="want", label="Want", voice_command="I want")
+    water = Pictogram(id="water", label="Water")
+
+    sentence = Sentence()
+    assert len(sentence) == 0
+    assert sentence.pop() is None
+
+    sentence.append(want)
+    sentence.append(water)
+    assert list(sentence) == [want, water]
+    assert sentence[-1] == water
+    assert str(sentence) == "Want Water"
+    assert sentence.voice_commands == ["I want", "Water"]
+    assert sentence.text == "I want Water"
+    assert "Sentence(['want', 'water'])" == repr(sentence)
+
+    assert sentence.pop() == water
+    sentence.clear()
+    assert not sentence
+
+def test_catalog_patched() -> None:
+    """Verify patching copies changed categories and their ancestors only."""
+    apple = Pictogram(id="apple", label="Apple")
+    pear = Pictogram(id="pear", label="Pear")
+    water = Pictogram(id="water", label="Water")
+    food = Category(id="food", name="Food", pictograms=[])
+    fruit = Category(id="food/fruit", name="Fruit", pictograms=[apple],
+                     parent_id="food")
+    drinks = Category(id="drinks", name="Drinks", pictograms=[water])
+    catalog = Catalog(
+        locale=None,
+        categories={c.id: c for c in (food, fruit, drinks)},
+        pictograms={"apple": apple, "water": water}
+    )
+    catalog.link_children()
+
+    new_fruit = Category(id="food/fruit", name="Fruit", pictograms=[pear],
+                         parent_id="food")
+    fresh = Catalog(None, {"food/fruit": new_fruit}, {"pear": pear})
+    patched = catalog.patched(fresh, ["food/fruit"])
+
+    assert patched["pear"] is pear
+    assert "apple" not in patched.pictograms
+    assert patched.categories["drinks"] is drinks
+    assert patched.categories["food"] is not food
+    assert patched.categories["food"].children == [new_fruit]
+    # The original catalog is left as it was
+    assert catalog["apple"] is apple
+    assert food.children == [fruit]
+    assert list(catalog.categories) == list(patched.categories)
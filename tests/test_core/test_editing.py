@@ -0,0 +1,204 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from univo.core.database import DatabaseManager
+from univo.core.repositories import MemoryRepository
+from univo.core.services import PictogramService
+
+
+@pytest.fixture
+def service(tmp_path: Path) -> PictogramService:
+    resources = tmp_path / "res"
+    for folder in ("food", "food/fruit", "drinks"):
+        (resources / folder).mkdir(parents=True)
+    db = DatabaseManager(
+        str(tmp_path / "edit.db"), resources_dir=resources, cache_dir=tmp_path / "c"
+    )
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO pictograms (id, category_id, label, voice_command) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                ("bread", "food", "Bread", "Bread"),
+                ("apple", "food/fruit", "Apple", "Apple"),
+                ("water", "drinks", "Water", "Water"),
+            ]
+        )
+        conn.commit()
+    return PictogramService(db)
+
+def ids(service: PictogramService, category_id: str) -> list[str]:
+    category = service.get_category_by_id(category_id)
+    assert category is not None
+    return [p.id for p in category]
+
+def test_edit_batch(service: PictogramService) -> None:
+    drinks = service.get_category_by_id("drinks")
+    generation = service.generation
+
+    with service.edit() as edit:
+        edit.add_category("toys", "Toys")
+        edit.add_pictogram("ball", "toys", "Ball")
+        edit.move_pictograms(["bread", "apple"], "toys")
+        edit.rename_pictogram("ball", "Bola", locale="pt")
+        edit.move_category("food/fruit", "toys")
+
+    assert service.generation > generation
+    assert sorted(ids(service, "toys")) == ["apple", "ball", "bread"]
+    assert ids(service, "food") == []
+    toys = service.get_category_by_id("toys")
+    assert toys is not None
+    assert [c.id for c in toys.children] == ["food/fruit"]
+    assert [c.id for c in service.breadcrumbs("food/fruit")] == ["toys", "food/fruit"]
+    assert service.set_locale("pt").pictograms["ball"].voice_command == "Bola"
+    # Categories the edit didn't touch keep their cached objects
+    assert service.set_locale(None).categories["drinks"] is drinks
+
+def test_failed_edit_changes_nothing(service: PictogramService) -> None:
+    with pytest.raises(KeyError), service.edit() as edit:
+        edit.move_pictogram("bread", "drinks")
+        edit.move_pictogram("missing", "drinks")
+    with pytest.raises(sqlite3.IntegrityError), service.edit() as edit:
+        edit.add_pictogram("water", "food", "Water")
+    with pytest.raises(ValueError, match="below itself"), service.edit() as edit:
+        edit.move_category("food", "food/fruit")
+
+    assert ids(service, "food") == ["bread"]
+    assert service.undo() == set()
+
+def test_undo(service: PictogramService) -> None:
+    before = service.db
+    assert before is not None
+    with service.edit() as edit:
+        edit.rename_category("food", "Meals")
+        edit.rename_pictogram("water", "Juice", "I want juice")
+    with service.edit() as edit:
+        edit.delete_category("food")
+    assert service.get_category_by_id("food/fruit") is None
+    assert service["apple"] is None
+
+    assert service.undo() == {"food", "food/fruit"}
+    assert ids(service, "food/fruit") == ["apple"]
+    food = service.get_category_by_id("food")
+    assert food is not None
+    assert food.name == "Meals"
+    assert [c.id for c in food.children] == ["food/fruit"]
+    assert service.subtree("food")[-1].id == "food/fruit"
+
+    service.undo()
+    water = service["water"]
+    assert water is not None
+    assert (water.label, water.voice_command) == ("Water", "Water")
+    assert service.undo() == set()
+
+def test_read_only_catalog() -> None:
+    service = PictogramService(MemoryRepository.from_categories([]))
+    with pytest.raises(RuntimeError, match="read-only"), service.edit():
+        pass
+
+def test_moved_pictogram_keeps_its_image(tmp_path: Path) -> None:
+    resources = tmp_path / "res"
+    for folder in ("food", "drinks"):
+        (resources / folder).mkdir(parents=True)
+    (resources / "food" / "bread.png").write_bytes(b"not really a png")
+    service = PictogramService(DatabaseManager(
+        str(tmp_path / "move.db"), resources_dir=resources, cache_dir=tmp_path / "c"
+    ))
+    bread = service["bread"]
+    assert bread is not None
+    assert bread.voice_command is bread.label
+
+    with service.edit() as edit:
+        edit.move_pictogram("bread", "drinks")
+    moved = service["bread"]
+    assert moved is not None
+    assert moved.image_path == bread.image_path
+    assert ids(service, "drinks") == ["bread"]
+
+def test_edits_survive_resource_sync(tmp_path: Path) -> None:
+    resources = tmp_path / "res"
+    for folder in ("food", "toys"):
+        (resources / folder).mkdir(parents=True)
+    for name in ("apple", "bread"):
+        (resources / "food" / f"{name}.png").write_bytes(b"not really a png")
+    db = DatabaseManager(
+        str(tmp_path / "sync.db"), resources_dir=resources, cache_dir=tmp_path / "c"
+    )
+    service = PictogramService(db)
+    with service.edit() as edit:
+        edit.move_pictogram("apple", "toys")
+        edit.delete_pictogram("bread")
+
+    (resources / "food" / "cherry.png").write_bytes(b"not really a png")
+    service.refresh(db.sync_resources(["food"]))
+    assert (ids(service, "food"), ids(service, "toys")) == (["cherry"], ["apple"])
+
+    assert service.undo() == {"food", "toys"}
+    assert sorted(ids(service, "food")) == ["apple", "bread", "cherry"]
+    assert ids(service, "toys") == []
+    # The undone delete no longer hides bread from syncs
+    service.refresh(db.sync_resources(["food"]))
+    assert sorted(ids(service, "food")) == ["apple", "bread", "cherry"]
+
+def test_undo_keeps_rows_a_sync_added_back(tmp_path: Path) -> None:
+    resources = tmp_path / "res"
+    (resources / "food").mkdir(parents=True)
+    (resources / "food" / "bread.png").write_bytes(b"not really a png")
+    db = DatabaseManager(
+        str(tmp_path / "sync.db"), resources_dir=resources, cache_dir=tmp_path / "c"
+    )
+    service = PictogramService(db)
+    with service.edit() as edit:
+        edit.delete_pictogram("bread")
+
+    # A new file for the deleted pictogram brings it back
+    (resources / "food" / "bread.png").rename(resources / "food" / "bread.jpg")
+    service.refresh(db.sync_resources(["food"]))
+    assert service.undo() == {"food"}
+    bread = service["bread"]
+    assert bread is not None
+    assert bread.image_path is not None
+    assert bread.image_path.endswith("/bread.jpg")
+
+def test_deleted_category_stays_deleted(tmp_path: Path) -> None:
+    resources = tmp_path / "res"
+    for folder, name in (("food", "apple"), ("toys", "ball"), ("toys/cars", "bus")):
+        (resources / folder).mkdir(parents=True)
+        (resources / folder / f"{name}.png").write_bytes(b"not really a png")
+    db = DatabaseManager(
+        str(tmp_path / "sync.db"), resources_dir=resources, cache_dir=tmp_path / "c"
+    )
+    service = PictogramService(db)
+    with service.edit() as edit:
+        edit.delete_category("toys")
+
+    (resources / "toys" / "car.png").write_bytes(b"not really a png")
+    service.refresh(db.sync_resources(["toys", "toys/cars"]))
+    assert [c.id for c in service.categories] == ["food"]
+
+    service.undo()
+    service.refresh(db.sync_resources(["toys"]))
+    assert ids(service, "toys") == ["ball", "car"]
+    assert ids(service, "toys/cars") == ["bus"]
+
+def test_category_deleted_while_queued(tmp_path: Path) -> None:
+    resources = tmp_path / "res"
+    for folder, name in (("base", "yes"), ("toys", "ball"), ("toys/cars", "bus")):
+        (resources / folder).mkdir(parents=True)
+        (resources / folder / f"{name}.png").write_bytes(b"not really a png")
+    db = DatabaseManager(
+        str(tmp_path / "queued.db"),
+        resources_dir=resources,
+        cache_dir=tmp_path / "c",
+        progressive=True
+    )
+    service = PictogramService(db)
+    with service.edit() as edit:
+        edit.delete_category("toys")
+    while db.seed_pending():
+        pass
+    service.refresh(["toys"])
+    assert [c.id for c in service.categories] == ["base"]
+    assert service["ball"] is None
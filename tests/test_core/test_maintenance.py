@@ -0,0 +1,96 @@
+from itertools import count
+from pathlib import Path
+
+import pytest
+
+from univo.core.database import DatabaseManager
+from univo.core.maintenance import (
+    OPTIMIZE_WRITES,
+    VACUUM_MIN_FREE_PAGES,
+    MaintenanceScheduler,
+    database_stats,
+)
+from univo.core.services import PictogramService
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> DatabaseManager:
+    resources = tmp_path / "res"
+    (resources / "food").mkdir(parents=True)
+    return DatabaseManager(
+        str(tmp_path / "maint.db"), resources_dir=resources, cache_dir=tmp_path / "c"
+    )
+
+def log_events(db: DatabaseManager, rows: int) -> None:
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO usage_events (pictogram_id, occurred_at) VALUES (?, 0)",
+            [("x" * 200,)] * rows
+        )
+        conn.commit()
+
+def test_writes_make_steps_due(db: DatabaseManager) -> None:
+    scheduler = MaintenanceScheduler(db)
+    assert scheduler.due() == []
+    assert scheduler.run() is None
+
+    # Writes made while opening (seeding) count too
+    seeded = scheduler.pending_writes()["optimize"]
+    log_events(db, OPTIMIZE_WRITES)
+    assert scheduler.pending_writes()["optimize"] == seeded + OPTIMIZE_WRITES
+    assert scheduler.due() == ["optimize"]
+    result = scheduler.run()
+    assert result is not None
+    assert result.steps == ["optimize"]
+    assert scheduler.due() == []
+
+    # Counts not yet acted on survive a restart
+    log_events(db, 1)
+    scheduler.close()
+    reopened = DatabaseManager(db.db_path, db.resources_dir, db.cache_dir)
+    assert MaintenanceScheduler(reopened).pending_writes()["optimize"] == 1
+
+def test_board_edits_count_as_writes(db: DatabaseManager) -> None:
+    scheduler = MaintenanceScheduler(db)
+    seeded = scheduler.pending_writes()["optimize"]
+    with PictogramService(db).edit() as edit:
+        for index in range(OPTIMIZE_WRITES):
+            edit.add_category(f"cat{index}", f"Category {index}")
+    assert scheduler.pending_writes()["optimize"] >= seeded + OPTIMIZE_WRITES
+    assert scheduler.due() == ["optimize"]
+
+def test_vacuum_reclaims_free_pages(db: DatabaseManager) -> None:
+    log_events(db, VACUUM_MIN_FREE_PAGES * 20)
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM usage_events")
+        conn.commit()
+    scheduler = MaintenanceScheduler(db)
+    assert "vacuum" in scheduler.due()
+
+    result = scheduler.run()
+    assert result is not None
+    assert result.interrupted is None
+    assert result.after.freelist_count == 0
+    assert result.after.size < result.before.size
+    assert database_stats(db) == result.after
+
+def test_budget_interrupts_a_step(db: DatabaseManager) -> None:
+    log_events(db, VACUUM_MIN_FREE_PAGES * 40)
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM usage_events WHERE id > 1000")
+        conn.commit()
+    # Every reading of the clock is a second later: the budget runs out
+    scheduler = MaintenanceScheduler(db, budget=0.5, clock=count().__next__)
+    result = scheduler.run(["vacuum"])
+    assert result is not None
+    assert (result.steps, result.interrupted) == ([], "vacuum")
+    assert result.after == result.before
+    assert "vacuum" in scheduler.due()
+
+def test_idle(db: DatabaseManager) -> None:
+    now = [0.0]
+    scheduler = MaintenanceScheduler(db, idle_after=10, clock=lambda: now[0])
+    now[0] = 10
+    assert scheduler.idle
+    scheduler.touch()
+    assert not scheduler.idle
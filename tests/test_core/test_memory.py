@@ -0,0 +1,63 @@
+import tracemalloc
+from collections.abc import Iterator
+from functools import partial
+
+import pytest
+
+from univo.core.domain import Category, Pictogram
+from univo.core.memory import (
+    SHRINK_ORDER,
+    MemoryBudget,
+    breakdown,
+    format_breakdown,
+    start_tracing,
+)
+from univo.core.repositories import MemoryRepository
+from univo.core.services import PictogramService
+
+
+@pytest.fixture
+def tracing() -> Iterator[None]:
+    start_tracing()
+    yield
+    tracemalloc.stop()
+
+def test_breakdown_by_subsystem(tracing: None) -> None:
+    pictograms = [Pictogram(id=f"p{i}", label=f"Pic {i}") for i in range(2000)]
+    service = PictogramService(MemoryRepository.from_categories(
+        [Category(id="c", name="C", pictograms=pictograms)]
+    ))
+    assert service["p1"] is not None
+
+    sizes = breakdown()
+    assert set(sizes) >= {"domain", "widgets", "icons", "other"}
+    assert sizes["domain"] > 0
+    assert list(sizes.values()) == sorted(sizes.values(), reverse=True)
+    assert "domain" in format_breakdown(sizes)
+
+def test_budget_shrinks_in_order() -> None:
+    usage = [100]
+    shrunk: list[str] = []
+    budget = MemoryBudget(50, measure=lambda: usage[0])
+    for cache in reversed(SHRINK_ORDER):
+        budget.register(cache, partial(shrunk.append, cache))
+
+    assert [budget.check() for _ in range(4)] == [*SHRINK_ORDER, None]
+    assert shrunk == list(SHRINK_ORDER)
+
+    # Back under budget, the order starts over
+    usage[0] = 10
+    assert budget.check() is None
+    usage[0] = 100
+    assert budget.check() == SHRINK_ORDER[0]
+
+    with pytest.raises(ValueError, match="Unknown cache"):
+        budget.register("audio", lambda: None)
+
+def test_service_shrink() -> None:
+    service = PictogramService(MemoryRepository.from_categories([]))
+    active = service.catalog
+    service.catalog_for("pt")
+    assert service.shrink() == 1
+    assert service.shrink() == 0
+    assert service.catalog is active
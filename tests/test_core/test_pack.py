@@ -0,0 +1,112 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from univo.core.database import RESOURCES_DIR, DatabaseManager
+from univo.core.pack import MAGIC, BoardPack, PackRepository, export_pack, import_pack
+from univo.core.services import PictogramService
+
+YES = (RESOURCES_DIR / "base" / "yes.png").read_bytes()
+NO = (RESOURCES_DIR / "base" / "no.png").read_bytes()
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> DatabaseManager:
+    resources = tmp_path / "res"
+    (resources / "answers" / "more").mkdir(parents=True)
+    (resources / "answers" / "yes.png").write_bytes(YES)
+    (resources / "answers" / "no.png").write_bytes(NO)
+    # Identical copies are packed once
+    (resources / "answers" / "more" / "ok.png").write_bytes(YES)
+    (resources / "answers" / "labels.pt.json").write_text(
+        json.dumps({"_category": "Respostas", "yes": "Sim"}), encoding="utf-8"
+    )
+    return DatabaseManager(
+        str(tmp_path / "source.db"),
+        resources_dir=resources,
+        cache_dir=tmp_path / "cache"
+    )
+
+def test_pack_round_trip(db: DatabaseManager, tmp_path: Path) -> None:
+    pack_path = tmp_path / "board.univopack"
+    assert export_pack(db, pack_path) == len([YES, NO])
+    assert pack_path.read_bytes().startswith(MAGIC)
+
+    with BoardPack(pack_path) as pack:
+        assert len(pack) == len(["yes", "no", "ok"])
+        assert pack.locales() == ["pt"]
+        images = set()
+        for asset_hash in pack.assets:
+            view = pack.read_image(asset_hash)
+            assert view is not None
+            with view:
+                images.add(bytes(view))
+        assert images == {YES, NO}
+
+    repository = PackRepository(pack_path, cache_dir=tmp_path / "extracted")
+    service = PictogramService(repository, locale="pt-BR")
+    answers = service.get_category_by_id("answers")
+    assert answers is not None
+    assert answers.name == "Respostas"
+    assert [c.id for c in answers.children] == ["answers/more"]
+    yes = service["yes"]
+    assert yes is not None
+    assert (yes.label, yes.voice_command) == ("Sim", "Sim")
+
+    # Images are extracted only when asked for
+    assert not (tmp_path / "extracted").exists()
+    image = service.image_file(yes)
+    assert image is not None
+    assert image.read_bytes() == YES
+    assert len(list((tmp_path / "extracted").iterdir())) == 1
+    repository.close()
+
+def test_import_pack(db: DatabaseManager, tmp_path: Path) -> None:
+    pack_path = tmp_path / "board.univopack"
+    export_pack(db, pack_path)
+
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    target = DatabaseManager(
+        str(tmp_path / "target.db"), resources_dir=empty, cache_dir=tmp_path / "c2"
+    )
+    assert import_pack(pack_path, target, tmp_path / "images") == len(
+        ["yes", "no", "ok"]
+    )
+    assert len(list((tmp_path / "images").iterdir())) == len([YES, NO])
+
+    service = PictogramService(target, locale="pt")
+    assert service.breadcrumbs("answers/more")[0].name == "Respostas"
+    ok = service["ok"]
+    yes = service["yes"]
+    assert ok is not None and yes is not None
+    assert ok.asset_hash == yes.asset_hash
+    assert service.image_file(ok) is not None
+
+def test_import_waits_for_other_writers(db: DatabaseManager, tmp_path: Path) -> None:
+    pack_path = tmp_path / "board.univopack"
+    export_pack(db, pack_path)
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    target = DatabaseManager(
+        str(tmp_path / "target.db"), resources_dir=empty, cache_dir=tmp_path / "c2"
+    )
+    importer = threading.Thread(
+        target=import_pack, args=(pack_path, target, tmp_path / "images")
+    )
+    # As during a sync, an edit or maintenance
+    with target.writing():
+        importer.start()
+        importer.join(timeout=0.5)
+        assert importer.is_alive()
+        assert PictogramService(target)["yes"] is None
+    importer.join(timeout=5)
+    assert PictogramService(target)["yes"] is not None
+
+def test_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "board.univopack"
+    path.write_bytes(b"PK\x03\x04 not a board pack")
+    with pytest.raises(ValueError, match="not a board pack"):
+        BoardPack(path)
@@ -0,0 +1,67 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from univo.core.database import DatabaseManager
+from univo.core.prediction import PredictionService, TransitionCounts
+from univo.core.services import PictogramService
+
+
+@pytest.fixture
+def service(tmp_path: Path) -> PictogramService:
+    return PictogramService(DatabaseManager(str(tmp_path / "test_univo.db")))
+
+@pytest.fixture
+def prediction(service: PictogramService) -> Iterator[PredictionService]:
+    engine = PredictionService(service, order=3, k=2, persist_interval=60)
+    yield engine
+    engine.close()
+
+def test_counts_top_and_cap() -> None:
+    cap = 10
+    counts = TransitionCounts(max_entries=cap)
+    counts.add("eat", "apple", count=1000)
+    counts.add("eat", "bread")
+    assert counts.top("eat", 1) == ["apple"]
+    assert counts.top("unknown", 3) == []
+
+    for i in range(50):
+        counts.add(f"ctx{i}", "x")
+        assert len(counts) <= cap
+    # Frequent transitions survive pruning, one-offs are forgotten first
+    assert counts.get("eat", "apple") > 0
+
+def test_suggests_learned_sequence(prediction: PredictionService) -> None:
+    for _ in range(3):
+        for pic in ("eat", "apple", "happy"):
+            prediction.observe(pic)
+    prediction.observe("eat")
+    prediction.observe("bread")
+    prediction.reset()
+
+    prediction.observe("eat")
+    assert prediction.suggest_ids(1) == ["apple"]
+    prediction.observe("apple")
+    assert [p.id for p in prediction.suggest()][0] == "happy"
+
+def test_backs_off_to_frequency(prediction: PredictionService) -> None:
+    for pic in ("yes", "yes", "no"):
+        prediction.observe(pic)
+    prediction.reset()
+    assert prediction.suggest_ids() == ["yes", "no"]
+
+def test_counts_persist(
+    prediction: PredictionService,
+    service: PictogramService
+) -> None:
+    for pic in ("eat", "apple"):
+        prediction.observe(pic)
+    prediction.close()
+
+    reloaded = PredictionService(service, order=3, persist_interval=60)
+    try:
+        reloaded.observe("eat")
+        assert reloaded.suggest_ids(1) == ["apple"]
+    finally:
+        reloaded.close()
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+from univo.core.database import RESOURCES_DIR
+from univo.core.profiles import DEFAULT_PROFILE, ProfileStore
+from univo.core.services import PictogramService
+from univo.core.usage import UsageLog
+
+IMAGE = (RESOURCES_DIR / "base" / "yes.png").read_bytes()
+
+
+@pytest.fixture
+def profiles(tmp_path: Path) -> ProfileStore:
+    resources = tmp_path / "res"
+    for folder, name in (("base", "yes"), ("food", "apple")):
+        (resources / folder).mkdir(parents=True)
+        (resources / folder / f"{name}.png").write_bytes(IMAGE)
+    return ProfileStore(
+        root=tmp_path / "profiles",
+        default_db=tmp_path / "univo.db",
+        cache_dir=tmp_path / "cache",
+        resources_dir=resources
+    )
+
+def test_profiles_keep_their_own_boards(profiles: ProfileStore) -> None:
+    default = profiles.open(DEFAULT_PROFILE)
+    ana = profiles.open("ana")
+    assert profiles.open("ana") is ana
+    assert profiles.names() == [DEFAULT_PROFILE, "ana"]
+    assert profiles.name_of(ana) == "ana"
+    assert profiles.next_name("ana") == DEFAULT_PROFILE
+    assert profiles.next_name(None) == DEFAULT_PROFILE
+    # One derived-file cache for every profile
+    assert ana.cache_dir == default.cache_dir
+
+    with PictogramService(ana).edit() as edit:
+        edit.add_category("toys", "Toys")
+    usage = UsageLog(ana)
+    usage.record("yes")
+    usage.close()
+
+    assert PictogramService(ana).get_category_by_id("toys") is not None
+    assert PictogramService(default).get_category_by_id("toys") is None
+    default_usage = UsageLog(default)
+    assert default_usage.pictogram_counts() == []
+    default_usage.close()
+
+def test_invalid_profile_name(profiles: ProfileStore) -> None:
+    with pytest.raises(ValueError, match="Invalid profile name"):
+        profiles.open("../escape")
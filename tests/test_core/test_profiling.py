@@ -0,0 +1,51 @@
+import pstats
+import time
+from pathlib import Path
+
+import pytest
+
+from univo.core.profiling import Profiler
+
+
+def busy_board(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+def test_sampling_writes_collapsed_stacks(tmp_path: Path) -> None:
+    profiler = Profiler(output_dir=tmp_path, interval=0.001)
+    assert profiler.toggle() is None
+    assert profiler.running
+    busy_board(0.2)
+    path = profiler.toggle()
+
+    assert path is not None
+    assert path.suffix == ".collapsed"
+    assert not profiler.running
+    assert profiler.stop() is None
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert any(
+        line.startswith("MainThread;") and "busy_board_(test_profiling.py" in line
+        for line in lines
+    )
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert " " not in stack
+
+def test_cprofile_writes_pstats(tmp_path: Path) -> None:
+    profiler = Profiler("cprofile", output_dir=tmp_path)
+    profiler.start()
+    busy_board(0.01)
+    path = profiler.stop()
+
+    assert path is not None
+    assert path == profiler.last_output
+    profile = pstats.Stats(str(path)).get_stats_profile()
+    assert "busy_board" in profile.func_profiles
+
+def test_unknown_profiler() -> None:
+    with pytest.raises(ValueError, match="Unknown profiler"):
+        Profiler("perf")
@@ -0,0 +1,81 @@
+import gzip
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+
+from univo.core.database import RESOURCES_DIR, DatabaseManager
+from univo.core.remote import BoardServer, RemoteRepository
+from univo.core.services import PictogramService
+
+IMAGE = (RESOURCES_DIR / "base" / "yes.png").read_bytes()
+
+
+@pytest.fixture
+def hub(tmp_path: Path) -> Iterator[BoardServer]:
+    resources = tmp_path / "res"
+    (resources / "food" / "fruit").mkdir(parents=True)
+    (resources / "food" / "bread.png").write_bytes(IMAGE)
+    for index in range(60):
+        (resources / "food" / "fruit" / f"fruit_{index}.png").write_bytes(IMAGE)
+    (resources / "food" / "labels.pt.json").write_text(
+        '{"_category": "Comida", "bread": "Pão"}', encoding="utf-8"
+    )
+    db = DatabaseManager(
+        str(tmp_path / "hub.db"), resources_dir=resources, cache_dir=tmp_path / "c"
+    )
+    server = BoardServer(PictogramService(db), port=0)
+    server.start()
+    yield server
+    server.close()
+
+def get(url: str, **headers: str) -> tuple[int, dict[str, str], bytes]:
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, dict(exc.headers), b""
+
+def test_conditional_and_compressed(hub: BoardServer) -> None:
+    status, headers, body = get(f"{hub.url}/catalog", **{"Accept-Encoding": "gzip"})
+    assert status == HTTPStatus.OK
+    assert headers["Content-Encoding"] == "gzip"
+    assert b'"fruit_0"' in gzip.decompress(body)
+
+    status, _, body = get(f"{hub.url}/catalog", **{"If-None-Match": headers["ETag"]})
+    assert (status, body) == (HTTPStatus.NOT_MODIFIED, b"")
+    status, _, _ = get(f"{hub.url}/catalog?locale=pt", **{
+        "If-None-Match": headers["ETag"]
+    })
+    assert status == HTTPStatus.OK
+    assert get(f"{hub.url}/images/unknown")[0] == HTTPStatus.NOT_FOUND
+
+def test_remote_repository(hub: BoardServer, tmp_path: Path) -> None:
+    remote = RemoteRepository(hub.url, cache_dir=tmp_path / "client", max_age=0)
+    service = PictogramService(remote, locale="pt-BR")
+    assert remote.locales() == ["pt"]
+    assert [c.name for c in service.breadcrumbs("food/fruit")] == ["Comida", "Fruit"]
+    bread = service["bread"]
+    assert bread is not None
+    assert bread.label == "Pão"
+    assert len(service.pictograms_under("food")) == len(["bread"]) + 60
+
+    # Clients get the button-sized thumbnail
+    image = service.image_file(bread)
+    assert image is not None
+    assert image.read_bytes().startswith(b"\x89PNG")
+    # Named for its type, so image loaders recognize it
+    assert image.name == f"{bread.asset_hash}.png"
+    assert service.image_file(bread) == image
+
+    # Nothing changed: revalidation keeps the cached catalogs
+    assert remote.revalidate() == {}
+    with hub.service.edit() as edit:
+        edit.rename_pictogram("bread", "Toast")
+    assert remote.revalidate() == {None: {"food"}, "pt-BR": set()}
+    service.refresh({"food"})
+    assert service.set_locale(None).pictograms["bread"].label == "Toast"
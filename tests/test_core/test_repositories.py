@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import pytest
+
+from univo.core.database import DatabaseManager
+from univo.core.domain import Category, Pictogram
+from univo.core.interfaces import PictogramRepository
+from univo.core.pack import PackRepository, export_pack
+from univo.core.repositories import MemoryRepository, SQLiteRepository
+from univo.core.services import PictogramService
+
+
+@pytest.fixture
+def sqlite_repository(tmp_path: Path) -> SQLiteRepository:
+    db = DatabaseManager(str(tmp_path / "repo.db"), cache_dir=tmp_path / "cache")
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM pictograms")
+        conn.execute("DELETE FROM categories")
+        conn.executemany(
+            "INSERT INTO categories (id, name, parent_id) VALUES (?, ?, ?)",
+            [("food", "Food", None), ("food/fruit", "Fruit", "food")]
+        )
+        conn.executemany(
+            "INSERT INTO pictograms "
+            "(id, category_id, label, voice_command) VALUES (?, ?, ?, ?)",
+            [
+                ("bread", "food", "Bread", "Bread"),
+                ("apple", "food/fruit", "Apple", "Apple"),
+                ("pear", "food/fruit", "Pear", "I want a pear"),
+            ]
+        )
+        conn.execute("DELETE FROM pictogram_labels")
+        conn.execute(
+            "INSERT INTO pictogram_labels (pictogram_id, locale, label) "
+            "VALUES ('pear', 'pt', 'Pera')"
+        )
+        conn.commit()
+    return SQLiteRepository(db)
+
+@pytest.fixture(params=["sqlite", "memory", "pack"])
+def repository(
+    request: pytest.FixtureRequest,
+    sqlite_repository: SQLiteRepository,
+    tmp_path: Path
+) -> PictogramRepository:
+    if request.param == "memory":
+        return MemoryRepository.snapshot(sqlite_repository)
+    if request.param == "pack":
+        export_pack(sqlite_repository.db, tmp_path / "board.univopack")
+        return PackRepository(tmp_path / "board.univopack")
+    return sqlite_repository
+
+def test_queries(repository: PictogramRepository) -> None:
+    assert repository.locales() == ["pt"]
+    assert [c.id for c in repository.list_categories()] == ["food", "food/fruit"]
+
+    fruit = repository.get_category("food/fruit")
+    assert fruit is not None
+    assert [p.id for p in fruit] == ["apple", "pear"]
+    assert repository.get_category("missing") is None
+
+    # Found items keep the requested order; unknown ids are skipped
+    found = repository.get_pictograms(["pear", "nope", "bread"], locale="pt-BR")
+    assert [(p.id, p.label) for p in found] == [("pear", "Pera"), ("bread", "Bread")]
+
+    assert repository.subtree_ids("food") == ["food", "food/fruit"]
+    assert repository.ancestor_ids("food/fruit") == ["food", "food/fruit"]
+    assert repository.pictogram_ids_under("food") == ["bread", "apple", "pear"]
+    assert repository.get_atlas("food") is None
+
+def test_paged_listing(repository: PictogramRepository) -> None:
+    pages, after = [], None
+    while page := repository.list_pictograms(after=after, limit=2):
+        pages.append([p.id for p in page])
+        after = page[-1].id
+    assert pages == [["apple", "bread"], ["pear"]]
+
+def test_catalogs_are_copies(repository: PictogramRepository) -> None:
+    catalog = repository.load_catalog()
+    catalog.categories.clear()
+    assert [c.id for c in repository.load_catalog()] == ["food", "food/fruit"]
+
+def test_memory_service_without_disk() -> None:
+    yes = Pictogram(id="yes", label="Yes")
+    repository = MemoryRepository.from_categories([
+        Category(id="base", name="Base", pictograms=[yes]),
+        Category(id="base/more", name="More", pictograms=[], parent_id="base"),
+    ])
+    service = PictogramService(repository)
+    assert service.db is None
+    assert service["yes"] is yes
+    assert [c.id for c in service.root_categories] == ["base"]
+    assert [c.name for c in service.breadcrumbs("base/more")] == ["Base", "More"]
@@ -1,8 +1,12 @@
+import gc
+import threading
+import weakref
 from pathlib import Path  # Added import
 
 import pytest
 
 from univo.core.database import DatabaseManager
+from univo.core.repositories import locale_chain
 from univo.core.services import PictogramService
 
 
@@ -54,6 +58,12 @@ def test_get_pictogram_by_id(service: PictogramService) -> None:
 
     assert service["nonexistent"] is None
 
+def test_get_many(service: PictogramService) -> None:
+    found, missing = service.get_many(["x", "pic1", "y", "pic1"])
+    assert [p.id for p in found] == ["pic1", "pic1"]
+    assert missing == ["x", "y"]
+    # Served from the cached catalog
+    assert found[0] is service["pic1"]
 
 def test_service_mapping_and_iter(service: PictogramService) -> None:
     cats = list(service)
@@ -69,3 +79,88 @@ def test_deprecated_methods(service: PictogramService) -> None:
     assert pic.label == "Test Label"
 
 
+
+def test_locale_chain() -> None:
+    assert locale_chain("pt_BR") == ["pt-BR", "pt"]
+    assert locale_chain("en") == ["en"]
+    assert locale_chain(None) == []
+
+def test_localized_catalog(
+    service: PictogramService, db_manager: DatabaseManager
+) -> None:
+    with db_manager.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO pictogram_labels "
+            "(pictogram_id, locale, label, voice_command) VALUES (?, ?, ?, ?)",
+            [("pic1", "pt", "Rótulo", None), ("pic1", "pt-BR", "Etiqueta", "Voz")]
+        )
+        conn.execute(
+            "INSERT INTO category_labels (category_id, locale, name) "
+            "VALUES ('cat1', 'pt', 'Categoria')"
+        )
+        conn.commit()
+
+    assert service.locales == ["pt", "pt-BR"]
+
+    # Most specific locale wins; the category falls back to 'pt'
+    catalog = service.set_locale("pt-BR")
+    assert catalog["pic1"].label == "Etiqueta"
+    assert catalog["pic1"].voice_command == "Voz"
+    assert service.default_category.name == "Categoria"
+
+    # A localized label without a voice speaks the label
+    service.set_locale("pt-PT")
+    pic = service["pic1"]
+    assert pic is not None
+    assert (pic.label, pic.voice_command) == ("Rótulo", "Rótulo")
+
+    # Unknown locales fall back to the seeded names
+    service.set_locale("de")
+    assert service.voice_commands == ["Test Voice"]
+
+def test_catalog_cached_per_locale(service: PictogramService) -> None:
+    default = service.catalog
+    portuguese = service.set_locale("pt")
+    assert service.set_locale(None) is default
+    assert service.set_locale("pt") is portuguese
+    assert service.next_locale() is None
+
+    service.invalidate()
+    assert service.catalog is not portuguese
+
+def test_concurrent_reads_during_refresh(
+    service: PictogramService, db_manager: DatabaseManager
+) -> None:
+    errors: list[str] = []
+    stop = threading.Event()
+
+    def reader() -> None:
+        while not stop.is_set():
+            category = service.get_category_by_id("cat1")
+            pic = service["pic1"]
+            if category is None or pic is None or [p.id for p in category] != ["pic1"]:
+                errors.append("torn read")
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for _ in range(50):
+        service.refresh(["cat1"])
+    stop.set()
+    for thread in readers:
+        thread.join()
+    assert errors == []
+
+def test_snapshots(service: PictogramService) -> None:
+    pinned = service.catalog
+    old = weakref.ref(pinned)
+    service.refresh(["cat1"])
+    current = service.catalog
+
+    assert current.version == pinned.version + 1 == service.generation
+    assert pinned["pic1"] is not current["pic1"]
+    # A reader holding the old version keeps it; then it is freed
+    assert old() is pinned
+    del pinned
+    gc.collect()
+    assert old() is None
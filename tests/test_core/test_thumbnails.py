@@ -0,0 +1,52 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from univo.core.database import DatabaseManager
+from univo.core.services import PictogramService
+from univo.core.thumbnails import BUTTON_SIZE
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def resources_dir(tmp_path: Path) -> Path:
+    # A single category holding one oversized pictogram
+    folder = tmp_path / "resources" / "food"
+    folder.mkdir(parents=True)
+    Image.new("RGB", (800, 600), "red").save(folder / "apple.png")
+    return tmp_path / "resources"
+
+@pytest.fixture
+def db_manager(tmp_path: Path, resources_dir: Path) -> DatabaseManager:
+    return DatabaseManager(
+        str(tmp_path / "test_univo.db"),
+        resources_dir=resources_dir,
+        cache_dir=tmp_path / "cache"
+    )
+
+def test_thumbnail_generated_on_seed(db_manager: DatabaseManager) -> None:
+    pic = PictogramService(db_manager)["apple"]
+    assert pic is not None
+    assert pic.thumbnail_path is not None
+    assert Path(pic.thumbnail_path).parent == db_manager.thumbnails.cache_dir
+    with Image.open(pic.thumbnail_path) as thumb:
+        assert max(thumb.size) == BUTTON_SIZE
+
+def test_thumbnail_refresh_is_incremental(
+    db_manager: DatabaseManager,
+    resources_dir: Path
+) -> None:
+    # Unchanged sources are skipped entirely
+    assert db_manager.refresh_thumbnails() == 0
+
+    source = resources_dir / "food" / "apple.png"
+    before = PictogramService(db_manager)["apple"]
+    Image.new("RGB", (400, 400), "blue").save(source)
+    os.utime(source, ns=(0, 1))
+
+    assert db_manager.refresh_thumbnails() == 1
+    after = PictogramService(db_manager)["apple"]
+    assert before is not None and after is not None
+    assert after.thumbnail_path != before.thumbnail_path
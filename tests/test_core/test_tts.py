@@ -0,0 +1,144 @@
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from univo.core.tts import AudioCache, PhraseCache, SilentEngine, SpeechService
+
+
+class RecordingPlayer:
+    """Collects played files and signals each playback."""
+    def __init__(self) -> None:
+        self.played: list[Path] = []
+        self.event = threading.Event()
+
+    def play(self, path: Path) -> None:
+        self.played.append(path)
+        self.event.set()
+
+
+class SlowEngine(SilentEngine):
+    """Takes a while per text, like a real engine."""
+    def synthesize(self, text: str, voice: str, destination: Path) -> None:
+        time.sleep(0.05)
+        super().synthesize(text, voice, destination)
+
+
+# Ten seconds of prefetching with SlowEngine
+BACKLOG = [f"word {index}" for index in range(200)]
+
+
+@pytest.fixture
+def player() -> RecordingPlayer:
+    return RecordingPlayer()
+
+@pytest.fixture
+def speech(tmp_path: Path, player: RecordingPlayer) -> Iterator[SpeechService]:
+    svc = SpeechService(SilentEngine(), AudioCache(tmp_path / "audio"), player)
+    yield svc
+    svc.close()
+
+def test_cache_key_depends_on_voice_and_settings(tmp_path: Path) -> None:
+    cache = AudioCache(tmp_path)
+    engine = SilentEngine()
+    base = cache.path_for(engine, "en", "Apple")
+    assert base == cache.path_for(engine, "en", "Apple")
+    assert base != cache.path_for(engine, "pt-br", "Apple")
+    assert base != cache.path_for(SilentEngine(duration=0.5), "en", "Apple")
+
+def test_prepare_synthesizes_in_background(speech: SpeechService) -> None:
+    assert speech.prepare(["Apple", "Milk", None, "Apple"]) == 2  # noqa: PLR2004
+    speech.wait(timeout=5)
+    assert speech.engine is not None
+    assert speech.cache.get(speech.engine, "en", "Apple") is not None
+    assert speech.prepare(["Apple"]) == 0
+
+def test_speak_plays_cached_audio_immediately(
+    speech: SpeechService,
+    player: RecordingPlayer
+) -> None:
+    assert speech.engine is not None
+    cached = speech.cache.store(speech.engine, "en", "Water")
+    assert speech.speak("Water")
+    # Played synchronously from the cache, no synthesis round-trip
+    assert player.played == [cached]
+
+def test_speak_uncached_plays_when_ready(
+    speech: SpeechService,
+    player: RecordingPlayer
+) -> None:
+    assert speech.speak("Bread")
+    assert player.event.wait(timeout=5)
+    assert player.played[0].is_file()
+
+def test_speak_overtakes_prepare_backlog(
+    tmp_path: Path,
+    player: RecordingPlayer
+) -> None:
+    svc = SpeechService(SlowEngine(), AudioCache(tmp_path / "audio"), player)
+    try:
+        assert svc.prepare(BACKLOG) == len(BACKLOG)
+        # Something new, then something far down the backlog
+        for text in ("Water", BACKLOG[-1]):
+            player.event.clear()
+            assert svc.speak(text)
+            assert player.event.wait(timeout=2)
+        assert svc.cancel_prepare() > 0
+    finally:
+        svc.close()
+
+def test_speak_without_engine(tmp_path: Path, player: RecordingPlayer) -> None:
+    svc = SpeechService(None, AudioCache(tmp_path), player)
+    svc.engine = None
+    assert not svc.speak("Apple")
+    assert svc.prepare(["Apple"]) == 0
+
+def test_speak_phrase_caches_whole_utterance(
+    speech: SpeechService,
+    player: RecordingPlayer
+) -> None:
+    assert speech.engine is not None
+    engine = speech.engine
+    assert speech.speak_phrase(["I", "want", "water"])
+    assert player.event.wait(timeout=5)
+    # Synthesized once, as a single phrase rather than word by word
+    assert engine.calls == [("I want water", "en")]  # type: ignore[attr-defined]
+
+    player.played.clear()
+    assert speech.speak_phrase(["I", "want", "water"])
+    # Cache hit: playback starts synchronously
+    assert len(player.played) == 1
+    assert not speech.speak_phrase([])
+
+def test_speak_phrase_overtakes_prepare_backlog(
+    tmp_path: Path,
+    player: RecordingPlayer
+) -> None:
+    svc = SpeechService(SlowEngine(), AudioCache(tmp_path / "audio"), player)
+    try:
+        svc.prepare(BACKLOG)
+        assert svc.speak_phrase(["I", "want", "water"])
+        assert player.event.wait(timeout=2)
+        assert player.played[0].parent == svc.phrases.cache_dir
+    finally:
+        svc.close()
+
+def test_phrase_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    engine = SilentEngine()
+    probe = PhraseCache(tmp_path / "probe").store(engine, "en", "x")
+    cache = PhraseCache(tmp_path / "phrases", budget=probe.stat().st_size * 2)
+
+    first = cache.store(engine, "en", "hello")
+    second = cache.store(engine, "en", "thank you")
+    assert cache.get(engine, "en", "hello") == first  # now most recent
+    cache.store(engine, "en", "goodbye")
+
+    assert first.exists()
+    assert not second.exists()
+    assert cache.total_size <= cache.budget
+
+    # Recency order survives a restart
+    reopened = PhraseCache(tmp_path / "phrases", budget=cache.budget)
+    assert reopened.total_size == cache.total_size
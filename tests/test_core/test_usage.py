@@ -0,0 +1,65 @@
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from univo.core.database import DatabaseManager
+from univo.core.usage import UsageEvent, UsageLog
+
+
+@pytest.fixture
+def db_manager(tmp_path: Path) -> DatabaseManager:
+    return DatabaseManager(str(tmp_path / "test_univo.db"))
+
+@pytest.fixture
+def usage(db_manager: DatabaseManager) -> Iterator[UsageLog]:
+    log = UsageLog(db_manager, batch_size=10, flush_interval=5)
+    yield log
+    log.close()
+
+def _event_count(db_manager: DatabaseManager) -> int:
+    with db_manager.get_connection() as conn:
+        return int(conn.execute("SELECT COUNT(*) FROM usage_events").fetchone()[0])
+
+def test_record_is_asynchronous(
+    usage: UsageLog,
+    db_manager: DatabaseManager
+) -> None:
+    usage.record("apple", "food")
+    # Still waiting for the batch to fill or the interval to pass
+    assert _event_count(db_manager) == 0
+    assert usage.flush(timeout=5)
+    assert _event_count(db_manager) == 1
+
+def test_rollups(usage: UsageLog) -> None:
+    for pic in ("apple", "apple", "milk", "apple"):
+        usage.record(pic)
+    assert usage.flush(timeout=5)
+
+    today = UsageEvent("apple", None, time.time()).day
+    expected = [("apple", 3), ("milk", 1)]
+    assert usage.pictogram_counts() == expected
+    assert usage.day_counts(today) == expected
+    assert usage.daily_totals() == [(today, 4)]
+    assert usage.pictogram_counts(limit=1) == [("apple", 3)]
+
+def test_batches_commit_when_full(
+    usage: UsageLog,
+    db_manager: DatabaseManager
+) -> None:
+    for i in range(usage.batch_size):
+        usage.record(f"pic{i}")
+    deadline = time.monotonic() + 5
+    while _event_count(db_manager) < usage.batch_size:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+def test_close_flushes_pending_events(db_manager: DatabaseManager) -> None:
+    log = UsageLog(db_manager, flush_interval=60)
+    log.record("yes")
+    log.close()
+    assert _event_count(db_manager) == 1
+    # Recording after close is dropped, not an error
+    log.record("no")
+    assert _event_count(db_manager) == 1
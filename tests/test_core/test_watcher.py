@@ -0,0 +1,125 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from univo.core.database import RESOURCES_DIR, DatabaseManager
+from univo.core.services import PictogramService
+from univo.core.watcher import ResourceWatcher
+
+IMAGE = (RESOURCES_DIR / "base" / "yes.png").read_bytes()
+
+
+@pytest.fixture
+def resources(tmp_path: Path) -> Path:
+    for folder, name in (("food", "apple"), ("drinks", "water")):
+        (tmp_path / "res" / folder).mkdir(parents=True)
+        (tmp_path / "res" / folder / f"{name}.png").write_bytes(IMAGE)
+    return tmp_path / "res"
+
+@pytest.fixture
+def db(tmp_path: Path, resources: Path) -> DatabaseManager:
+    return DatabaseManager(
+        str(tmp_path / "watch.db"),
+        resources_dir=resources,
+        cache_dir=tmp_path / "cache"
+    )
+
+def test_sync_resources(db: DatabaseManager, resources: Path) -> None:
+    service = PictogramService(db)
+    drinks = service.get_category_by_id("drinks")
+
+    (resources / "food" / "bread.png").write_bytes(IMAGE)
+    (resources / "food" / "apple.png").unlink()
+    (resources / "food" / "fruit").mkdir()
+    (resources / "food" / "fruit" / "pear.png").write_bytes(IMAGE)
+
+    changed = db.sync_resources(["food", "food/fruit"])
+    assert changed == {"food", "food/fruit"}
+    service.refresh(changed)
+
+    food = service.get_category_by_id("food")
+    assert food is not None
+    assert [p.id for p in food] == ["bread"]
+    assert [c.id for c in food.children] == ["food/fruit"]
+    assert service["pear"] is not None
+    assert service["apple"] is None
+    # Untouched categories keep their cached objects
+    assert service.get_category_by_id("drinks") is drinks
+
+    (resources / "food" / "fruit" / "pear.png").unlink()
+    (resources / "food" / "fruit").rmdir()
+    assert db.sync_resources(["food/fruit"]) == {"food", "food/fruit"}
+    service.refresh({"food", "food/fruit"})
+    assert service.get_category_by_id("food/fruit") is None
+    assert service["pear"] is None
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_applies_debounced_changes(
+    db: DatabaseManager, resources: Path, use_inotify: bool
+) -> None:
+    watcher = ResourceWatcher(
+        db, debounce=0.1, poll_interval=0.1, use_inotify=use_inotify
+    )
+    batches: list[set[str]] = []
+    done = threading.Event()
+
+    def listener(category_ids: set[str]) -> None:
+        batches.append(category_ids)
+        done.set()
+
+    watcher.subscribe(listener)
+    assert watcher.start()
+    try:
+        (resources / "toys").mkdir()
+        for name in ("ball", "doll", "kite"):
+            (resources / "toys" / f"{name}.png").write_bytes(IMAGE)
+        assert done.wait(10)
+    finally:
+        watcher.close()
+
+    # One burst of copies becomes a single sync
+    assert batches == [{"toys"}]
+    toys = PictogramService(db).get_category_by_id("toys")
+    assert toys is not None
+    assert sorted(p.id for p in toys) == ["ball", "doll", "kite"]
+
+def test_progressive_seeding(tmp_path: Path, resources: Path) -> None:
+    (resources / "base").mkdir()
+    (resources / "base" / "yes.png").write_bytes(IMAGE)
+    (resources / "food" / "fruit").mkdir()
+    (resources / "food" / "fruit" / "pear.png").write_bytes(IMAGE)
+    db = DatabaseManager(
+        str(tmp_path / "first.db"),
+        resources_dir=resources,
+        cache_dir=tmp_path / "cache",
+        progressive=True
+    )
+
+    # Only base is seeded up front; the other folders wait in the queue
+    service = PictogramService(db)
+    assert service["yes"] is not None
+    assert sorted(c.id for c in service.root_categories) == ["base", "drinks", "food"]
+    assert service["apple"] is None
+    assert db.seed_progress == (1, len(service.root_categories))
+    # A restart keeps the queue
+    db = DatabaseManager(
+        str(tmp_path / "first.db"), resources_dir=resources, cache_dir=tmp_path / "c"
+    )
+    assert db.seeding
+
+    watcher = ResourceWatcher(db)
+    batches: list[set[str]] = []
+    watcher.subscribe(batches.append)
+    assert watcher.seed() == len(batches)
+    assert not db.seeding
+    assert db.seed_pending() == set()
+
+    for batch in batches:
+        service.refresh(batch)
+    food = service.get_category_by_id("food")
+    assert food is not None
+    assert [p.id for p in food] == ["apple"]
+    assert [c.id for c in food.children] == ["food/fruit"]
+    assert service["pear"] is not None
+    assert service["water"] is not None
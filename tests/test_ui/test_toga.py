@@ -17,6 +17,7 @@ def mock_toga_env() -> Any:
         def __init__(self, *args: Any, **kwargs: Any) -> None:
             self.formal_name = args[0] if args else "UniVo"
             self.main_window = MagicMock()
+            self.commands = MagicMock()
             
         def main_loop(self) -> None:
             pass
@@ -55,9 +56,8 @@ def mock_service() -> Any:
         )
         instance.default_category = mock_category
         instance.get_main_category.return_value = mock_category
-        instance.get_pictogram_by_id.side_effect = (
-            lambda pid: Pictogram(id="yes", label="Sim", voice_command="Sim") 
-            if pid == "yes" else None
+        instance.get_many.return_value = (
+            [Pictogram(id="yes", label="Sim", voice_command="Sim")], ["no"]
         )
             
         yield instance
@@ -69,14 +69,14 @@ def test_toga_startup(mock_toga_env: Any, mock_service: Any) -> None:
     mock_service_instance = MagicMock()
     app_module.PictogramService = mock_service_instance
     
-    # Setup mock data for the instance (service.categories used in home render)
+    # Setup mock data for the instance (root_categories used in home render)
     mock_category = Category(
         id="cat1", 
         name="Test Category", 
         pictograms=[Pictogram(id="p1", label="Pic 1")]
     )
-    mock_service_instance.return_value.categories = [mock_category]
-    mock_service_instance.return_value.get_pictogram_by_id.return_value = None
+    mock_service_instance.return_value.root_categories = [mock_category]
+    mock_service_instance.return_value.get_many.return_value = ([], ["yes", "no"])
     
     # We need to instantiate the class from the *reloaded* module
     app_class = app_module.UniVoTogaApp
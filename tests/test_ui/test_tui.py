@@ -1,9 +1,12 @@
+from pathlib import Path
 from typing import Any
-from unittest.mock import PropertyMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
 
 from univo.core.domain import Category, Pictogram
+from univo.core.profiles import DEFAULT_PROFILE, ProfileStore
+from univo.core.services import PictogramService
 from univo.ui.tui.app import UniVoTUIApp
 
 
@@ -27,13 +30,23 @@ def mock_service() -> Any:
         )
         # Use type() to set property-like behavior on the mock instance
         type(instance).categories = PropertyMock(return_value=[mock_category])
+        type(instance).root_categories = PropertyMock(
+            return_value=[mock_category]
+        )
+        instance.breadcrumbs.return_value = [mock_category]
         instance.get_pictogram_by_id.side_effect = lambda pid: (
             Pictogram(id=pid, label=pid, voice_command=pid) 
             if pid in ["yes", "no", "p1"] else None
         )
+        instance.get_many.side_effect = lambda ids: (
+            [Pictogram(id=pid, label=pid) for pid in ids if pid in ["yes", "no"]],
+            [pid for pid in ids if pid not in ["yes", "no"]]
+        )
         instance.get_category_by_id.return_value = mock_category
         
-        yield instance
+        with patch("univo.ui.tui.app.PredictionService") as prediction_class:
+            prediction_class.return_value.suggest.return_value = []
+            yield instance
 
 @pytest.mark.asyncio
 async def test_tui_layout(mock_service: Any) -> None:
@@ -66,3 +79,67 @@ async def test_tui_interaction(mock_service: Any) -> None:
         await pilot.click("#cat-cat1")
         await pilot.click("#btn-p1")
         assert pilot is not None
+
+@pytest.mark.asyncio
+async def test_tui_injected_service() -> None:
+    service = MagicMock()
+    type(service).root_categories = PropertyMock(return_value=[
+        Category(id="injected", name="Injected", pictograms=[])
+    ])
+    service.get_pictogram_by_id.return_value = None
+    service.get_many.side_effect = lambda ids: ([], list(ids))
+    app = UniVoTUIApp(service)
+
+    async with app.run_test():
+        assert app.service is service
+        assert app.query_one("#cat-injected")
+
+@pytest.mark.asyncio
+async def test_tui_sentence_strip(mock_service: Any) -> None:
+    app = UniVoTUIApp()
+
+    async with app.run_test() as pilot:
+        await pilot.click("#cat-cat1")
+        await pilot.click("#btn-p1")
+        assert [p.id for p in app.sentence] == ["p1"]
+
+        await pilot.click("#act-clear")
+        assert len(app.sentence) == 0
+
+@pytest.mark.asyncio
+async def test_tui_nested_category_ids() -> None:
+    nested = Category(id="food/fruit", name="Fruit", pictograms=[])
+    service = MagicMock()
+    type(service).root_categories = PropertyMock(return_value=[nested])
+    service.get_category_by_id.return_value = nested
+    service.breadcrumbs.return_value = [nested]
+    service.get_pictogram_by_id.return_value = None
+    service.get_many.side_effect = lambda ids: ([], list(ids))
+    app = UniVoTUIApp(service)
+
+    async with app.run_test() as pilot:
+        button = app.query_one(".category-btn")
+        assert button.id is not None and "/" not in button.id
+        await pilot.click(f"#{button.id}")
+        assert app.current_category_id == "food/fruit"
+
+@pytest.mark.asyncio
+async def test_tui_switch_profile(tmp_path: Path) -> None:
+    profiles = ProfileStore(
+        root=tmp_path / "profiles",
+        default_db=tmp_path / "univo.db",
+        cache_dir=tmp_path / "cache"
+    )
+    ana = profiles.open("ana")
+    speech = MagicMock()
+    app = UniVoTUIApp(
+        PictogramService(profiles.open(DEFAULT_PROFILE)), speech, profiles=profiles
+    )
+
+    async with app.run_test() as pilot:
+        await pilot.press("u")
+        assert (app.profile, app.service.db) == ("ana", ana)
+        # Speech, and its audio cache, carry over
+        assert app.speech is speech
+        await pilot.press("u")
+        assert app.profile == DEFAULT_PROFILE
@@ -0,0 +1,116 @@
+"""Per-category sprite atlases.
+
+Opening a category normally opens and decodes one file per pictogram.
+An atlas packs a category's thumbnails into a single image plus an
+offset index, so a grid load reads one file and cuts it into icons.
+
+Atlases are content addressed: the file name is a signature over the
+category's asset hashes, so any change to a source image produces a new
+atlas and stale ones are simply no longer referenced.
+"""
+import hashlib
+import math
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .decorators import logger
+from .thumbnails import BUTTON_SIZE
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - depends on the environment
+    Image = None  # type: ignore[assignment]
+
+# (x, y, width, height) of one image inside an atlas
+Box = tuple[int, int, int, int]
+
+
+def atlas_signature(asset_hashes: Iterable[str], cell: int = BUTTON_SIZE) -> str:
+    """Identifies an atlas by cell size and the set of assets it packs."""
+    digest = hashlib.sha256(str(cell).encode())
+    for asset_hash in sorted(set(asset_hashes)):
+        digest.update(asset_hash.encode())
+    return digest.hexdigest()
+
+
+def build_atlas(
+    sources: dict[str, Path],
+    destination: Path,
+    cell: int = BUTTON_SIZE
+) -> dict[str, Box]:
+    """Packs images into a square-ish grid of ``cell`` sized slots.
+
+    Images that can't be read are logged and left out; their pictograms
+    load their own file instead.
+
+    Args:
+        sources: Image path per asset hash. Images larger than a cell
+                 are shrunk to fit.
+        destination: Where to write the atlas PNG.
+        cell: Slot edge length in pixels.
+
+    Returns:
+        The offset index: the box of every packed asset.
+    """
+    images: list[tuple[str, Any]] = []
+    for asset_hash, path in sorted(sources.items()):
+        try:
+            with Image.open(path) as src:
+                img = src.convert("RGBA")
+        except Exception as e:
+            logger.warning(f"Atlas image failed for {path}: {e}")
+            continue
+        img.thumbnail((cell, cell), Image.Resampling.LANCZOS)
+        images.append((asset_hash, img))
+
+    columns = max(1, math.ceil(math.sqrt(len(images))))
+    rows = max(1, math.ceil(len(images) / columns))
+    sheet = Image.new("RGBA", (columns * cell, rows * cell))
+
+    index: dict[str, Box] = {}
+    for i, (asset_hash, img) in enumerate(images):
+        x, y = (i % columns) * cell, (i // columns) * cell
+        sheet.paste(img, (x, y))
+        index[asset_hash] = (x, y, img.width, img.height)
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp = destination.with_suffix(f".{os.getpid()}.tmp")
+    sheet.save(tmp, format="PNG", optimize=True)
+    os.replace(tmp, destination)
+    return index
+
+
+@dataclass(frozen=True, slots=True)
+class Atlas:
+    """A packed category image and its offset index.
+
+    Attributes:
+        path: Location of the atlas image.
+        entries: Box of each packed image, keyed by asset hash.
+    """
+    path: str
+    entries: dict[str, Box]
+
+    def __len__(self) -> int:
+        """Returns the number of packed images."""
+        return len(self.entries)
+
+    def __contains__(self, asset_hash: object) -> bool:
+        """Checks whether an asset is packed in this atlas."""
+        return asset_hash in self.entries
+
+    def load(self) -> dict[str, Any]:
+        """Reads the atlas once and cuts it into one image per asset.
+
+        Returns:
+            PIL images keyed by asset hash.
+        """
+        with Image.open(self.path) as sheet:
+            sheet.load()
+            return {
+                asset_hash: sheet.crop((x, y, x + w, y + h))
+                for asset_hash, (x, y, w, h) in self.entries.items()
+            }
@@ -1,32 +1,151 @@
 """Persistence layer for UniVo using SQLite.
 
 Handles schema initialization, connection management via context managers,
-and automatic seeding from the resources directory.
+automatic seeding from the resources directory and thumbnail generation.
 """
+import json
+import os
 import sqlite3
-from collections.abc import Generator
+import threading
+from collections import Counter
+from collections.abc import Callable, Generator, Iterable
 from contextlib import contextmanager
 from pathlib import Path
 
+from .atlas import atlas_signature, build_atlas
+from .thumbnails import BUTTON_SIZE, ThumbnailCache, content_hash
+
+# univo/core/database.py -> univo/core -> univo -> univo/
+BASE_DIR = Path(__file__).parent.parent
+RESOURCES_DIR = BASE_DIR / "resources" / "pictograms"
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg')
+# Seeded before the UI starts on a progressive first launch (yes/no)
+FIRST_CATEGORY = "base"
+# Folders seeded per background step of a progressive first launch
+SEED_BATCH = 8
+# Ids bound per IN list; SQLite's default limit on parameters is 999
+MAX_PARAMS = 900
+# Keep the category closure table in step with the parent links
+CATEGORY_TREE_TRIGGERS = """
+    CREATE TRIGGER IF NOT EXISTS category_tree_insert
+    AFTER INSERT ON categories
+    BEGIN
+        INSERT INTO category_tree (ancestor, descendant, depth)
+        SELECT ancestor, NEW.id, depth + 1 FROM category_tree
+        WHERE descendant = NEW.parent_id
+        UNION ALL SELECT NEW.id, NEW.id, 0;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS category_tree_delete
+    AFTER DELETE ON categories
+    BEGIN
+        DELETE FROM category_tree
+        WHERE descendant = OLD.id OR ancestor = OLD.id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS category_tree_move
+    AFTER UPDATE OF parent_id ON categories
+    BEGIN
+        -- Detach the subtree from its old ancestors...
+        DELETE FROM category_tree
+        WHERE descendant IN (
+            SELECT descendant FROM category_tree WHERE ancestor = NEW.id
+        )
+        AND ancestor NOT IN (
+            SELECT descendant FROM category_tree WHERE ancestor = NEW.id
+        );
+        -- ...and attach it under the new parent's ancestors
+        INSERT INTO category_tree (ancestor, descendant, depth)
+        SELECT above.ancestor, below.descendant, above.depth + below.depth + 1
+        FROM category_tree above, category_tree below
+        WHERE above.descendant = NEW.parent_id AND below.ancestor = NEW.id;
+    END;
+"""
+# Key naming the category itself in a labels.<locale>.json file
+CATEGORY_KEY = "_category"
+# Where each pictogram's image lives: its own icon_path (images added
+# from elsewhere) or a file name in its category's folder
+PICTOGRAM_FILES_VIEW = """
+    CREATE VIEW IF NOT EXISTS pictogram_files AS
+    SELECT p.id, COALESCE(p.icon_path, c.dir || '/' || p.file_name) AS path
+    FROM pictograms p LEFT JOIN categories c ON c.id = p.category_id
+"""
+
+
+def resolve_resource(stored_path: str) -> Path:
+    """Turns a stored image path into a filesystem path.
+
+    Paths inside the package are stored relative to it; anything else
+    is stored absolute and returned unchanged.
+    """
+    return BASE_DIR / stored_path
+
+
+def _stored_path(file_path: Path) -> str:
+    """Inverse of resolve_resource: relative when inside the package."""
+    try:
+        return file_path.relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return str(file_path)
+
 
 class DatabaseManager:
     """Manages SQLite database interactions.
     
-    Ensures tables exist and seeds them from folder structures on startup.
+    Ensures tables exist, upgrades older databases (see MIGRATIONS) and
+    seeds them from folder structures on startup.
+
+    A progressive first launch seeds only the ``base`` category and the
+    top-level category list up front; the other folders are queued in
+    the ``seed_queue`` table and seeded by repeated seed_pending() calls
+    (ResourceWatcher makes them in the background), so startup time
+    doesn't grow with the size of the library.
+
+    Thread safety: every get_connection() call opens its own connection,
+    and the database runs in WAL mode, so readers on any thread never
+    block on (or see half of) a write. Reads spanning several statements
+    use read_snapshot() to see one consistent state. Writers in this
+    process (sync_resources, refresh_thumbnails, writing()) are
+    serialized.
     """
-    def __init__(self, db_path: str | None = None) -> None:
+    def __init__(
+        self,
+        db_path: str | None = None,
+        resources_dir: Path | None = None,
+        cache_dir: Path | None = None,
+        atlases: bool = False,
+        progressive: bool = False
+    ) -> None:
         """Initialize database manager.
         
         Args:
             db_path: Absolute path to the .db file. 
                      Overrides default 'univo.db' in project root.
+            resources_dir: Folder of category folders to seed from.
+                           Defaults to the bundled resources/pictograms.
+            cache_dir: Folder for derived files such as thumbnails.
+                       Defaults to '.univo-cache' next to the database.
+            atlases: Whether to also pack each category's thumbnails
+                     into a single sprite atlas.
+            progressive: On first launch, seed only what the first
+                         screen needs and queue the rest for
+                         seed_pending().
         """
         if db_path is None:
-            # univo/core/database.py -> univo/core -> univo -> univo/
-            base_dir = Path(__file__).parent.parent
-            self.db_path = str(base_dir / "univo.db")
+            self.db_path = str(BASE_DIR / "univo.db")
         else:
             self.db_path = db_path
+
+        self.resources_dir = resources_dir or RESOURCES_DIR
+        self.cache_dir = cache_dir or Path(self.db_path).parent / ".univo-cache"
+        self.thumbnails = ThumbnailCache(self.cache_dir / "thumbnails")
+        self.atlases = atlases
+        self.progressive = progressive
+        self._write_lock = threading.RLock()
+        # Rows changed through get_connection() since startup, counted
+        # as each connection closes; drives database maintenance
+        self.writes = 0
+        self._writes_lock = threading.Lock()
             
         self._init_db()
 
@@ -41,12 +160,33 @@ class DatabaseManager:
         try:
             yield conn
         finally:
+            with self._writes_lock:
+                self.writes += conn.total_changes
             conn.close()
 
+    @contextmanager
+    def writing(self) -> Generator[sqlite3.Connection]:
+        """A connection no other writer of this manager runs alongside."""
+        with self._write_lock, self.get_connection() as conn:
+            yield conn
+
+    @contextmanager
+    def read_snapshot(self) -> Generator[sqlite3.Connection]:
+        """A connection whose reads all see the same committed state.
+
+        Holds one read transaction open for the block, so concurrent
+        writes (a reseed, an edit) are either fully visible or not at all.
+        """
+        with self.get_connection() as conn:
+            conn.execute("BEGIN")
+            yield conn
+
     def _init_db(self) -> None:
         """Initialize the database schema if tables don't exist."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            # Readers keep reading while a writer commits
+            cursor.execute("PRAGMA journal_mode=WAL")
             
             # Create categories table
             cursor.execute("""
@@ -55,6 +195,24 @@ class DatabaseManager:
                     name TEXT NOT NULL
                 )
             """)
+            if "parent_id" not in _columns(cursor, "categories"):
+                cursor.execute("ALTER TABLE categories ADD COLUMN parent_id TEXT")
+
+            # Closure table: one row per (ancestor, descendant) pair,
+            # including each category as its own ancestor at depth 0
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS category_tree (
+                    ancestor TEXT NOT NULL,
+                    descendant TEXT NOT NULL,
+                    depth INTEGER NOT NULL,
+                    PRIMARY KEY (ancestor, descendant)
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_category_tree_descendant
+                ON category_tree (descendant, depth)
+            """)
+            cursor.executescript(CATEGORY_TREE_TRIGGERS)
             
             # Create pictograms table
             cursor.execute("""
@@ -67,60 +225,873 @@ class DatabaseManager:
                     FOREIGN KEY (category_id) REFERENCES categories (id)
                 )
             """)
+
+            # Content-addressed assets: one canonical file per image hash
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS assets (
+                    hash TEXT PRIMARY KEY,
+                    path TEXT NOT NULL
+                )
+            """)
+
+            # Every observed source file and the hash of its contents
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS asset_sources (
+                    path TEXT PRIMARY KEY,
+                    hash TEXT NOT NULL,
+                    mtime INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+
+            # Thumbnails are derived data; drop the per-pictogram layout
+            if "pictogram_id" in _columns(cursor, "thumbnails"):
+                cursor.execute("DROP TABLE thumbnails")
+
+            # Create thumbnails table (one row per asset and size)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS thumbnails (
+                    asset_hash TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    path TEXT NOT NULL,
+                    PRIMARY KEY (asset_hash, size)
+                )
+            """)
+
+            # Sprite atlases: one packed image per category plus offsets
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS atlases (
+                    category_id TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    signature TEXT NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS atlas_entries (
+                    category_id TEXT NOT NULL,
+                    asset_hash TEXT NOT NULL,
+                    x INTEGER NOT NULL,
+                    y INTEGER NOT NULL,
+                    width INTEGER NOT NULL,
+                    height INTEGER NOT NULL,
+                    PRIMARY KEY (category_id, asset_hash)
+                )
+            """)
+
+            # Usage events: append-only, no secondary indexes, so inserts
+            # always land at the end of the rowid b-tree
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS usage_events (
+                    id INTEGER PRIMARY KEY,
+                    pictogram_id TEXT NOT NULL,
+                    category_id TEXT,
+                    occurred_at REAL NOT NULL
+                )
+            """)
+
+            # Rollups maintained alongside each batch of events
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS usage_daily (
+                    day TEXT NOT NULL,
+                    pictogram_id TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (day, pictogram_id)
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS usage_totals (
+                    pictogram_id TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+
+            # Learned n-gram transitions for next-pictogram prediction
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS transitions (
+                    context TEXT NOT NULL,
+                    next_id TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (context, next_id)
+                ) WITHOUT ROWID
+            """)
+
+            # Per-locale labels; a NULL voice_command speaks the label
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS pictogram_labels (
+                    pictogram_id TEXT NOT NULL,
+                    locale TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    voice_command TEXT,
+                    PRIMARY KEY (pictogram_id, locale)
+                ) WITHOUT ROWID
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS category_labels (
+                    category_id TEXT NOT NULL,
+                    locale TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    PRIMARY KEY (category_id, locale)
+                ) WITHOUT ROWID
+            """)
+
+            # Folders of a progressive first launch still to be seeded,
+            # parents before their subfolders
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS seed_queue (
+                    id INTEGER PRIMARY KEY,
+                    category_id TEXT NOT NULL UNIQUE
+                )
+            """)
+
+            # Maintenance steps, with the rows written since each last ran
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS maintenance (
+                    step TEXT PRIMARY KEY,
+                    writes INTEGER NOT NULL DEFAULT 0,
+                    ran_at REAL
+                )
+            """)
+
+            # Images whose pictogram a caregiver deleted; resource syncs
+            # leave them out instead of bringing the pictogram back
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS deleted_images (
+                    path TEXT PRIMARY KEY
+                ) WITHOUT ROWID
+            """)
+
+            # Category folders a caregiver deleted, likewise left out
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS deleted_categories (
+                    id TEXT PRIMARY KEY
+                ) WITHOUT ROWID
+            """)
+
+            # Board edits, newest last; each row holds the inverse of
+            # one committed edit so it can be undone
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS edit_log (
+                    id INTEGER PRIMARY KEY,
+                    changes TEXT NOT NULL,
+                    category_ids TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+
+            if "asset_hash" not in _columns(cursor, "pictograms"):
+                cursor.execute("ALTER TABLE pictograms ADD COLUMN asset_hash TEXT")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_pictograms_category
+                ON pictograms (category_id)
+            """)
             
             conn.commit()
+            _migrate(conn)
             
             # Seed initial data if empty
             cursor.execute("SELECT COUNT(*) FROM categories")
             if cursor.fetchone()[0] == 0:
-                self._seed_data(conn)
+                self._seed_data(conn, queue=self.progressive)
+
+            # Databases created before nesting have no closure rows yet
+            cursor.execute(
+                "SELECT (SELECT COUNT(*) FROM categories)"
+                " > (SELECT COUNT(*) FROM category_tree WHERE depth = 0)"
+            )
+            if cursor.fetchone()[0]:
+                self._rebuild_category_tree(conn)
+
+            cursor.execute("SELECT COUNT(*) FROM category_labels")
+            if cursor.fetchone()[0] == 0:
+                self._seed_labels(conn)
+
+            self._refresh_thumbnails(conn)
+
+    def refresh_thumbnails(self) -> int:
+        """Re-indexes changed source images and renders missing thumbnails.
+
+        Atlases, when enabled, are rebuilt for categories whose images
+        changed.
 
+        Returns:
+            The number of thumbnail records written.
+        """
+        with self._write_lock, self.get_connection() as conn:
+            return self._refresh_thumbnails(conn)
+
+    @property
+    def seed_progress(self) -> tuple[int, int]:
+        """Categories seeded so far and categories known, for a progress bar.
+
+        The total can grow while queued folders reveal subfolders.
+        """
+        with self.get_connection() as conn:
+            total, queued = conn.execute(
+                "SELECT (SELECT COUNT(*) FROM categories),"
+                " (SELECT COUNT(*) FROM seed_queue)"
+            ).fetchone()
+        return total - queued, total
+
+    @property
+    def seeding(self) -> bool:
+        """Whether folders of a progressive first launch are still queued."""
+        done, total = self.seed_progress
+        return done < total
+
+    def seed_pending(self, limit: int = SEED_BATCH) -> set[str]:
+        """Seeds the next queued folders of a progressive first launch.
+
+        Each folder gets its pictograms and labels, and its subfolders
+        are queued in turn. After the last one, assets and thumbnails
+        are indexed for the whole board.
+
+        Args:
+            limit: Most folders to seed in this step.
+
+        Returns:
+            Ids of every category that changed; empty once nothing is
+            left to seed.
+        """
+        with self._write_lock, self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT category_id FROM seed_queue ORDER BY id LIMIT ?", (limit,)
+            )
+            batch = [row[0] for row in cursor.fetchall()]
+            if not batch:
+                return set()
+            changed = set(batch)
+            for cat_id in batch:
+                folder = self.resources_dir / cat_id
+                cursor.execute("SELECT 1 FROM categories WHERE id = ?", (cat_id,))
+                # A board edit may have deleted it while it was queued
+                if folder.is_dir() and cursor.fetchone() is not None:
+                    changed |= self._sync_pictograms(cursor, folder, cat_id)
+                    for subfolder in sorted(folder.iterdir()):
+                        if subfolder.is_dir() and (
+                            sub_id := self._queue_category(cursor, subfolder, cat_id)
+                        ):
+                            changed.add(sub_id)
+                    self._seed_category_labels(cursor, cat_id)
+                cursor.execute(
+                    "DELETE FROM seed_queue WHERE category_id = ?", (cat_id,)
+                )
+            conn.commit()
+
+            cursor.execute("SELECT COUNT(*) FROM seed_queue")
+            if cursor.fetchone()[0] == 0:
+                # Thumbnails change the image of every category at once
+                self._refresh_thumbnails(conn)
+                changed.update(
+                    row[0] for row in cursor.execute("SELECT id FROM categories")
+                )
+        return changed
+
+    def sync_resources(self, category_ids: Iterable[str]) -> set[str]:
+        """Brings categories in line with their folders after a change.
+
+        Only the given categories are compared with disk: new images are
+        added and removed ones deleted; a new folder is seeded with its
+        whole subtree and a vanished one dropped with it. Folders whose
+        category a board edit deleted stay out. Assets,
+        thumbnails and atlases are then refreshed incrementally.
+
+        Args:
+            category_ids: Categories (folder paths under the resources
+                          directory) whose folders changed.
+
+        Returns:
+            Ids of every category whose pictograms or children changed.
+        """
+        changed: set[str] = set()
+        with self._write_lock, self.get_connection() as conn:
+            cursor = conn.cursor()
+            # Parents first, so new subfolders find their parent's row
+            for cat_id in sorted(set(category_ids), key=lambda c: c.count("/")):
+                folder = self.resources_dir / cat_id
+                cursor.execute(
+                    "SELECT parent_id FROM categories WHERE id = ?", (cat_id,)
+                )
+                row = cursor.fetchone()
+                if row is not None and folder.is_dir():
+                    cursor.execute(
+                        "UPDATE categories SET dir = ? WHERE id = ?",
+                        (_stored_path(folder), cat_id)
+                    )
+                    changed |= self._sync_pictograms(cursor, folder, cat_id)
+                    self._seed_category_labels(cursor, cat_id)
+                    changed.add(cat_id)
+                    continue
+
+                parent_id = _parent_id(cat_id)
+                if row is None and folder.is_dir():
+                    if self._seed_category(cursor, folder, parent_id) is None:
+                        continue
+                    subtree = _subtree(cursor, cat_id)
+                    for new_id in subtree:
+                        self._seed_category_labels(cursor, new_id)
+                elif row is not None:
+                    subtree = _subtree(cursor, cat_id)
+                    for start in range(0, len(subtree), MAX_PARAMS):
+                        _delete_categories(
+                            cursor, subtree[start:start + MAX_PARAMS]
+                        )
+                else:
+                    continue
+                changed.update(subtree)
+                if parent_id:
+                    changed.add(parent_id)
+
+            conn.commit()
+            if changed:
+                self._refresh_thumbnails(conn)
+        return changed
+
+    def _sync_pictograms(
+        self, cursor: sqlite3.Cursor, folder: Path, cat_id: str
+    ) -> set[str]:
+        """Adds, moves and deletes one category's pictograms to match disk.
+
+        A pictogram's id is its file name without extension. If another
+        pictogram already has that id and its image is still on disk,
+        the new one is namespaced by its category instead
+        ('drinks/juice'); both share the image's asset. If that image is
+        gone, the file was moved here and the pictogram follows it,
+        keeping its labels. Images sharing a name in one folder
+        ('x.png', 'x.jpg') are told apart by their extension
+        ('food/x.png').
+
+        Board edits win over the folder: pictograms a caregiver moved
+        elsewhere or added here keep the image path they recorded, and
+        images whose pictogram was deleted stay out.
+
+        Returns:
+            Other categories pictograms were moved out of.
+        """
+        cursor.execute(
+            "SELECT id, file_name FROM pictograms "
+            "WHERE category_id = ? AND icon_path IS NULL",
+            (cat_id,)
+        )
+        known = {row["file_name"]: row["id"] for row in cursor.fetchall()}
+        cursor.execute(
+            "SELECT icon_path FROM pictograms WHERE icon_path IS NOT NULL "
+            "UNION SELECT path FROM deleted_images"
+        )
+        edited = {row[0] for row in cursor.fetchall()}
+        stored_dir = _stored_path(folder)
+        files = sorted(
+            path for path in folder.iterdir()
+            if _is_image(path) and f"{stored_dir}/{path.name}" not in edited
+        )
+        names = {path.name for path in files}
+        gone = {pic_id for name, pic_id in known.items() if name not in names}
+
+        moved_from: set[str] = set()
+        rows: list[tuple[str, str, str, str]] = []
+        taken: set[str] = set()
+        for path in files:
+            if path.name in known:
+                continue
+            row = _pictogram_row(path, cat_id)
+            cursor.execute(
+                "SELECT p.category_id, f.path FROM pictograms p "
+                "JOIN pictogram_files f ON f.id = p.id WHERE p.id = ?",
+                (row[0],)
+            )
+            owner = cursor.fetchone()
+            clash = False
+            if owner is not None and row[0] not in gone:
+                if resolve_resource(owner["path"]).is_file():
+                    row = _pictogram_row(path, cat_id, namespaced=True)
+                    cursor.execute(
+                        "SELECT 1 FROM pictograms WHERE id = ?", (row[0],)
+                    )
+                    clash = cursor.fetchone() is not None
+                else:
+                    moved_from.add(owner["category_id"])
+            if clash or row[0] in taken:
+                # The same name with another extension in this folder
+                row = (f"{cat_id}/{path.name}", row[1], row[2], row[3])
+            gone.discard(row[0])
+            taken.add(row[0])
+            rows.append(row)
+
+        for pic_id in gone:
+            cursor.execute(
+                "DELETE FROM pictogram_labels WHERE pictogram_id = ?", (pic_id,)
+            )
+            cursor.execute("DELETE FROM pictograms WHERE id = ?", (pic_id,))
+
+        # Existing rows keep their label; only where the image lives changes
+        cursor.executemany(
+            "INSERT INTO pictograms (id, category_id, label, file_name) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET "
+            "category_id = excluded.category_id, "
+            "file_name = excluded.file_name, icon_path = NULL",
+            rows
+        )
+        moved_from.discard(cat_id)
+        return moved_from
+
+    def _refresh_thumbnails(self, conn: sqlite3.Connection) -> int:
+        """Asset, thumbnail and atlas stage of seeding."""
+        self._index_assets(conn)
+        if not self.thumbnails.available:
+            return 0
+        written = self._render_thumbnails(conn)
+        if self.atlases:
+            self._refresh_atlases(conn)
+        return written
+
+    def _render_thumbnails(self, conn: sqlite3.Connection) -> int:
+        """Renders thumbnails missing for any asset."""
 
-    def _seed_data(self, conn: sqlite3.Connection) -> None:
-        """Seed initial data from resources directory."""
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT a.hash, a.path, t.size, t.path AS thumbnail
+            FROM assets a LEFT JOIN thumbnails t ON t.asset_hash = a.hash
+        """)
+        existing: dict[str, dict[int, str]] = {}
+        sources: dict[str, str] = {}
+        for row in cursor.fetchall():
+            sources[row["hash"]] = row["path"]
+            if row["size"] is not None:
+                existing.setdefault(row["hash"], {})[row["size"]] = row["thumbnail"]
+
+        jobs = [
+            (resolve_resource(path), digest, size)
+            for digest, path in sources.items()
+            for size in self.thumbnails.sizes
+            if not Path(existing.get(digest, {}).get(size, "")).is_file()
+        ]
+        if not jobs:
+            return 0
+
+        rendered = self.thumbnails.render(jobs)
+        cursor.executemany(
+            "INSERT OR REPLACE INTO thumbnails (asset_hash, size, path) "
+            "VALUES (?, ?, ?)",
+            [(digest, size, str(path)) for (digest, size), path in rendered.items()]
+        )
+        conn.commit()
+        return len(rendered)
+
+    def _refresh_atlases(self, conn: sqlite3.Connection) -> int:
+        """Packs each category's thumbnails into an atlas.
+
+        A category is rebuilt only when its signature (the set of asset
+        hashes it shows) no longer matches the recorded atlas.
+
+        Returns:
+            The number of atlases built.
+        """
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT p.category_id, p.asset_hash, COALESCE(t.path, a.path) AS source
+            FROM pictograms p
+            JOIN assets a ON a.hash = p.asset_hash
+            LEFT JOIN thumbnails t ON t.asset_hash = a.hash AND t.size = ?
+        """, (BUTTON_SIZE,))
+        members: dict[str, dict[str, Path]] = {}
+        for row in cursor.fetchall():
+            members.setdefault(row["category_id"], {})[row["asset_hash"]] = (
+                resolve_resource(row["source"])
+            )
+
+        current = {
+            row["category_id"]: row
+            for row in cursor.execute("SELECT * FROM atlases")
+        }
+        built = 0
+        for cat_id, sources in members.items():
+            signature = atlas_signature(sources)
+            record = current.get(cat_id)
+            if (
+                record is not None
+                and record["signature"] == signature
+                and Path(record["path"]).is_file()
+            ):
+                continue
+
+            destination = self.cache_dir / "atlases" / f"{signature}.png"
+            index = build_atlas(sources, destination)
+            cursor.execute(
+                "INSERT OR REPLACE INTO atlases (category_id, path, signature) "
+                "VALUES (?, ?, ?)",
+                (cat_id, str(destination), signature)
+            )
+            cursor.execute(
+                "DELETE FROM atlas_entries WHERE category_id = ?", (cat_id,)
+            )
+            cursor.executemany(
+                "INSERT INTO atlas_entries "
+                "(category_id, asset_hash, x, y, width, height) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(cat_id, asset_hash, *box) for asset_hash, box in index.items()]
+            )
+            built += 1
+
+        for cat_id in current.keys() - members.keys():
+            cursor.execute("DELETE FROM atlases WHERE category_id = ?", (cat_id,))
+            cursor.execute(
+                "DELETE FROM atlas_entries WHERE category_id = ?", (cat_id,)
+            )
+        conn.commit()
+        return built
+
+    def _index_assets(self, conn: sqlite3.Connection) -> None:
+        """Hashes pictogram sources and links each pictogram to its asset.
+
+        Files whose size and mtime match the recorded ones are not read
+        again. Identical copies share one asset, so everything derived
+        from assets scales with unique images rather than placements.
+        """
+        cursor = conn.cursor()
+        known = {
+            row["path"]: row
+            for row in cursor.execute("SELECT * FROM asset_sources")
+        }
+        cursor.execute(
+            "SELECT p.id, f.path, p.asset_hash FROM pictograms p "
+            "JOIN pictogram_files f ON f.id = p.id WHERE f.path IS NOT NULL"
+        )
+
+        observed: list[tuple[str, str, int, int]] = []
+        links: list[tuple[str, str]] = []
+        for row in cursor.fetchall():
+            stored = row["path"]
+            try:
+                stat = resolve_resource(stored).stat()
+            except OSError:
+                continue
+
+            record = known.get(stored)
+            if record is not None and _is_fresh(record, stat):
+                digest = record["hash"]
+            else:
+                digest = content_hash(resolve_resource(stored))
+                observed.append((stored, digest, stat.st_mtime_ns, stat.st_size))
+            if row["asset_hash"] != digest:
+                links.append((digest, row["id"]))
+
+        cursor.executemany(
+            "INSERT OR REPLACE INTO asset_sources (path, hash, mtime, size) "
+            "VALUES (?, ?, ?, ?)",
+            observed
+        )
+        cursor.executemany(
+            "UPDATE pictograms SET asset_hash = ? WHERE id = ?", links
+        )
+        if observed or links:
+            # Rebuild canonical paths and drop what nothing references
+            cursor.executescript("""
+                DELETE FROM asset_sources WHERE path NOT IN (
+                    SELECT path FROM pictogram_files WHERE path IS NOT NULL
+                );
+                DELETE FROM assets;
+                INSERT INTO assets (hash, path)
+                    SELECT hash, MIN(path) FROM asset_sources GROUP BY hash;
+                DELETE FROM thumbnails WHERE asset_hash NOT IN (
+                    SELECT hash FROM assets
+                );
+            """)
+        conn.commit()
+
+    def _seed_data(self, conn: sqlite3.Connection, queue: bool = False) -> None:
+        """Seed initial data from resources directory.
+
+        Args:
+            conn: Connection to seed through.
+            queue: Seed only FIRST_CATEGORY and insert the other
+                   top-level categories empty, queued for seed_pending().
+        """
         cursor = conn.cursor()
         
-        # Path to resources/pictograms
-        base_dir = Path(__file__).parent.parent
-        resources_dir = base_dir / "resources" / "pictograms"
+        resources_dir = self.resources_dir
         
         if not resources_dir.exists():
             print(f"Warning: Resources directory not found at {resources_dir}")
             return
 
 
-        # Iterate over directories (Categories)
-        for category_path in resources_dir.iterdir():
-            if category_path.is_dir():
-                cat_id = category_path.name
-                cat_name = category_path.name.capitalize()
-                
-                cursor.execute(
-                    "INSERT INTO categories (id, name) VALUES (?, ?)", 
-                    (cat_id, cat_name)
-                )
-                
-                # Iterate over files (Pictograms)
-                for file_path in category_path.iterdir():
-                    if file_path.is_file() and file_path.suffix.lower() in [
-                        '.png', '.jpg', '.jpeg'
-                    ]:
-                        # id = filename without extension
-                        pic_id = file_path.stem
-                        # label = filename capitalized (replace _ with space)
-                        label = pic_id.replace("_", " ").capitalize()
-                        voice = label
-                        
-                        # Store relative path for now
-                        icon_rel_path = (
-                            f"resources/pictograms/{cat_id}/{file_path.name}"
-                        )
-                        
-                        cursor.execute(
-                            "INSERT INTO pictograms "
-                            "(id, category_id, label, voice_command, icon_path) "
-                            "VALUES (?, ?, ?, ?, ?)",
-                            (pic_id, cat_id, label, voice, icon_rel_path)
-                        )
+        # Iterate over directories (Categories); sorted, so the same
+        # folder gets an id shared with another one on every install
+        for category_path in sorted(resources_dir.iterdir()):
+            if not category_path.is_dir():
+                continue
+            if queue and category_path.name != FIRST_CATEGORY:
+                self._queue_category(cursor, category_path, None)
+            else:
+                self._seed_category(cursor, category_path, None)
         
         conn.commit()
+
+    def _queue_category(
+        self,
+        cursor: sqlite3.Cursor,
+        category_path: Path,
+        parent_id: str | None
+    ) -> str | None:
+        """Inserts an empty category for a folder and queues its seeding.
+
+        Returns:
+            The category id, or None if a board edit deleted it.
+        """
+        cat_id = self._insert_category(cursor, category_path, parent_id)
+        if cat_id is None:
+            return None
+        cursor.execute(
+            "INSERT OR IGNORE INTO seed_queue (category_id) VALUES (?)", (cat_id,)
+        )
+        return cat_id
+
+    def _insert_category(
+        self,
+        cursor: sqlite3.Cursor,
+        category_path: Path,
+        parent_id: str | None
+    ) -> str | None:
+        """Inserts the categories row of a folder; returns its id.
+
+        A folder whose category a board edit deleted is skipped (None).
+        """
+        cat_id = category_path.relative_to(self.resources_dir).as_posix()
+        cursor.execute("SELECT 1 FROM deleted_categories WHERE id = ?", (cat_id,))
+        if cursor.fetchone() is not None:
+            return None
+        cursor.execute(
+            "INSERT INTO categories (id, name, parent_id, dir) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (id) DO NOTHING",
+            (
+                cat_id,
+                category_path.name.capitalize(),
+                parent_id,
+                _stored_path(category_path),
+            )
+        )
+        return cat_id
+
+    def _seed_category(
+        self,
+        cursor: sqlite3.Cursor,
+        category_path: Path,
+        parent_id: str | None
+    ) -> str | None:
+        """Seed a category folder, its pictograms and its subfolders.
+
+        The category id is the folder's path under the resources
+        directory ('food/fruit'), so nested names never collide. The
+        folder is stored once, on the category; pictograms store only
+        their file names.
+
+        Returns:
+            The category id, or None if a board edit deleted it.
+        """
+        cat_id = self._insert_category(cursor, category_path, parent_id)
+        if cat_id is None:
+            return None
+        self._sync_pictograms(cursor, category_path, cat_id)
+
+        # Parents are inserted first so the closure triggers can link them
+        for subfolder in sorted(category_path.iterdir()):
+            if subfolder.is_dir():
+                self._seed_category(cursor, subfolder, cat_id)
+        return cat_id
+
+    def _rebuild_category_tree(self, conn: sqlite3.Connection) -> None:
+        """Recomputes the closure table from the parent links."""
+        conn.execute("DELETE FROM category_tree")
+        conn.execute("""
+            INSERT INTO category_tree (ancestor, descendant, depth)
+            WITH RECURSIVE tree (ancestor, descendant, depth) AS (
+                SELECT id, id, 0 FROM categories
+                UNION ALL
+                SELECT tree.ancestor, c.id, tree.depth + 1
+                FROM tree JOIN categories c ON c.parent_id = tree.descendant
+            )
+            SELECT ancestor, descendant, depth FROM tree
+        """)
+        conn.commit()
+
+    def _seed_labels(self, conn: sqlite3.Connection) -> None:
+        """Seed translations from ``labels.<locale>.json`` in each category.
+
+        Each file maps image names (without extension) to a label, or to
+        an object with ``label`` and ``voice`` when the spoken text
+        differs; the ``_category`` key names the category itself.
+        """
+        cursor = conn.cursor()
+        # Queued folders get their labels when seed_pending() reaches them
+        cursor.execute(
+            "SELECT id FROM categories"
+            " WHERE id NOT IN (SELECT category_id FROM seed_queue)"
+        )
+        for row in cursor.fetchall():
+            self._seed_category_labels(cursor, row["id"])
+
+        conn.commit()
+
+    def _seed_category_labels(self, cursor: sqlite3.Cursor, cat_id: str) -> None:
+        """Seed the translations found in one category folder."""
+        for labels_file in (self.resources_dir / cat_id).glob("labels.*.json"):
+            locale = labels_file.suffixes[0].lstrip(".")
+            entries = json.loads(labels_file.read_text(encoding="utf-8"))
+
+            name = entries.pop(CATEGORY_KEY, None)
+            if name:
+                cursor.execute(
+                    "INSERT OR REPLACE INTO category_labels "
+                    "(category_id, locale, name) VALUES (?, ?, ?)",
+                    (cat_id, locale, name)
+                )
+
+            for pic_id, entry in entries.items():
+                if isinstance(entry, str):
+                    label, voice = entry, None
+                else:
+                    label, voice = entry["label"], entry.get("voice")
+                cursor.execute(
+                    "INSERT OR REPLACE INTO pictogram_labels "
+                    "(pictogram_id, locale, label, voice_command) "
+                    "SELECT id, ?, ?, ? FROM pictograms "
+                    "WHERE id IN (?, ?) AND category_id = ?",
+                    (locale, label, voice, pic_id, f"{cat_id}/{pic_id}", cat_id)
+                )
+
+
+def _is_image(path: Path) -> bool:
+    """Whether a path is a pictogram image file."""
+    return path.is_file() and path.suffix.lower() in IMAGE_SUFFIXES
+
+
+def _pictogram_row(
+    file_path: Path, cat_id: str, namespaced: bool = False
+) -> tuple[str, str, str, str]:
+    """The pictograms row seeded for an image file.
+
+    The id is the filename without extension, prefixed with the category
+    id when namespaced ('drinks/juice'); the label is the filename
+    capitalized, with '_' replaced by spaces. The voice is left NULL, as
+    the label is what gets spoken.
+    """
+    pic_id = f"{cat_id}/{file_path.stem}" if namespaced else file_path.stem
+    label = file_path.stem.replace("_", " ").capitalize()
+    return (pic_id, cat_id, label, file_path.name)
+
+
+def _parent_id(cat_id: str) -> str | None:
+    """Parent of a category id ('food/fruit' -> 'food'; top level: None)."""
+    return cat_id.rpartition("/")[0] or None
+
+
+def _delete_categories(cursor: sqlite3.Cursor, cat_ids: list[str]) -> None:
+    """Deletes categories with their labels, pictograms and translations."""
+    marks = ", ".join("?" * len(cat_ids))
+    pictograms = f"SELECT id FROM pictograms WHERE category_id IN ({marks})"
+    for statement in (
+        f"DELETE FROM pictogram_labels WHERE pictogram_id IN ({pictograms})",
+        f"DELETE FROM pictograms WHERE category_id IN ({marks})",
+        f"DELETE FROM category_labels WHERE category_id IN ({marks})",
+        f"DELETE FROM categories WHERE id IN ({marks})",
+    ):
+        cursor.execute(statement, cat_ids)
+
+
+def _subtree(cursor: sqlite3.Cursor, cat_id: str) -> list[str]:
+    """A category id and the ids of all categories below it."""
+    cursor.execute(
+        "SELECT descendant FROM category_tree WHERE ancestor = ?", (cat_id,)
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _is_fresh(record: sqlite3.Row, stat: os.stat_result) -> bool:
+    """Whether a recorded source file is unchanged on disk."""
+    return bool(
+        record["mtime"] == stat.st_mtime_ns
+        and record["size"] == stat.st_size
+    )
+
+
+def _normalize_pictograms(conn: sqlite3.Connection) -> int:
+    """Schema 1: folders stored per category, voices NULL when the label.
+
+    Each category's ``dir`` becomes the folder most of its images are
+    in; those rows keep just a ``file_name``. Images elsewhere keep
+    their full ``icon_path``.
+
+    Returns:
+        The number of rows rewritten.
+    """
+    cursor = conn.cursor()
+    if "dir" not in _columns(cursor, "categories"):
+        cursor.execute("ALTER TABLE categories ADD COLUMN dir TEXT")
+    if "file_name" not in _columns(cursor, "pictograms"):
+        cursor.execute("ALTER TABLE pictograms ADD COLUMN file_name TEXT")
+    cursor.execute(PICTOGRAM_FILES_VIEW)
+
+    cursor.execute(
+        "SELECT id, category_id, icon_path FROM pictograms "
+        "WHERE icon_path LIKE '%/%'"
+    )
+    rows = [
+        (row["id"], row["category_id"], *row["icon_path"].rpartition("/")[::2])
+        for row in cursor.fetchall()
+    ]
+    folders: dict[str, Counter[str]] = {}
+    for _, cat_id, folder, _ in rows:
+        folders.setdefault(cat_id, Counter())[folder] += 1
+    dirs = {
+        cat_id: counts.most_common(1)[0][0] for cat_id, counts in folders.items()
+    }
+    cursor.executemany(
+        "UPDATE categories SET dir = ? WHERE id = ? AND dir IS NULL",
+        [(folder, cat_id) for cat_id, folder in dirs.items()]
+    )
+    moved = [
+        (file_name, pic_id)
+        for pic_id, cat_id, folder, file_name in rows
+        if folder == dirs[cat_id]
+    ]
+    cursor.executemany(
+        "UPDATE pictograms SET file_name = ?, icon_path = NULL WHERE id = ?", moved
+    )
+    rewritten = len(moved)
+    for table in ("pictograms", "pictogram_labels"):
+        cursor.execute(
+            f"UPDATE {table} SET voice_command = NULL WHERE voice_command = label"
+        )
+        rewritten += cursor.rowcount
+    return rewritten
+
+
+# Schema upgrades; the database's user_version counts those applied
+MIGRATIONS: list[Callable[[sqlite3.Connection], int]] = [
+    _normalize_pictograms,
+]
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Applies the MIGRATIONS a database hasn't had yet.
+
+    Each one commits together with its bump of ``user_version``, so an
+    interrupted upgrade resumes where it stopped. If rows were
+    rewritten, the file is vacuumed to hand the freed pages back.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    rewritten = 0
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        rewritten += migration(conn)
+        conn.execute(f"PRAGMA user_version = {number}")
+        conn.commit()
+    if rewritten:
+        conn.execute("VACUUM")
+
+
+def _columns(cursor: sqlite3.Cursor, table: str) -> set[str]:
+    """Column names of a table (empty if the table doesn't exist)."""
+    return {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
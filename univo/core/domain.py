@@ -1,5 +1,5 @@
-from collections.abc import Iterator
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field, replace
 from typing import Any
 
 
@@ -12,11 +12,15 @@ class Pictogram:
         label: Human-readable text displayed with the pictogram.
         image_path: Path to the image file relative to resources.
         voice_command: The text to be spoken by TTS when selected.
+        thumbnail_path: Button-sized copy of the image, when one exists.
+        asset_hash: Content hash of the image, shared by identical copies.
     """
     id: str
     label: str
     image_path: str | None = None
     voice_command: str | None = None
+    thumbnail_path: str | None = None
+    asset_hash: str | None = None
 
     def __str__(self) -> str:
         """User-friendly representation (e.g., 'Yes (yes)')."""
@@ -34,10 +38,14 @@ class Category:
     Implements the Sequence protocol (__len__, __getitem__, __iter__)
     allowing it to be used like an immutable list of pictograms.
     Supports dynamic attribute access for getting pictograms by ID.
+    Categories nest: ``children`` are the direct subcategories and
+    ``parent_id`` is None for top-level ones.
     """
     id: str
     name: str
     pictograms: list[Pictogram]
+    parent_id: str | None = None
+    children: list[Category] = field(default_factory=list)
 
     def __len__(self) -> int:
         """Returns the number of pictograms in the category."""
@@ -89,4 +97,186 @@ class Category:
         )
 
 
+@dataclass(slots=True)
+class Sentence:
+    """An utterance being built from selected pictograms.
+
+    Implements the Sequence protocol like Category, plus list-like
+    editing, and knows the text that speaks it.
+    """
+    pictograms: list[Pictogram] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Returns the number of pictograms in the sentence."""
+        return len(self.pictograms)
+
+    def __getitem__(self, position: int | slice) -> Any:
+        """Supports indexing and slicing (Sequence protocol)."""
+        return self.pictograms[position]
+
+    def __iter__(self) -> Iterator[Pictogram]:
+        """Iterates over the pictograms (Sequence protocol)."""
+        return iter(self.pictograms)
+
+    def __str__(self) -> str:
+        """The sentence as displayed (labels)."""
+        return " ".join(p.label for p in self.pictograms)
+
+    def __repr__(self) -> str:
+        """Formal developer representation."""
+        return f"Sentence({[p.id for p in self.pictograms]!r})"
+
+    @property
+    def voice_commands(self) -> list[str]:
+        """What each pictogram speaks, in order."""
+        return [p.voice_command or p.label for p in self.pictograms]
+
+    @property
+    def text(self) -> str:
+        """The whole utterance as spoken."""
+        return " ".join(self.voice_commands)
+
+    def append(self, pictogram: Pictogram) -> None:
+        """Adds a pictogram at the end."""
+        self.pictograms.append(pictogram)
+
+    def pop(self) -> Pictogram | None:
+        """Removes and returns the last pictogram (backspace)."""
+        return self.pictograms.pop() if self.pictograms else None
+
+    def clear(self) -> None:
+        """Empties the sentence."""
+        self.pictograms.clear()
+
 
+@dataclass(slots=True, weakref_slot=True)
+class Catalog:
+    """Every category and pictogram of a board, resolved for one locale.
+
+    Iterates over categories (Iterable protocol) and looks pictograms
+    up by id (``catalog['yes']``, Mapping-style).
+
+    Once handed out by PictogramService, a catalog is an immutable
+    snapshot of one ``version`` of the board: nothing modifies it or the
+    categories, pictograms and lists it holds. Changes produce the next
+    version through ``patched``, which shares every unchanged object.
+    A reader keeps a version alive simply by holding on to it.
+    """
+    locale: str | None
+    categories: dict[str, Category]
+    pictograms: dict[str, Pictogram]
+    version: int = 0
+
+    def __len__(self) -> int:
+        """Returns the number of categories."""
+        return len(self.categories)
+
+    def __iter__(self) -> Iterator[Category]:
+        """Iterates over the categories in board order."""
+        return iter(self.categories.values())
+
+    def __getitem__(self, pictogram_id: str) -> Pictogram:
+        """Finds a pictogram by id; raises KeyError if unknown."""
+        return self.pictograms[pictogram_id]
+
+    def link_children(self) -> None:
+        """Rebuilds every category's ``children`` from the parent links."""
+        for category in self.categories.values():
+            category.children.clear()
+        for category in self.categories.values():
+            parent = self.categories.get(category.parent_id or "")
+            if parent is not None:
+                parent.children.append(category)
+
+    def patched(
+        self,
+        fresh: Catalog,
+        category_ids: Iterable[str],
+        version: int | None = None
+    ) -> Catalog:
+        """The next version, with some categories swapped for fresh copies.
+
+        The catalog itself is never modified, so readers on other threads
+        keep a consistent view. Untouched categories and pictograms are
+        shared; a category whose children changed is copied, and so are
+        its ancestors.
+
+        Args:
+            fresh: Freshly loaded rows of the categories in question.
+            category_ids: Categories to replace; those missing from
+                          ``fresh`` are dropped.
+            version: Version of the result. Defaults to this one's plus one.
+        """
+        categories = dict(self.categories)
+        pictograms = dict(self.pictograms)
+        for cat_id in category_ids:
+            for pictogram in categories.get(cat_id) or ():
+                pictograms.pop(pictogram.id, None)
+            if cat_id in fresh.categories:
+                # Assigning keeps an existing category in board order
+                categories[cat_id] = fresh.categories[cat_id]
+            else:
+                categories.pop(cat_id, None)
+        pictograms.update(fresh.pictograms)
+
+        kids: dict[str, list[str]] = {}
+        depths: dict[str, int] = {}
+        for category in categories.values():
+            if category.parent_id in categories:
+                kids.setdefault(category.parent_id, []).append(category.id)
+            depth, parent = 0, categories.get(category.parent_id or "")
+            while parent is not None and depth < len(categories):
+                depth += 1
+                parent = categories.get(parent.parent_id or "")
+            depths[category.id] = depth
+        # Deepest first, so a parent sees its children's final objects
+        for cat_id in sorted(categories, key=depths.__getitem__, reverse=True):
+            category = categories[cat_id]
+            children = [categories[kid] for kid in kids.get(cat_id, ())]
+            if len(children) != len(category.children) or any(
+                new is not old
+                for new, old in zip(children, category.children, strict=True)
+            ):
+                categories[cat_id] = replace(category, children=children)
+
+        return Catalog(
+            locale=self.locale,
+            categories=categories,
+            pictograms=pictograms,
+            version=self.version + 1 if version is None else version
+        )
+
+    @property
+    def roots(self) -> list[Category]:
+        """Top-level categories, in board order."""
+        return [c for c in self.categories.values() if c.parent_id is None]
+
+    def subtree(self, category_id: str) -> list[Category]:
+        """A category and every category below it, shallowest first."""
+        category = self.categories.get(category_id)
+        found = [category] if category is not None else []
+        for below in found:
+            found.extend(below.children)
+        return found
+
+    def ancestors(self, category_id: str) -> list[Category]:
+        """The path from the top level down to a category, inclusive."""
+        path: list[Category] = []
+        category = self.categories.get(category_id)
+        while category is not None and len(path) <= len(self.categories):
+            path.append(category)
+            category = self.categories.get(category.parent_id or "")
+        return path[::-1]
+
+    def __contains__(self, item: object) -> bool:
+        """Checks whether a pictogram (or pictogram id) is in the catalog."""
+        if isinstance(item, Pictogram):
+            item = item.id
+        return item in self.pictograms
+
+    def __repr__(self) -> str:
+        """Formal developer representation."""
+        return (
+            f"Catalog(locale={self.locale!r}, categories={len(self)}, "
+            f"pictograms={len(self.pictograms)})"
+        )
@@ -0,0 +1,367 @@
+"""Board editing for UniVo.
+
+Caregivers reorganize boards through BoardEdit rather than by changing
+files on disk. An edit is one SQLite transaction: every operation runs
+inside it, so moving hundreds of pictograms costs a single commit, and
+an exception anywhere leaves the board untouched.
+
+Each operation records its inverse as a row-level before-image
+(``["insert", table, row]``, ``["delete", table, key]`` or
+``["update", table, key, old_values]``). A committed edit stores that
+list as one entry of the ``edit_log`` table; undoing replays it
+backwards, in a transaction of its own. Rows that changed since the
+edit, such as pictograms a resource sync added back, are left as they
+are.
+"""
+import json
+import sqlite3
+import time
+from collections.abc import Iterable, Sequence
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any
+
+from .database import DatabaseManager, _stored_path
+
+# Primary key columns of every table an edit may touch
+KEYS: dict[str, tuple[str, ...]] = {
+    "categories": ("id",),
+    "pictograms": ("id",),
+    "category_labels": ("category_id", "locale"),
+    "pictogram_labels": ("pictogram_id", "locale"),
+    "deleted_images": ("path",),
+    "deleted_categories": ("id",),
+}
+# Undo entries kept; older edits can no longer be undone
+UNDO_DEPTH = 100
+
+Change = list[Any]
+
+
+class BoardEdit:
+    """One transaction of board edits.
+
+    Usually obtained from PictogramService.edit(), which commits it and
+    refreshes the cached catalogs. Operations raise KeyError for ids
+    that don't exist and sqlite3.IntegrityError for ids that already do.
+
+    The edit holds the database's write lock (DatabaseManager.writing())
+    until it is committed or rolled back, so resource syncs and
+    maintenance wait for it, and its rows count towards
+    DatabaseManager.writes.
+    """
+    def __init__(self, db: DatabaseManager) -> None:
+        """Open the transaction.
+
+        Args:
+            db: Database to edit.
+        """
+        self.db = db
+        self.changes: list[Change] = []
+        self.category_ids: set[str] = set()
+        self.has_images = False
+        self._writing = ExitStack()
+        self._conn = self._writing.enter_context(db.writing())
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._writing.close()
+            raise
+
+    def __len__(self) -> int:
+        """Returns the number of row changes made so far."""
+        return len(self.changes)
+
+    # Pictograms
+
+    def add_pictogram(
+        self,
+        pictogram_id: str,
+        category_id: str,
+        label: str,
+        voice_command: str | None = None,
+        image_path: Path | None = None
+    ) -> None:
+        """Adds a pictogram; without a voice, it speaks its label."""
+        self._require("categories", category_id)
+        self._insert("pictograms", {
+            "id": pictogram_id,
+            "category_id": category_id,
+            "label": label,
+            "voice_command": voice_command or None,
+            "icon_path": _stored_path(image_path) if image_path else None,
+        })
+        self.has_images |= image_path is not None
+        self.category_ids.add(category_id)
+
+    def rename_pictogram(
+        self,
+        pictogram_id: str,
+        label: str,
+        voice_command: str | None = None,
+        locale: str | None = None
+    ) -> None:
+        """Changes a pictogram's label and voice (in one locale, if given).
+
+        Without a voice, the pictogram speaks its new label.
+        """
+        row = self._require("pictograms", pictogram_id)
+        if locale is None:
+            self._update("pictograms", (pictogram_id,), {
+                "label": label, "voice_command": voice_command or None
+            })
+        else:
+            self._upsert("pictogram_labels", (pictogram_id, locale), {
+                "label": label, "voice_command": voice_command
+            })
+        self.category_ids.add(row["category_id"])
+
+    def move_pictogram(self, pictogram_id: str, category_id: str) -> None:
+        """Moves a pictogram to another category."""
+        self.move_pictograms([pictogram_id], category_id)
+
+    def move_pictograms(self, pictogram_ids: Iterable[str], category_id: str) -> None:
+        """Moves pictograms to a category, in the order given.
+
+        Images stay where they are: a pictogram that named a file in its
+        old category's folder records the full path instead.
+        """
+        self._require("categories", category_id)
+        for pictogram_id in pictogram_ids:
+            row = self._require("pictograms", pictogram_id)
+            image = self._conn.execute(
+                "SELECT path FROM pictogram_files WHERE id = ?", (pictogram_id,)
+            ).fetchone()[0]
+            self._update("pictograms", (pictogram_id,), {
+                "category_id": category_id, "icon_path": image
+            })
+            self.category_ids.add(row["category_id"])
+        self.category_ids.add(category_id)
+
+    def delete_pictogram(self, pictogram_id: str) -> None:
+        """Deletes a pictogram and its translations.
+
+        Its image is remembered, so syncing the folder doesn't add the
+        pictogram back.
+        """
+        row = self._require("pictograms", pictogram_id)
+        image = self._conn.execute(
+            "SELECT path FROM pictogram_files WHERE id = ?", (pictogram_id,)
+        ).fetchone()[0]
+        if image is not None and self._get("deleted_images", (image,)) is None:
+            self._insert("deleted_images", {"path": image})
+        for label in self._rows("pictogram_labels", "pictogram_id", pictogram_id):
+            self._delete("pictogram_labels", (pictogram_id, label["locale"]))
+        self._delete("pictograms", (pictogram_id,))
+        self.category_ids.add(row["category_id"])
+
+    # Categories
+
+    def add_category(
+        self, category_id: str, name: str, parent_id: str | None = None
+    ) -> None:
+        """Adds an empty category, at the top level or under a parent."""
+        if parent_id is not None:
+            self._require("categories", parent_id)
+        self._insert(
+            "categories", {"id": category_id, "name": name, "parent_id": parent_id}
+        )
+        self.category_ids.add(category_id)
+
+    def rename_category(
+        self, category_id: str, name: str, locale: str | None = None
+    ) -> None:
+        """Changes a category's name (in one locale, if given)."""
+        self._require("categories", category_id)
+        if locale is None:
+            self._update("categories", (category_id,), {"name": name})
+        else:
+            self._upsert("category_labels", (category_id, locale), {"name": name})
+        self.category_ids.add(category_id)
+
+    def move_category(self, category_id: str, parent_id: str | None) -> None:
+        """Moves a category (with everything below it) under a new parent.
+
+        Raises:
+            ValueError: If the new parent is the category or lies below it.
+        """
+        self._require("categories", category_id)
+        if parent_id is not None:
+            self._require("categories", parent_id)
+            if parent_id in self._subtree(category_id):
+                raise ValueError(f"Can't move {category_id!r} below itself")
+        self._update("categories", (category_id,), {"parent_id": parent_id})
+        self.category_ids.add(category_id)
+
+    def delete_category(self, category_id: str) -> None:
+        """Deletes a category, its subcategories and all their pictograms.
+
+        The categories are remembered, so syncing their folders doesn't
+        add them back.
+        """
+        self._require("categories", category_id)
+        # Deepest first, so undo recreates parents before children
+        for cat_id in reversed(self._subtree(category_id)):
+            for pictogram in self._rows("pictograms", "category_id", cat_id):
+                self.delete_pictogram(pictogram["id"])
+            for label in self._rows("category_labels", "category_id", cat_id):
+                self._delete("category_labels", (cat_id, label["locale"]))
+            self._delete("categories", (cat_id,))
+            if self._get("deleted_categories", (cat_id,)) is None:
+                self._insert("deleted_categories", {"id": cat_id})
+            self.category_ids.add(cat_id)
+
+    # Transaction
+
+    def commit(self) -> set[str]:
+        """Commits every operation and logs their inverse for undo.
+
+        Returns:
+            The ids of the categories whose contents changed.
+        """
+        try:
+            if self.changes:
+                self._conn.execute(
+                    "INSERT INTO edit_log (changes, category_ids, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (
+                        json.dumps(self.changes),
+                        json.dumps(sorted(self.category_ids)),
+                        time.time(),
+                    )
+                )
+                self._conn.execute(
+                    "DELETE FROM edit_log WHERE id <= "
+                    "(SELECT MAX(id) FROM edit_log) - ?",
+                    (UNDO_DEPTH,)
+                )
+            self._conn.commit()
+        finally:
+            self._writing.close()
+        return self.category_ids
+
+    def rollback(self) -> None:
+        """Discards every operation."""
+        try:
+            self._conn.rollback()
+        finally:
+            self._writing.close()
+
+    def undo(self) -> set[str] | None:
+        """Reverts the most recent logged edit, then commits.
+
+        Returns:
+            The ids of the categories it changed, or None if the log
+            is empty.
+        """
+        try:
+            entry = self._conn.execute(
+                "SELECT * FROM edit_log ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            if entry is None:
+                self._conn.rollback()
+                return None
+            for change in reversed(json.loads(entry["changes"])):
+                self._revert(change)
+            self._conn.execute("DELETE FROM edit_log WHERE id = ?", (entry["id"],))
+            self._conn.commit()
+        except BaseException:
+            self._conn.rollback()
+            raise
+        finally:
+            self._writing.close()
+        return set(json.loads(entry["category_ids"]))
+
+    # Row primitives; each records its inverse
+
+    def _insert(self, table: str, row: dict[str, Any]) -> None:
+        self._execute_insert(table, row)
+        self.changes.append(["delete", table, [row[c] for c in KEYS[table]]])
+
+    def _update(
+        self, table: str, key: Sequence[Any], values: dict[str, Any]
+    ) -> None:
+        old = self._get(table, key)
+        if old is None:
+            raise KeyError(key[0])
+        self._execute_update(table, key, values)
+        self.changes.append(
+            ["update", table, list(key), {column: old[column] for column in values}]
+        )
+
+    def _upsert(
+        self, table: str, key: Sequence[Any], values: dict[str, Any]
+    ) -> None:
+        if self._get(table, key) is None:
+            self._insert(table, dict(zip(KEYS[table], key, strict=True)) | values)
+        else:
+            self._update(table, key, values)
+
+    def _delete(self, table: str, key: Sequence[Any]) -> None:
+        row = self._get(table, key)
+        if row is None:
+            raise KeyError(key[0])
+        self._execute_delete(table, key)
+        self.changes.append(["insert", table, dict(row)])
+
+    def _revert(self, change: Change) -> None:
+        match change:
+            case ["insert", table, row]:
+                self._execute_insert(table, row, keep_existing=True)
+            case ["delete", table, key]:
+                self._execute_delete(table, key)
+            case ["update", table, key, values]:
+                self._execute_update(table, key, values)
+
+    def _execute_insert(
+        self, table: str, row: dict[str, Any], keep_existing: bool = False
+    ) -> None:
+        columns = ", ".join(row)
+        marks = ", ".join("?" * len(row))
+        conflict = " ON CONFLICT DO NOTHING" if keep_existing else ""
+        self._conn.execute(
+            f"INSERT INTO {table} ({columns}) VALUES ({marks}){conflict}",
+            list(row.values())
+        )
+
+    def _execute_update(
+        self, table: str, key: Sequence[Any], values: dict[str, Any]
+    ) -> None:
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        self._conn.execute(
+            f"UPDATE {table} SET {assignments} WHERE {_where(table)}",
+            [*values.values(), *key]
+        )
+
+    def _execute_delete(self, table: str, key: Sequence[Any]) -> None:
+        self._conn.execute(f"DELETE FROM {table} WHERE {_where(table)}", list(key))
+
+    # Reads inside the transaction
+
+    def _get(self, table: str, key: Sequence[Any]) -> sqlite3.Row | None:
+        row: sqlite3.Row | None = self._conn.execute(
+            f"SELECT * FROM {table} WHERE {_where(table)}", list(key)
+        ).fetchone()
+        return row
+
+    def _require(self, table: str, row_id: str) -> sqlite3.Row:
+        row = self._get(table, (row_id,))
+        if row is None:
+            raise KeyError(row_id)
+        return row
+
+    def _rows(self, table: str, column: str, value: str) -> list[sqlite3.Row]:
+        return self._conn.execute(
+            f"SELECT * FROM {table} WHERE {column} = ?", (value,)
+        ).fetchall()
+
+    def _subtree(self, category_id: str) -> list[str]:
+        return [row[0] for row in self._conn.execute(
+            "SELECT descendant FROM category_tree WHERE ancestor = ? ORDER BY depth",
+            (category_id,)
+        )]
+
+
+def _where(table: str) -> str:
+    """WHERE clause matching a table's primary key."""
+    return " AND ".join(f"{column} = ?" for column in KEYS[table])
@@ -2,14 +2,18 @@
 
 Defines protocols to decouple domain logic from data source implementations.
 """
+from collections.abc import Callable, Sequence
+from pathlib import Path
 from typing import Any, Protocol
 
+from .atlas import Atlas
+from .domain import Catalog, Category, Pictogram
 
-class PictogramRepository(Protocol):
-    """Protocol for fetching pictogram and category data.
+
+class ConnectionProvider(Protocol):
+    """Protocol for raw access to the SQLite database.
     
-    Implementations must provide raw access to the database or 
-    persistence layer.
+    Used by stores that keep their own tables (usage log, predictions).
     """
     
     def get_connection(self) -> Any:
@@ -19,3 +23,115 @@ class PictogramRepository(Protocol):
         capable of executing queries.
         """
         ...
+
+
+class PictogramRepository(Protocol):
+    """Protocol for fetching pictogram and category data.
+    
+    Query-level, so any storage engine can back the service. Every
+    method takes the locale whose labels to return; None means the
+    seeded labels.
+    """
+
+    def locales(self) -> list[str]:
+        """Locales with at least one localized label."""
+        ...
+
+    def load_catalog(
+        self,
+        locale: str | None = None,
+        category_ids: Sequence[str] | None = None
+    ) -> Catalog:
+        """All categories and pictograms (or just some categories) at once.
+
+        Returns a fresh Catalog the caller owns and may modify.
+        """
+        ...
+
+    def list_categories(self, locale: str | None = None) -> list[Category]:
+        """Every category with its pictograms, in board order."""
+        ...
+
+    def get_category(
+        self, category_id: str, locale: str | None = None
+    ) -> Category | None:
+        """One category with its pictograms."""
+        ...
+
+    def get_pictograms(
+        self, pictogram_ids: Sequence[str], locale: str | None = None
+    ) -> list[Pictogram]:
+        """The pictograms found among ``pictogram_ids``, in that order."""
+        ...
+
+    def list_pictograms(
+        self,
+        after: str | None = None,
+        limit: int = 100,
+        locale: str | None = None
+    ) -> list[Pictogram]:
+        """One page of pictograms ordered by id, starting after ``after``."""
+        ...
+
+    def subtree_ids(self, category_id: str) -> list[str]:
+        """A category and every category below it, shallowest first."""
+        ...
+
+    def ancestor_ids(self, category_id: str) -> list[str]:
+        """The path from the top level down to a category, inclusive."""
+        ...
+
+    def pictogram_ids_under(self, category_id: str) -> list[str]:
+        """Every pictogram in a category or any category below it."""
+        ...
+
+    def get_atlas(self, category_id: str) -> Atlas | None:
+        """The sprite atlas of a category, if one exists."""
+        ...
+
+    def image_file(self, pictogram: Pictogram) -> Path | None:
+        """A file holding the pictogram's image, thumbnail first."""
+        ...
+
+
+class SpeechEngine(Protocol):
+    """Protocol for offline text-to-speech engines.
+    
+    Implementations render text to an audio file; they are free to be
+    slow, as synthesis runs off the UI thread and results are cached.
+    """
+
+    name: str
+    settings: dict[str, Any]
+
+    def synthesize(self, text: str, voice: str, destination: Path) -> None:
+        """Render ``text`` spoken with ``voice`` into a WAV file."""
+        ...
+
+
+class AudioPlayer(Protocol):
+    """Protocol for audio output."""
+
+    def play(self, path: Path) -> None:
+        """Start playing an audio file without waiting for it to finish."""
+        ...
+
+
+class BoardWatcher(Protocol):
+    """Protocol for sources of board changes made outside the app.
+
+    Listeners hear the ids of the categories that changed and run on
+    the watcher's own thread.
+    """
+
+    def subscribe(self, listener: Callable[[set[str]], None]) -> None:
+        """Calls ``listener`` with the changed category ids."""
+        ...
+
+    def start(self) -> bool:
+        """Starts watching in the background; False if it can't."""
+        ...
+
+    def close(self) -> None:
+        """Stops watching."""
+        ...
@@ -0,0 +1,303 @@
+"""Idle-time maintenance of the UniVo database.
+
+Reseeding and board edits on a long-lived install leave the query
+planner with stale statistics and a file that only grows. The
+``MaintenanceScheduler`` tracks how many rows were written since each
+step last ran (``DatabaseManager.writes``, kept across restarts in the
+``maintenance`` table) and how much of the file is free pages. Once the
+user has been idle for a while it runs the steps that are due,
+cheapest first:
+
+* ``checkpoint`` copies the write-ahead log into the database and
+  truncates it.
+* ``optimize`` (``PRAGMA optimize``) refreshes the statistics the
+  planner found lacking, with a bounded analysis.
+* ``analyze`` rebuilds every statistic after heavy writes.
+* ``vacuum`` rewrites the file once enough of it is free pages.
+
+Every run has a time budget. A step still running when the budget is
+spent, or when the user touches the app again, is interrupted and
+rolled back; it stays due for the next idle period.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from .database import DatabaseManager
+from .decorators import logger
+
+# Steps in the order they run
+STEPS = ("checkpoint", "optimize", "analyze", "vacuum")
+# Rows written before PRAGMA optimize, and before a full ANALYZE
+OPTIMIZE_WRITES = 100
+ANALYZE_WRITES = 5000
+# Write-ahead log size that is worth truncating
+CHECKPOINT_BYTES = 4 * 2**20
+# Share of free pages, and least free pages, before a VACUUM
+VACUUM_FRAGMENTATION = 0.2
+VACUUM_MIN_FREE_PAGES = 256
+# Rows PRAGMA optimize samples per index (see PRAGMA analysis_limit)
+ANALYSIS_LIMIT = 400
+# Seconds without user interaction before maintenance may run
+IDLE_AFTER = 60.0
+# Seconds a single maintenance run may take
+TIME_BUDGET = 2.0
+# SQLite virtual machine steps between budget checks
+PROGRESS_STEPS = 1000
+
+STATEMENTS = {
+    "checkpoint": "PRAGMA wal_checkpoint(TRUNCATE)",
+    "optimize": "PRAGMA optimize",
+    "analyze": "ANALYZE",
+    "vacuum": "VACUUM",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class DatabaseStats:
+    """Size and fragmentation of a database file.
+
+    Attributes:
+        page_size: Bytes per page.
+        page_count: Pages in the main file.
+        freelist_count: Pages in the main file holding no data.
+        wal_size: Bytes in the write-ahead log.
+    """
+    page_size: int
+    page_count: int
+    freelist_count: int
+    wal_size: int
+
+    @property
+    def size(self) -> int:
+        """Bytes in the main file."""
+        return self.page_size * self.page_count
+
+    @property
+    def fragmentation(self) -> float:
+        """Share of the main file that is free pages."""
+        return self.freelist_count / self.page_count if self.page_count else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.size / 2**20:.1f} MiB ({self.fragmentation:.0%} free), "
+            f"WAL {self.wal_size / 2**20:.1f} MiB"
+        )
+
+
+@dataclass(slots=True)
+class MaintenanceRun:
+    """What one maintenance run did.
+
+    Attributes:
+        before: Database statistics before the run.
+        after: Database statistics after the run.
+        steps: Steps that completed.
+        interrupted: Step cut short by the time budget or the user.
+        duration: Seconds the run took.
+    """
+    before: DatabaseStats
+    after: DatabaseStats
+    steps: list[str] = field(default_factory=list)
+    interrupted: str | None = None
+    duration: float = 0.0
+
+
+def database_stats(db: DatabaseManager) -> DatabaseStats:
+    """Current size and fragmentation of a database."""
+    with db.get_connection() as conn:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    try:
+        wal_size = os.path.getsize(f"{db.db_path}-wal")
+    except OSError:
+        wal_size = 0
+    return DatabaseStats(page_size, page_count, freelist_count, wal_size)
+
+
+class MaintenanceScheduler:
+    """Runs due maintenance on a database whenever the user is idle.
+
+    UIs call touch() on every interaction. A background thread checks
+    every ``poll_interval`` seconds; after ``idle_after`` quiet seconds
+    it runs the due steps within ``budget`` seconds, holding off the
+    database's other writers meanwhile.
+    """
+    def __init__(
+        self,
+        db: DatabaseManager | None,
+        idle_after: float = IDLE_AFTER,
+        budget: float = TIME_BUDGET,
+        poll_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Create a scheduler; nothing runs until start().
+
+        Args:
+            db: Database to maintain. None (a catalog without a
+                database) maintains nothing.
+            idle_after: Seconds without interaction before a run.
+            budget: Longest a run may take, in seconds.
+            poll_interval: Seconds between checks for due work.
+            clock: Monotonic time source, in seconds.
+        """
+        self.db = db
+        self.idle_after = idle_after
+        self.budget = budget
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self._last_activity = clock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stored: dict[str, int] = dict.fromkeys(STEPS, 0)
+        # Writes already counted in _stored; the ones made while opening
+        # (seeding) still count
+        self._baseline = 0
+        if db is not None:
+            with db.get_connection() as conn:
+                self._stored.update(
+                    (row["step"], row["writes"])
+                    for row in conn.execute("SELECT step, writes FROM maintenance")
+                    if row["step"] in self._stored
+                )
+
+    def touch(self) -> None:
+        """Records a user interaction; interrupts a run in progress."""
+        self._last_activity = self.clock()
+
+    @property
+    def idle(self) -> bool:
+        """Whether the user has been idle long enough for a run."""
+        return self.clock() - self._last_activity >= self.idle_after
+
+    def pending_writes(self) -> dict[str, int]:
+        """Rows written since each step last ran."""
+        written = self.db.writes - self._baseline if self.db is not None else 0
+        return {step: count + written for step, count in self._stored.items()}
+
+    def due(self, stats: DatabaseStats | None = None) -> list[str]:
+        """Steps worth running now, in running order."""
+        if self.db is None:
+            return []
+        if stats is None:
+            stats = database_stats(self.db)
+        writes = self.pending_writes()
+        checks = {
+            "checkpoint": stats.wal_size >= CHECKPOINT_BYTES,
+            "optimize": writes["optimize"] >= OPTIMIZE_WRITES,
+            "analyze": writes["analyze"] >= ANALYZE_WRITES,
+            "vacuum": (
+                stats.freelist_count >= VACUUM_MIN_FREE_PAGES
+                and stats.fragmentation >= VACUUM_FRAGMENTATION
+            ),
+        }
+        return [step for step in STEPS if checks[step]]
+
+    def run(self, steps: list[str] | None = None) -> MaintenanceRun | None:
+        """Runs the due steps (or the given ones) now, within the budget.
+
+        Returns:
+            What was done, or None if nothing was due.
+        """
+        if self.db is None:
+            return None
+        before = database_stats(self.db)
+        if steps is None:
+            steps = self.due(before)
+        if not steps:
+            return None
+        started = self.clock()
+        deadline = started + self.budget
+
+        def interrupt() -> bool:
+            now = self.clock()
+            return now > deadline or self._last_activity > started
+
+        done: list[str] = []
+        interrupted = None
+        with self.db.writing() as conn:
+            conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+            conn.set_progress_handler(interrupt, PROGRESS_STEPS)
+            for step in steps:
+                try:
+                    conn.execute(STATEMENTS[step]).fetchall()
+                except sqlite3.OperationalError as exc:
+                    interrupted = step
+                    logger.info(f"Maintenance step {step} stopped: {exc}")
+                    break
+                done.append(step)
+            conn.set_progress_handler(None, 0)
+            self._record(conn, done)
+        # Maintenance's own writes don't count towards the next run
+        self._baseline = self.db.writes
+
+        result = MaintenanceRun(
+            before, database_stats(self.db), done, interrupted,
+            self.clock() - started
+        )
+        logger.info(
+            f"Maintenance ran {done or 'nothing'} in {result.duration:.2f}s: "
+            f"{result.before} -> {result.after}"
+        )
+        return result
+
+    def start(self) -> bool:
+        """Starts checking for due work in the background.
+
+        Returns:
+            False if there is no database to maintain.
+        """
+        if self.db is None:
+            return False
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="univo-maintenance", daemon=True
+            )
+            self._thread.start()
+        return True
+
+    def close(self) -> None:
+        """Stops the background thread and saves the write counts."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.db is not None:
+            with self.db.get_connection() as conn:
+                self._record(conn, [])
+            self._baseline = self.db.writes
+
+    def _record(self, conn: sqlite3.Connection, done: list[str]) -> None:
+        """Stores the pending writes, resetting the steps that just ran."""
+        pending = self.pending_writes()
+        for step in done:
+            pending[step] = 0
+        conn.executemany(
+            "INSERT INTO maintenance (step, writes, ran_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (step) DO UPDATE SET writes = excluded.writes, "
+            "ran_at = COALESCE(excluded.ran_at, ran_at)",
+            [
+                (step, writes, time.time() if step in done else None)
+                for step, writes in pending.items()
+            ]
+        )
+        conn.commit()
+        self._stored = pending
+
+    def _run(self) -> None:
+        # At most one run per idle period, so work that never fits the
+        # budget isn't retried over and over while the user is away
+        maintained_after: float | None = None
+        while not self._stop.wait(self.poll_interval):
+            period = self._last_activity
+            if not self.idle or period == maintained_after:
+                continue
+            try:
+                if self.run() is not None:
+                    maintained_after = period
+            except Exception:
+                logger.exception("Database maintenance failed")
@@ -0,0 +1,182 @@
+"""Memory instrumentation and budgets for UniVo.
+
+Low-end tablets kill background apps that hold on to too much memory.
+This module shows where the memory goes and gives it back before the
+OS steps in:
+
+* ``breakdown`` groups a tracemalloc snapshot by subsystem (domain
+  objects, widgets, icons, database, audio) using the traceback of
+  each allocation, so tracing must be started with several frames
+  (``start_tracing``).
+* ``MemoryBudget`` watches the process size and, whenever it is over
+  budget, shrinks the registered caches one at a time in the fixed
+  order of ``SHRINK_ORDER``: the cheapest to rebuild go first.
+"""
+import gc
+import os
+import tracemalloc
+from collections.abc import Callable
+
+from .decorators import logger
+
+# Frames kept per allocation; enough to reach UniVo code from a library
+TRACE_FRAMES = 25
+
+# Subsystems by the source files an allocation passes through, tried
+# in order against each frame, innermost first
+SUBSYSTEMS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("icons", (
+        "PIL/", "toga/icons.py", "toga/images.py",
+        "univo/core/thumbnails.py", "univo/core/atlas.py",
+    )),
+    ("widgets", ("toga/", "textual/", "rich/", "univo/ui/")),
+    ("domain", (
+        "univo/core/domain.py", "univo/core/services.py",
+        "univo/core/repositories.py", "univo/core/pack.py",
+        "univo/core/remote.py", "univo/core/editing.py",
+    )),
+    ("database", ("sqlite3/", "univo/core/database.py", "univo/core/usage.py")),
+    ("audio", ("univo/core/tts.py",)),
+)
+OTHER = "other"
+
+# Caches a budget may shrink, first to last
+SHRINK_ORDER = ("service", "icons", "widgets")
+
+
+def start_tracing(frames: int = TRACE_FRAMES) -> None:
+    """Starts tracemalloc with enough frames for ``breakdown``."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def subsystem_of(traceback: tracemalloc.Traceback) -> str:
+    """The subsystem an allocation belongs to, from its traceback."""
+    # Tracebacks run oldest frame first; the innermost frame is the most telling
+    for frame in reversed(traceback):
+        filename = frame.filename.replace(os.sep, "/")
+        for subsystem, patterns in SUBSYSTEMS:
+            if any(pattern in filename for pattern in patterns):
+                return subsystem
+    return OTHER
+
+
+def breakdown(snapshot: tracemalloc.Snapshot | None = None) -> dict[str, int]:
+    """Bytes currently allocated per subsystem, largest first.
+
+    Args:
+        snapshot: Snapshot to group. Defaults to one taken now.
+
+    Raises:
+        RuntimeError: If no snapshot is given and tracing is off.
+    """
+    if snapshot is None:
+        snapshot = tracemalloc.take_snapshot()
+    sizes = dict.fromkeys([name for name, _ in SUBSYSTEMS] + [OTHER], 0)
+    for statistic in snapshot.statistics("traceback"):
+        sizes[subsystem_of(statistic.traceback)] += statistic.size
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+def format_breakdown(sizes: dict[str, int]) -> str:
+    """A small table of a ``breakdown``, one subsystem per line."""
+    total = sum(sizes.values()) or 1
+    lines = [
+        f"{name:<10} {size / 1024:>10,.0f} KiB {100 * size / total:>5.1f}%"
+        for name, size in sizes.items()
+    ]
+    lines.append(f"{'total':<10} {sum(sizes.values()) / 1024:>10,.0f} KiB")
+    return "\n".join(lines)
+
+
+def memory_report() -> str:
+    """The current breakdown as text, starting tracing if needed."""
+    if not tracemalloc.is_tracing():
+        start_tracing()
+        return "Memory tracing started; allocations from now on will be shown."
+    return format_breakdown(breakdown())
+
+
+def resident_memory() -> int | None:
+    """The process's resident set size in bytes, where the OS reports it."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def current_usage() -> int:
+    """Memory in use: the resident size, else what tracemalloc traces.
+
+    Returns 0 where neither is available, so a budget never triggers.
+    """
+    resident = resident_memory()
+    if resident is not None:
+        return resident
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    return 0
+
+
+class MemoryBudget:
+    """Shrinks caches, in a fixed order, while memory is over a limit.
+
+    Each ``check`` that finds the process over budget shrinks the next
+    cache in ``SHRINK_ORDER``, so one large spike doesn't flush every
+    cache at once. Once usage is back under the limit the order starts
+    over; if every cache has been shrunk and usage is still too high,
+    checks do nothing more until it drops.
+    """
+    def __init__(
+        self,
+        limit: int,
+        measure: Callable[[], int] = current_usage
+    ) -> None:
+        """Create a budget.
+
+        Args:
+            limit: Budget in bytes.
+            measure: Returns the memory in use, in bytes.
+        """
+        self.limit = limit
+        self.measure = measure
+        self._shrinkers: dict[str, list[Callable[[], object]]] = {
+            name: [] for name in SHRINK_ORDER
+        }
+        self._next = 0
+
+    def register(self, cache: str, shrink: Callable[[], object]) -> None:
+        """Adds a callback that frees one of the caches of ``SHRINK_ORDER``.
+
+        Raises:
+            ValueError: If ``cache`` isn't in ``SHRINK_ORDER``.
+        """
+        if cache not in self._shrinkers:
+            raise ValueError(f"Unknown cache {cache!r}; expected {SHRINK_ORDER}")
+        self._shrinkers[cache].append(shrink)
+
+    def check(self) -> str | None:
+        """Shrinks the next cache if memory is over budget.
+
+        Returns:
+            The cache that was shrunk, or None.
+        """
+        usage = self.measure()
+        if usage <= self.limit:
+            self._next = 0
+            return None
+        while self._next < len(SHRINK_ORDER):
+            cache = SHRINK_ORDER[self._next]
+            self._next += 1
+            if self._shrinkers[cache]:
+                for shrink in self._shrinkers[cache]:
+                    shrink()
+                gc.collect()
+                logger.warning(
+                    f"Memory at {usage / 2**20:.0f} MiB is over the "
+                    f"{self.limit / 2**20:.0f} MiB budget: shrank the {cache} cache"
+                )
+                return cache
+        return None
@@ -0,0 +1,371 @@
+"""Single-file board packs.
+
+A board pack carries a whole board between devices: catalog metadata
+and every image in one file, instead of ``univo.db`` plus a tree of
+loose PNGs. Layout (little-endian):
+
+- header: magic ``UNIVOPAK``, format version, index length in bytes;
+- index: UTF-8 JSON with the categories (parents first), pictograms,
+  localized labels and, per asset hash, the offset and length of its
+  image relative to the start of the data section;
+- data: the image blobs back to back, starting at the next page
+  boundary after the index.
+
+The index sits at the head, so a reader learns everything from one
+small read and then reaches any image by offset. Export and import
+stream blobs in fixed-size chunks, so memory stays bounded however big
+the board is, and PackRepository serves a pack in place: images are
+read straight out of a memory map and only extracted to disk when a UI
+needs a file.
+"""
+import json
+import mmap
+import os
+import shutil
+import struct
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from .database import DatabaseManager, _stored_path, resolve_resource
+from .domain import Catalog, Category, Pictogram
+from .repositories import MemoryRepository, _best_labels, locale_chain
+
+MAGIC = b"UNIVOPAK"
+VERSION = 1
+HEADER = struct.Struct("<8sII")
+ALIGNMENT = mmap.ALLOCATIONGRANULARITY
+CHUNK_SIZE = 1024 * 1024
+
+
+def _data_start(index_length: int) -> int:
+    """Offset of the data section: the page boundary after the index."""
+    end = HEADER.size + index_length
+    return -(-end // ALIGNMENT) * ALIGNMENT
+
+
+def export_pack(db: DatabaseManager, destination: Path) -> int:
+    """Writes a database's board and images to a pack file.
+
+    The index is computed from file sizes before any image is read,
+    then each image is copied in chunks. The pack is written through a
+    temporary file, so readers never see a partial one.
+
+    Args:
+        db: Database to export.
+        destination: Path of the pack to write.
+
+    Returns:
+        The number of images packed.
+
+    Raises:
+        ValueError: If an image changed size while it was being packed.
+    """
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT c.id, c.name, c.parent_id FROM categories c
+            ORDER BY (
+                SELECT MAX(depth) FROM category_tree WHERE descendant = c.id
+            ), c.rowid
+        """)
+        categories = [list(row) for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT id, category_id, label, voice_command, asset_hash "
+            "FROM pictograms ORDER BY rowid"
+        )
+        pictograms = [list(row) for row in cursor.fetchall()]
+        cursor.execute("SELECT * FROM category_labels")
+        category_labels = [list(row) for row in cursor.fetchall()]
+        cursor.execute("SELECT * FROM pictogram_labels")
+        pictogram_labels = [list(row) for row in cursor.fetchall()]
+        cursor.execute("""
+            SELECT hash, path FROM assets
+            WHERE hash IN (SELECT asset_hash FROM pictograms)
+            ORDER BY hash
+        """)
+        sources = {row["hash"]: resolve_resource(row["path"]) for row in cursor}
+
+    assets: dict[str, list[Any]] = {}
+    offset = 0
+    for asset_hash, path in sources.items():
+        size = path.stat().st_size
+        assets[asset_hash] = [offset, size, path.suffix.lower()]
+        offset += size
+
+    index = json.dumps({
+        "categories": categories,
+        "pictograms": pictograms,
+        "category_labels": category_labels,
+        "pictogram_labels": pictogram_labels,
+        "assets": assets,
+    }, ensure_ascii=False, separators=(",", ":")).encode()
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp = destination.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as out:
+            out.write(HEADER.pack(MAGIC, VERSION, len(index)))
+            out.write(index)
+            data_start = _data_start(len(index))
+            out.write(b"\0" * (data_start - out.tell()))
+            for asset_hash, path in sources.items():
+                with path.open("rb") as src:
+                    shutil.copyfileobj(src, out, CHUNK_SIZE)
+                start, size, _ = assets[asset_hash]
+                if out.tell() != data_start + start + size:
+                    raise ValueError(f"{path} changed while being packed")
+        os.replace(tmp, destination)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return len(sources)
+
+
+def import_pack(
+    source: Path,
+    db: DatabaseManager,
+    images_dir: Path | None = None
+) -> int:
+    """Unpacks a board into a database.
+
+    Images are copied out of the pack in chunks; categories, pictograms
+    and labels are merged in, replacing rows with the same ids.
+
+    Args:
+        source: Pack file to read.
+        db: Database to import into.
+        images_dir: Where to write the images. Defaults to
+                    'boards/<pack name>' next to the database.
+
+    Returns:
+        The number of pictograms imported.
+    """
+    images_dir = images_dir or Path(db.db_path).parent / "boards" / source.stem
+    images_dir.mkdir(parents=True, exist_ok=True)
+
+    with BoardPack(source) as pack:
+        stored: dict[str, str] = {}
+        for asset_hash in pack.assets:
+            path = images_dir / pack.file_name(asset_hash)
+            if not path.is_file():
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                with tmp.open("wb") as out:
+                    pack.copy_image(asset_hash, out)
+                os.replace(tmp, path)
+            stored[asset_hash] = _stored_path(path)
+
+        index = pack.index
+        with db.writing() as conn:
+            cursor = conn.cursor()
+            # Updating parent_id (rather than replacing the row) keeps
+            # the closure triggers in charge of the category tree
+            cursor.executemany(
+                "INSERT INTO categories (id, name, parent_id) VALUES (?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET "
+                "name = excluded.name, parent_id = excluded.parent_id",
+                index["categories"]
+            )
+            cursor.executemany(
+                "INSERT INTO pictograms "
+                "(id, category_id, label, voice_command, icon_path) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET "
+                "category_id = excluded.category_id, label = excluded.label, "
+                "voice_command = excluded.voice_command, "
+                "icon_path = excluded.icon_path",
+                [
+                    (pic_id, cat_id, label, voice, stored.get(asset_hash or ""))
+                    for pic_id, cat_id, label, voice, asset_hash
+                    in index["pictograms"]
+                ]
+            )
+            cursor.executemany(
+                "INSERT OR REPLACE INTO category_labels "
+                "(category_id, locale, name) VALUES (?, ?, ?)",
+                index["category_labels"]
+            )
+            cursor.executemany(
+                "INSERT OR REPLACE INTO pictogram_labels "
+                "(pictogram_id, locale, label, voice_command) VALUES (?, ?, ?, ?)",
+                index["pictogram_labels"]
+            )
+            conn.commit()
+
+    db.refresh_thumbnails()
+    return len(index["pictograms"])
+
+
+class BoardPack:
+    """Read access to a pack file through a memory map.
+
+    Raises:
+        ValueError: If the file is not a pack this version can read.
+    """
+    def __init__(self, path: Path) -> None:
+        """Open a pack and parse its index.
+
+        Args:
+            path: Pack file to open.
+        """
+        self.path = path
+        with path.open("rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path} is not a board pack")
+            magic, version, index_length = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a board pack")
+            if version != VERSION:
+                raise ValueError(f"Unsupported board pack version {version}")
+            self.index: dict[str, Any] = json.loads(f.read(index_length))
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data_start = _data_start(index_length)
+        self.assets: dict[str, list[Any]] = self.index["assets"]
+
+    def __enter__(self) -> BoardPack:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Returns the number of pictograms in the pack."""
+        return len(self.index["pictograms"])
+
+    def __contains__(self, asset_hash: object) -> bool:
+        """Checks whether an image is packed."""
+        return asset_hash in self.assets
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        self._map.close()
+
+    def locales(self) -> list[str]:
+        """Locales with at least one localized label."""
+        return sorted(
+            {row[1] for row in self.index["category_labels"]}
+            | {row[1] for row in self.index["pictogram_labels"]}
+        )
+
+    def read_image(self, asset_hash: str) -> memoryview | None:
+        """An image's bytes, straight from the memory map (no copy).
+
+        The view is only valid until the pack is closed.
+        """
+        entry = self.assets.get(asset_hash)
+        if entry is None:
+            return None
+        start = self._data_start + entry[0]
+        return memoryview(self._map)[start:start + entry[1]]
+
+    def copy_image(self, asset_hash: str, out: BinaryIO) -> None:
+        """Writes an image to a file object in bounded chunks."""
+        view = self.read_image(asset_hash)
+        if view is None:
+            raise KeyError(asset_hash)
+        with view:
+            for start in range(0, len(view), CHUNK_SIZE):
+                out.write(view[start:start + CHUNK_SIZE])
+
+    def file_name(self, asset_hash: str) -> str:
+        """File name for an extracted image: its hash and extension."""
+        return f"{asset_hash}{self.assets[asset_hash][2]}"
+
+    def catalogs(self, images_dir: Path) -> Iterator[Catalog]:
+        """The default catalog, then one per locale.
+
+        Args:
+            images_dir: Folder the pictograms' image paths point into.
+        """
+        for locale in (None, *self.locales()):
+            yield self._catalog(locale, images_dir)
+
+    def _catalog(self, locale: str | None, images_dir: Path) -> Catalog:
+        chain = locale_chain(locale)
+        cat_labels = _best_labels([
+            {"category_id": cat_id, "locale": loc, "name": name}
+            for cat_id, loc, name in self.index["category_labels"]
+            if loc in chain
+        ], "category_id", chain)
+        pic_labels = _best_labels([
+            {"pictogram_id": pic_id, "locale": loc, "label": label,
+             "voice_command": voice}
+            for pic_id, loc, label, voice in self.index["pictogram_labels"]
+            if loc in chain
+        ], "pictogram_id", chain)
+
+        categories = {
+            cat_id: Category(
+                id=cat_id,
+                name=cat_labels[cat_id]["name"] if cat_id in cat_labels else name,
+                pictograms=[],
+                parent_id=parent_id
+            )
+            for cat_id, name, parent_id in self.index["categories"]
+        }
+        pictograms: dict[str, Pictogram] = {}
+        for pic_id, cat_id, default_label, default_voice, asset_hash in (
+            self.index["pictograms"]
+        ):
+            label, voice = default_label, default_voice or default_label
+            localized = pic_labels.get(pic_id)
+            if localized is not None:
+                label = localized["label"]
+                voice = localized["voice_command"] or label
+            image_path = None
+            if asset_hash in self.assets:
+                image_path = str(images_dir / self.file_name(asset_hash))
+            pictogram = Pictogram(
+                id=pic_id,
+                label=label,
+                voice_command=voice,
+                image_path=image_path,
+                asset_hash=asset_hash
+            )
+            pictograms[pic_id] = pictogram
+            owner = categories.get(cat_id)
+            if owner is not None:
+                owner.pictograms.append(pictogram)
+
+        catalog = Catalog(locale=locale, categories=categories, pictograms=pictograms)
+        catalog.link_children()
+        return catalog
+
+
+class PackRepository(MemoryRepository):
+    """Read-only PictogramRepository served straight from a pack file.
+
+    The index is loaded into memory; images stay in the pack and are
+    extracted one by one, the first time a UI asks for their file.
+    """
+    def __init__(self, path: Path, cache_dir: Path | None = None) -> None:
+        """Open a pack.
+
+        Args:
+            path: Pack file to serve.
+            cache_dir: Where extracted images go. Defaults to
+                       '.univo-cache/packs/<pack name>' next to the pack.
+        """
+        self.pack = BoardPack(path)
+        self.images_dir = (
+            cache_dir or path.parent / ".univo-cache" / "packs" / path.stem
+        )
+        super().__init__(self.pack.catalogs(self.images_dir))
+
+    def image_file(self, pictogram: Pictogram) -> Path | None:
+        """Extracts a pictogram's image on first use and returns its file."""
+        if pictogram.asset_hash not in self.pack:
+            return None
+        assert pictogram.asset_hash is not None
+        path = self.images_dir / self.pack.file_name(pictogram.asset_hash)
+        if not path.is_file():
+            self.images_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp.open("wb") as out:
+                self.pack.copy_image(pictogram.asset_hash, out)
+            os.replace(tmp, path)
+        return path
+
+    def close(self) -> None:
+        """Releases the pack's memory map."""
+        self.pack.close()
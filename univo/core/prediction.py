@@ -0,0 +1,218 @@
+"""Next-pictogram prediction for UniVo.
+
+Learns n-gram transition counts from the sequence of selected pictograms
+and suggests the most likely next ones, so users need fewer taps per
+message. Counts are kept in a bounded table that is pruned by decay, and
+persisted to SQLite by a background thread.
+"""
+import heapq
+import threading
+from collections import deque
+from collections.abc import Iterator
+
+from .decorators import logger
+from .domain import Pictogram
+from .services import PictogramService
+
+# Separator for flattened contexts; never appears in pictogram ids
+SEP = "\x1f"
+
+
+class TransitionCounts:
+    """Bounded map of context -> next pictogram -> count.
+
+    Contexts are flattened into single strings to keep the per-entry
+    overhead low. When the number of (context, next) entries exceeds
+    ``max_entries``, every count is halved and zeros are dropped, which
+    forgets rare and stale transitions first.
+    """
+    def __init__(self, max_entries: int = 50_000) -> None:
+        self.max_entries = max_entries
+        self._table: dict[str, dict[str, int]] = {}
+        self._entries = 0
+
+    def __len__(self) -> int:
+        """Returns the number of (context, next) entries."""
+        return self._entries
+
+    def __iter__(self) -> Iterator[tuple[str, str, int]]:
+        """Iterates over (context, next, count) triples."""
+        for context, nexts in self._table.items():
+            for next_id, count in nexts.items():
+                yield context, next_id, count
+
+    def get(self, context: str, next_id: str) -> int:
+        """Returns the count of one transition (0 if unknown or pruned)."""
+        return self._table.get(context, {}).get(next_id, 0)
+
+    def add(self, context: str, next_id: str, count: int = 1) -> bool:
+        """Increments a transition in O(1).
+
+        Returns:
+            True if the table had to be pruned to stay within the cap.
+        """
+        nexts = self._table.setdefault(context, {})
+        if next_id not in nexts:
+            self._entries += 1
+        nexts[next_id] = nexts.get(next_id, 0) + count
+        if self._entries > self.max_entries:
+            self.prune()
+            return True
+        return False
+
+    def prune(self) -> None:
+        """Halves counts until the table fits in 3/4 of its cap.
+
+        Each prune frees a quarter of the budget, so its O(n) cost is
+        amortized over at least max_entries / 4 subsequent inserts.
+        """
+        target = self.max_entries * 3 // 4
+        while self._entries > target:
+            for context in list(self._table):
+                nexts = {
+                    next_id: count // 2
+                    for next_id, count in self._table[context].items()
+                    if count > 1
+                }
+                self._entries -= len(self._table[context]) - len(nexts)
+                if nexts:
+                    self._table[context] = nexts
+                else:
+                    del self._table[context]
+
+    def top(self, context: str, k: int) -> list[str]:
+        """The ``k`` most frequent successors of a context."""
+        nexts = self._table.get(context)
+        if not nexts:
+            return []
+        return heapq.nlargest(k, nexts, key=nexts.__getitem__)
+
+
+class PredictionService:
+    """Suggests the next pictogram from recent selections.
+
+    Uses contexts of up to ``order - 1`` previous selections and backs
+    off to shorter contexts (ultimately plain frequency) to fill ``k``
+    suggestions.
+    """
+    def __init__(
+        self,
+        service: PictogramService,
+        order: int = 3,
+        k: int = 4,
+        max_entries: int = 50_000,
+        persist_interval: float = 30.0
+    ) -> None:
+        """Load learned counts and start background persistence.
+
+        Args:
+            service: Pictogram service used to resolve suggestions and
+                     reach the database.
+            order: Longest n-gram, counting the predicted pictogram.
+            k: Default number of suggestions.
+            max_entries: Memory cap on stored transitions.
+            persist_interval: Seconds between background saves.
+        """
+        self.service = service
+        self.order = order
+        self.k = k
+        self.counts = TransitionCounts(max_entries)
+        self.history: deque[str] = deque(maxlen=order - 1)
+        self._dirty: set[tuple[str, str]] = set()
+        self._rewrite = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._load()
+        self._saver = threading.Thread(
+            target=self._run, args=(persist_interval,),
+            name="univo-prediction", daemon=True
+        )
+        self._saver.start()
+
+    def observe(self, pictogram_id: str) -> None:
+        """Learns from a selection; O(order) regardless of table size."""
+        with self._lock:
+            recent = list(self.history)
+            for n in range(len(recent) + 1):
+                context = SEP.join(recent[len(recent) - n:])
+                if self.counts.add(context, pictogram_id):
+                    self._rewrite = True
+                self._dirty.add((context, pictogram_id))
+            self.history.append(pictogram_id)
+
+    def reset(self) -> None:
+        """Forgets the current context (e.g. a new message begins)."""
+        with self._lock:
+            self.history.clear()
+
+    def suggest_ids(self, k: int | None = None) -> list[str]:
+        """Most likely next pictogram ids, best first."""
+        k = k or self.k
+        with self._lock:
+            recent = list(self.history)
+            ranked: dict[str, None] = {}
+            for n in range(len(recent), -1, -1):
+                context = SEP.join(recent[len(recent) - n:])
+                for pic_id in self.counts.top(context, k):
+                    ranked.setdefault(pic_id)
+                if len(ranked) >= k:
+                    break
+        return list(ranked)[:k]
+
+    def suggest(self, k: int | None = None) -> list[Pictogram]:
+        """Most likely next pictograms, best first."""
+        pictograms, _ = self.service.get_many(self.suggest_ids(k))
+        return pictograms
+
+    def save(self) -> None:
+        """Writes changed counts to the database."""
+        with self._lock:
+            if self._rewrite:
+                rows = list(self.counts)
+            else:
+                rows = [
+                    (context, next_id, count)
+                    for context, next_id in self._dirty
+                    if (count := self.counts.get(context, next_id))
+                ]
+            rewrite, self._rewrite = self._rewrite, False
+            self._dirty.clear()
+
+        if self.service.db is None or (not rows and not rewrite):
+            return
+        with self.service.db.get_connection() as conn:
+            with conn:
+                if rewrite:
+                    conn.execute("DELETE FROM transitions")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO transitions "
+                    "(context, next_id, count) VALUES (?, ?, ?)",
+                    rows
+                )
+
+    def close(self) -> None:
+        """Stops background persistence after a final save."""
+        if not self._stop.is_set():
+            self._stop.set()
+            self._saver.join()
+
+    def _load(self) -> None:
+        if self.service.db is None:
+            return
+        with self.service.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT context, next_id, count FROM transitions")
+            for row in cursor.fetchall():
+                self.counts.add(row[0], row[1], row[2])
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self._save_logged()
+        self._save_logged()
+
+    def _save_logged(self) -> None:
+        try:
+            self.save()
+        except Exception as e:
+            logger.error(f"Failed to save predictions: {e}")
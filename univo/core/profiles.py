@@ -0,0 +1,123 @@
+"""User profiles for UniVo.
+
+Several AAC users can share one device. Each profile is its own SQLite
+database: categories and their order, labels, usage history and
+learned predictions. Every profile reads the same resources directory
+and shares the derived cache (thumbnails and atlases keyed by content
+hash, spoken audio keyed by text and voice), so images and audio are
+stored once and a switch only reloads the profile's metadata.
+
+The ``default`` profile is the original ``univo.db``, so an existing
+install keeps its board.
+"""
+import re
+import threading
+from pathlib import Path
+
+from .database import BASE_DIR, DatabaseManager
+
+DEFAULT_PROFILE = "default"
+DEFAULT_DB = BASE_DIR / "univo.db"
+PROFILES_DIR = BASE_DIR / "profiles"
+SHARED_CACHE_DIR = BASE_DIR / ".univo-cache"
+PROFILE_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}")
+
+
+class ProfileStore:
+    """The profiles on this device and their databases.
+
+    Opened databases are kept, so switching back to a profile doesn't
+    check its schema again.
+    """
+    def __init__(
+        self,
+        root: Path = PROFILES_DIR,
+        default_db: Path = DEFAULT_DB,
+        cache_dir: Path = SHARED_CACHE_DIR,
+        resources_dir: Path | None = None,
+        atlases: bool = False
+    ) -> None:
+        """Create a store; no database is opened until open().
+
+        Args:
+            root: Folder holding one ``<name>.db`` per extra profile.
+            default_db: Database of the default profile.
+            cache_dir: Derived-file cache shared by every profile.
+            resources_dir: Folder of category folders every profile is
+                           seeded from. Defaults to the bundled one.
+            atlases: Whether profiles also pack sprite atlases.
+        """
+        self.root = root
+        self.default_db = default_db
+        self.cache_dir = cache_dir
+        self.resources_dir = resources_dir
+        self.atlases = atlases
+        self._open: dict[str, DatabaseManager] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> list[str]:
+        """Every profile, the default first and the others by name."""
+        others = (
+            sorted(
+                path.stem for path in self.root.glob("*.db")
+                if PROFILE_NAME.fullmatch(path.stem)
+                and path.stem != DEFAULT_PROFILE
+            )
+            if self.root.is_dir() else []
+        )
+        return [DEFAULT_PROFILE, *others]
+
+    def path(self, name: str) -> Path:
+        """The database file of a profile.
+
+        Raises:
+            ValueError: If ``name`` isn't a valid profile name.
+        """
+        if name == DEFAULT_PROFILE:
+            return self.default_db
+        if not PROFILE_NAME.fullmatch(name):
+            raise ValueError(
+                f"Invalid profile name {name!r}: use letters, digits, '-' and '_'"
+            )
+        return self.root / f"{name}.db"
+
+    def open(self, name: str, progressive: bool = True) -> DatabaseManager:
+        """The database of a profile, created and seeded on first use.
+
+        Args:
+            name: Profile name.
+            progressive: Seed a new profile progressively (see
+                         DatabaseManager), so it opens as fast as an
+                         existing one.
+
+        Raises:
+            ValueError: If ``name`` isn't a valid profile name.
+        """
+        with self._lock:
+            db = self._open.get(name)
+            if db is None:
+                path = self.path(name)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                db = DatabaseManager(
+                    str(path),
+                    resources_dir=self.resources_dir,
+                    cache_dir=self.cache_dir,
+                    atlases=self.atlases,
+                    progressive=progressive
+                )
+                self._open[name] = db
+            return db
+
+    def name_of(self, db: DatabaseManager | None) -> str | None:
+        """The profile a database belongs to, if it was opened here."""
+        for name, opened in self._open.items():
+            if opened is db:
+                return name
+        return None
+
+    def next_name(self, current: str | None) -> str:
+        """The profile after ``current``, wrapping to the default."""
+        names = self.names()
+        if current not in names:
+            return names[0]
+        return names[(names.index(current) + 1) % len(names)]
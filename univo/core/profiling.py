@@ -0,0 +1,187 @@
+"""On-demand CPU profiling of a live UniVo session.
+
+"The board got slow" rarely reproduces under a profiler, so one is
+built in and can run for a whole session or be toggled while the
+slowness is happening:
+
+* ``sample`` (the default) is a statistical profiler: a background
+  thread records the stack of every thread ``1 / interval`` times a
+  second. Its cost doesn't depend on how much Python code runs, so it
+  can stay on for a full therapy session. It writes collapsed stacks
+  (``thread;outer;...;inner count`` per line), the input of
+  flamegraph.pl, speedscope and inferno.
+* ``cprofile`` counts every call of the thread that started it (the
+  UI thread) exactly, at a much higher cost, and writes a pstats file
+  for ``python -m pstats``, snakeviz or flameprof.
+
+Output files are named after the time profiling started.
+"""
+import cProfile
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+
+from .database import BASE_DIR
+from .decorators import logger
+
+PROFILERS = ("sample", "cprofile")
+PROFILE_DIR = BASE_DIR / "profiling"
+# Seconds between stack samples: 100 Hz
+SAMPLE_INTERVAL = 0.01
+SUFFIXES = {"sample": ".collapsed", "cprofile": ".prof"}
+
+
+class StackSampler:
+    """Counts the stacks of all threads at a fixed interval."""
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter[str] = Counter()
+        self._labels: dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Starts sampling in the background."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="univo-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops sampling and waits for the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def sample(self) -> None:
+        """Records the current stack of every thread but the sampler."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        sampler = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident != sampler:
+                name = names.get(ident, str(ident))
+                self.stacks[self._collapse(name, frame)] += 1
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """The samples in collapsed-stack format, most frequent first."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def _collapse(self, thread_name: str, frame: FrameType | None) -> str:
+        labels: list[str] = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                # ';' separates frames and ' ' ends the stack in the format
+                label = (
+                    f"{code.co_qualname} "
+                    f"({Path(code.co_filename).name}:{code.co_firstlineno})"
+                ).replace(";", ":").replace(" ", "_")
+                self._labels[code] = label
+            labels.append(label)
+            frame = frame.f_back
+        labels.append(thread_name.replace(";", ":").replace(" ", "_"))
+        return ";".join(reversed(labels))
+
+    def _run(self) -> None:
+        next_sample = time.perf_counter()
+        while True:
+            next_sample += self.interval
+            # Skip missed ticks rather than sampling in a burst
+            next_sample = max(next_sample, time.perf_counter())
+            if self._stop.wait(next_sample - time.perf_counter()):
+                return
+            self.sample()
+
+
+class Profiler:
+    """Starts and stops profiling sessions and writes their results."""
+    def __init__(
+        self,
+        mode: str = "sample",
+        output_dir: Path = PROFILE_DIR,
+        interval: float = SAMPLE_INTERVAL
+    ) -> None:
+        """Create a profiler; nothing is measured until start().
+
+        Args:
+            mode: One of PROFILERS.
+            output_dir: Folder the results are written to.
+            interval: Seconds between samples in ``sample`` mode.
+
+        Raises:
+            ValueError: If ``mode`` isn't one of PROFILERS.
+        """
+        if mode not in PROFILERS:
+            raise ValueError(f"Unknown profiler {mode!r}; expected {PROFILERS}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.interval = interval
+        # File written by the last session that was stopped
+        self.last_output: Path | None = None
+        self._session: StackSampler | cProfile.Profile | None = None
+        self._started_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether a session is in progress."""
+        return self._session is not None
+
+    def start(self) -> None:
+        """Starts a session; does nothing if one is running."""
+        if self._session is not None:
+            return
+        self._started_at = time.time()
+        if self.mode == "cprofile":
+            profile = cProfile.Profile()
+            profile.enable()
+            self._session = profile
+        else:
+            sampler = StackSampler(self.interval)
+            sampler.start()
+            self._session = sampler
+        logger.info(f"Profiling started ({self.mode})")
+
+    def stop(self) -> Path | None:
+        """Ends the session and writes its results.
+
+        Returns:
+            The file written, or None if no session was running.
+        """
+        session, self._session = self._session, None
+        if session is None:
+            return None
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self._started_at))
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"univo-{stamp}{SUFFIXES[self.mode]}"
+        if isinstance(session, cProfile.Profile):
+            session.disable()
+            session.dump_stats(path)
+        else:
+            session.stop()
+            path.write_text(session.collapsed(), encoding="utf-8")
+        logger.info(
+            f"Profile of {time.time() - self._started_at:.0f}s written to {path}"
+        )
+        self.last_output = path
+        return path
+
+    def toggle(self) -> Path | None:
+        """Starts a session, or stops the running one.
+
+        Returns:
+            The file written when a session was stopped, else None.
+        """
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
@@ -0,0 +1,533 @@
+"""Serving a board over local HTTP, and reading it back.
+
+One hub runs BoardServer over its PictogramService; thin clients use a
+RemoteRepository instead of opening a SQLite file of their own. The API
+is small and read-only:
+
+- ``GET /locales``: the locales with translated labels;
+- ``GET /catalog?locale=pt-BR``: every category and pictogram in one
+  JSON document;
+- ``GET /images/<asset hash>``: the (thumbnail) image of an asset.
+
+Every response carries an ETag and answers ``If-None-Match`` with
+``304 Not Modified``, so revalidating an unchanged catalog costs one
+empty round trip. JSON is gzip-compressed for clients that accept it.
+Catalog payloads are built once per locale and service generation.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from email.message import Message
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from .atlas import Atlas
+from .database import BASE_DIR, IMAGE_SUFFIXES
+from .decorators import logger
+from .domain import Catalog, Category, Pictogram
+from .repositories import PAGE_SIZE, MemoryRepository
+from .services import PictogramService
+
+DEFAULT_PORT = 8765
+# Smaller bodies aren't worth compressing
+GZIP_MIN_SIZE = 1024
+CACHE_DIR = BASE_DIR / ".univo-cache" / "remote"
+
+
+def catalog_to_json(catalog: Catalog) -> dict[str, Any]:
+    """The wire form of a catalog."""
+    return {
+        "locale": catalog.locale,
+        "categories": [
+            {
+                "id": c.id,
+                "name": c.name,
+                "parent_id": c.parent_id,
+                "pictograms": [p.id for p in c],
+            }
+            for c in catalog
+        ],
+        "pictograms": [
+            {
+                "id": p.id,
+                "label": p.label,
+                "voice_command": p.voice_command,
+                "asset_hash": p.asset_hash,
+            }
+            for p in catalog.pictograms.values()
+        ],
+    }
+
+
+def catalog_from_json(data: dict[str, Any], images_dir: Path) -> Catalog:
+    """Rebuilds a catalog; image paths point to where images get cached."""
+    pictograms = {
+        row["id"]: Pictogram(
+            id=row["id"],
+            label=row["label"],
+            voice_command=row["voice_command"],
+            image_path=str(images_dir / row["asset_hash"])
+            if row["asset_hash"] else None,
+            asset_hash=row["asset_hash"]
+        )
+        for row in data["pictograms"]
+    }
+    categories = {
+        row["id"]: Category(
+            id=row["id"],
+            name=row["name"],
+            pictograms=[pictograms[i] for i in row["pictograms"] if i in pictograms],
+            parent_id=row["parent_id"]
+        )
+        for row in data["categories"]
+    }
+    catalog = Catalog(
+        locale=data["locale"], categories=categories, pictograms=pictograms
+    )
+    catalog.link_children()
+    return catalog
+
+
+@dataclass(frozen=True, slots=True)
+class Payload:
+    """A ready-to-send response body and its validator."""
+    body: bytes
+    etag: str
+    content_type: str
+    compressed: bytes | None = None
+
+    @classmethod
+    def from_data(cls, data: Any) -> Payload:
+        """Serializes data once, precompressing it if it is big enough."""
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+        compressed = gzip.compress(body) if len(body) >= GZIP_MIN_SIZE else None
+        return cls(body, _etag(body), "application/json", compressed)
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+class BoardServer:
+    """Read-only HTTP API over a PictogramService for thin clients."""
+
+    def __init__(
+        self,
+        service: PictogramService,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT
+    ) -> None:
+        """Bind the server; nothing is served until serve_forever()/start().
+
+        Args:
+            service: The board to serve.
+            host: Interface to listen on. The default only accepts local
+                  connections; use '0.0.0.0' for a classroom network.
+            port: TCP port; 0 picks a free one.
+        """
+        self.service = service
+        self._lock = threading.Lock()
+        self._payloads: dict[str | None, tuple[int, Payload]] = {}
+        self._assets: tuple[int, dict[str, Pictogram]] = (-1, {})
+        self._thread: threading.Thread | None = None
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.board = self  # type: ignore[attr-defined]
+
+    @property
+    def url(self) -> str:
+        """Base URL clients should use."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def serve_forever(self) -> None:
+        """Serves requests until close() is called from another thread."""
+        logger.info(f"Serving the board on {self.url}")
+        self.httpd.serve_forever()
+
+    def start(self) -> None:
+        """Serves requests on a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="univo-server", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stops serving and releases the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def refresh(self, category_ids: set[str]) -> None:
+        """Reloads changed categories; suits ResourceWatcher.subscribe()."""
+        with self._lock:
+            self.service.refresh(category_ids)
+
+    def locales(self) -> Payload:
+        """The locales document."""
+        with self._lock:
+            return Payload.from_data(self.service.locales)
+
+    def catalog(self, locale: str | None) -> Payload:
+        """The catalog document of a locale, rebuilt when the board changes."""
+        with self._lock:
+            generation = self.service.generation
+            cached = self._payloads.get(locale)
+            if cached is None or cached[0] != generation:
+                catalog = self.service.catalog_for(locale)
+                cached = (generation, Payload.from_data(catalog_to_json(catalog)))
+                self._payloads[locale] = cached
+            return cached[1]
+
+    def image(self, asset_hash: str) -> Payload | None:
+        """The image of an asset, or None if no pictogram uses it."""
+        with self._lock:
+            generation, assets = self._assets
+            if generation != self.service.generation:
+                assets = {
+                    p.asset_hash: p
+                    for p in self.service.catalog_for(None).pictograms.values()
+                    if p.asset_hash
+                }
+                self._assets = (self.service.generation, assets)
+            pictogram = assets.get(asset_hash)
+            path = self.service.image_file(pictogram) if pictogram else None
+        if path is None or not path.is_file():
+            return None
+        content_type = mimetypes.guess_type(path.name)[0]
+        return Payload(
+            path.read_bytes(),
+            f'"{asset_hash}"',
+            content_type or "application/octet-stream"
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes requests to the BoardServer that owns the socket."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        board: BoardServer = self.server.board  # type: ignore[attr-defined]
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        try:
+            if url.path == "/locales":
+                payload: Payload | None = board.locales()
+            elif url.path == "/catalog":
+                payload = board.catalog(query.get("locale", [None])[0] or None)
+            elif url.path.startswith("/images/"):
+                payload = board.image(url.path.removeprefix("/images/"))
+            else:
+                payload = None
+        except Exception:
+            logger.exception(f"Failed to serve {self.path}")
+            self._send_status(HTTPStatus.INTERNAL_SERVER_ERROR)
+            return
+        if payload is None:
+            self._send_status(HTTPStatus.NOT_FOUND)
+        else:
+            self._send(payload)
+
+    def _send(self, payload: Payload) -> None:
+        if payload.etag in _etags(self.headers.get("If-None-Match", "")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", payload.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = payload.body
+        gzipped = payload.compressed is not None and "gzip" in self.headers.get(
+            "Accept-Encoding", ""
+        )
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", payload.content_type)
+        self.send_header("ETag", payload.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if gzipped and payload.compressed is not None:
+            body = payload.compressed
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_status(self, status: HTTPStatus) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def _etags(header: str) -> set[str]:
+    """The entity tags listed in an If-None-Match header."""
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+class RemoteRepository:
+    """PictogramRepository reading a board from a BoardServer.
+
+    Catalogs are cached with their ETags. A cached catalog younger than
+    ``max_age`` seconds is used as is; an older one is revalidated, which
+    costs an empty 304 response while the board hasn't changed. Images
+    are downloaded the first time a UI asks for their file.
+    """
+    def __init__(
+        self,
+        url: str,
+        cache_dir: Path | None = None,
+        max_age: float = 5.0,
+        timeout: float = 10.0
+    ) -> None:
+        """Initialize the client; nothing is fetched until first use.
+
+        Args:
+            url: Base URL of the hub, e.g. 'http://192.168.0.2:8765'.
+            cache_dir: Where downloaded images go. Defaults to
+                       '.univo-cache/remote'.
+            max_age: Seconds a catalog is trusted before revalidation.
+            timeout: Socket timeout of each request.
+        """
+        self.url = url.rstrip("/")
+        self.images_dir = cache_dir or CACHE_DIR
+        self.max_age = max_age
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        # locale -> (etag, checked at, catalog)
+        self._catalogs: dict[str | None, tuple[str, float, Catalog]] = {}
+        # locale -> (the catalogs it indexes, index)
+        self._memories: dict[str | None, tuple[list[Catalog], MemoryRepository]] = {}
+
+    def locales(self) -> list[str]:
+        """Locales with at least one localized label."""
+        _, body = self._get("/locales")
+        assert body is not None
+        locales: list[str] = json.loads(body)
+        return locales
+
+    def revalidate(self) -> dict[str | None, set[str]]:
+        """Revalidates every cached catalog now.
+
+        Returns:
+            Per locale whose catalog changed, the ids of the categories
+            that differ.
+        """
+        changed: dict[str | None, set[str]] = {}
+        for locale in list(self._catalogs):
+            old = self._catalogs[locale][2]
+            new = self._fetch(locale, force=True)
+            if new is not old:
+                changed[locale] = _changed_categories(old, new)
+        return changed
+
+    def load_catalog(
+        self,
+        locale: str | None = None,
+        category_ids: Sequence[str] | None = None
+    ) -> Catalog:
+        """A copy of the locale's catalog (or of just some categories)."""
+        return self._memory(locale).load_catalog(locale, category_ids)
+
+    def list_categories(self, locale: str | None = None) -> list[Category]:
+        """Every category with its pictograms, in board order."""
+        return self._memory(locale).list_categories(locale)
+
+    def get_category(
+        self, category_id: str, locale: str | None = None
+    ) -> Category | None:
+        """One category with its pictograms (children are not loaded)."""
+        return self._memory(locale).get_category(category_id, locale)
+
+    def get_pictograms(
+        self, pictogram_ids: Sequence[str], locale: str | None = None
+    ) -> list[Pictogram]:
+        """The pictograms found among ``pictogram_ids``, in that order."""
+        return self._memory(locale).get_pictograms(pictogram_ids, locale)
+
+    def list_pictograms(
+        self,
+        after: str | None = None,
+        limit: int = PAGE_SIZE,
+        locale: str | None = None
+    ) -> list[Pictogram]:
+        """One page of pictograms ordered by id (keyset pagination)."""
+        return self._memory(locale).list_pictograms(after, limit, locale)
+
+    def subtree_ids(self, category_id: str) -> list[str]:
+        """A category and every category below it, shallowest first."""
+        return self._memory(None).subtree_ids(category_id)
+
+    def ancestor_ids(self, category_id: str) -> list[str]:
+        """The path from the top level down to a category, inclusive."""
+        return self._memory(None).ancestor_ids(category_id)
+
+    def pictogram_ids_under(self, category_id: str) -> list[str]:
+        """Every pictogram in a category or any category below it."""
+        return self._memory(None).pictogram_ids_under(category_id)
+
+    def get_atlas(self, category_id: str) -> Atlas | None:
+        """Atlases aren't served; clients load one image per pictogram."""
+        return None
+
+    def image_file(self, pictogram: Pictogram) -> Path | None:
+        """Downloads a pictogram's image on first use and returns its file.
+
+        The file is named after the asset hash, with the extension of
+        the type the hub served, so image loaders recognize its format.
+        """
+        if not pictogram.asset_hash:
+            return None
+        cached = self.images_dir / pictogram.asset_hash
+        for suffix in (*IMAGE_SUFFIXES, ""):
+            if cached.with_suffix(suffix).is_file():
+                return cached.with_suffix(suffix)
+        try:
+            headers, body = self._get(f"/images/{pictogram.asset_hash}")
+        except urllib.error.HTTPError:
+            return None
+        assert body is not None
+        suffix = mimetypes.guess_extension(headers.get_content_type()) or ""
+        path = cached.with_suffix(suffix if suffix in IMAGE_SUFFIXES else "")
+        self.images_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+        return path
+
+    def _memory(self, locale: str | None) -> MemoryRepository:
+        """The cached catalogs of a locale and of the default labels."""
+        catalogs = [self._fetch(None)]
+        if locale is not None:
+            catalogs.append(self._fetch(locale))
+        cached = self._memories.get(locale)
+        if cached is None or any(
+            a is not b for a, b in zip(cached[0], catalogs, strict=True)
+        ):
+            cached = (catalogs, MemoryRepository(catalogs))
+            self._memories[locale] = cached
+        return cached[1]
+
+    def _fetch(self, locale: str | None, force: bool = False) -> Catalog:
+        """A locale's catalog, revalidated once ``max_age`` has passed."""
+        with self._lock:
+            cached = self._catalogs.get(locale)
+            now = time.monotonic()
+            if cached and not force and now - cached[1] < self.max_age:
+                return cached[2]
+            query = urllib.parse.urlencode({"locale": locale or ""})
+            headers, body = self._get(
+                f"/catalog?{query}", cached[0] if cached else None
+            )
+            if body is None and cached is not None:
+                etag, catalog = cached[0], cached[2]
+            else:
+                assert body is not None
+                etag = headers.get("ETag", "")
+                catalog = catalog_from_json(json.loads(body), self.images_dir)
+            self._catalogs[locale] = (etag, now, catalog)
+            return catalog
+
+    def _get(
+        self, path: str, etag: str | None = None
+    ) -> tuple[Message, bytes | None]:
+        """GETs a resource and its response headers.
+
+        The body is None when ``etag`` still matches.
+        """
+        request = urllib.request.Request(
+            self.url + path, headers={"Accept-Encoding": "gzip"}
+        )
+        if etag:
+            request.add_header("If-None-Match", etag)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                if response.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                return response.headers, body
+        except urllib.error.HTTPError as exc:
+            if exc.code == HTTPStatus.NOT_MODIFIED and etag:
+                return exc.headers, None
+            raise
+
+
+def _changed_categories(old: Catalog, new: Catalog) -> set[str]:
+    """Ids of categories added, removed or different between two catalogs."""
+    def signature(category: Category) -> Any:
+        return (category.name, category.parent_id, list(category.pictograms))
+
+    return {
+        cat_id
+        for cat_id in old.categories.keys() | new.categories.keys()
+        if cat_id not in old.categories
+        or cat_id not in new.categories
+        or signature(old.categories[cat_id]) != signature(new.categories[cat_id])
+    }
+
+
+class RemoteWatcher:
+    """Polls a RemoteRepository for board changes made on the hub.
+
+    Implements the BoardWatcher protocol, so the UIs refresh just the
+    categories that changed, as with a local resources directory.
+    """
+    def __init__(self, repository: RemoteRepository, interval: float = 5.0) -> None:
+        """Initialize the watcher; nothing is polled until start().
+
+        Args:
+            repository: Client whose cached catalogs are revalidated.
+            interval: Seconds between revalidations.
+        """
+        self.repository = repository
+        self.interval = interval
+        self._listeners: list[Callable[[set[str]], None]] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, listener: Callable[[set[str]], None]) -> None:
+        """Calls ``listener`` with the changed category ids."""
+        self._listeners.append(listener)
+
+    def start(self) -> bool:
+        """Starts polling in the background."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="univo-remote-watcher", daemon=True
+            )
+            self._thread.start()
+        return True
+
+    def close(self) -> None:
+        """Stops polling and waits for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            changed: set[str] = set()
+            try:
+                for category_ids in self.repository.revalidate().values():
+                    changed |= category_ids
+            except OSError as exc:
+                logger.warning(f"Board hub unreachable: {exc}")
+                continue
+            if changed:
+                for listener in self._listeners:
+                    listener(changed)
@@ -0,0 +1,496 @@
+"""Pictogram repositories for UniVo.
+
+Query-level storage backends behind the PictogramRepository protocol:
+
+- SQLiteRepository answers every query with a fixed number of indexed
+  SQL statements on the seeded database.
+- MemoryRepository serves the same queries from dict indexes with no I/O
+  at all; it can snapshot another repository for a read-only kiosk, or
+  be built straight from domain objects in tests.
+"""
+import bisect
+from collections.abc import Iterable, Sequence
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from .atlas import Atlas
+from .database import MAX_PARAMS, DatabaseManager, resolve_resource
+from .domain import Catalog, Category, Pictogram
+from .interfaces import PictogramRepository
+from .thumbnails import BUTTON_SIZE
+
+# Pictogram rows joined with their canonical asset and its button-sized
+# thumbnail; rows without an asset fall back to their own image file
+PICTOGRAM_QUERY = """
+    SELECT p.*, COALESCE(a.path, f.path) AS image_path,
+           t.path AS thumbnail_path
+    FROM pictograms p
+    JOIN pictogram_files f ON f.id = p.id
+    LEFT JOIN assets a ON a.hash = p.asset_hash
+    LEFT JOIN thumbnails t ON t.asset_hash = p.asset_hash AND t.size = ?
+"""
+PAGE_SIZE = 100
+
+
+def locale_chain(locale: str | None) -> list[str]:
+    """Fallback chain for a locale, most specific first.
+
+    >>> locale_chain("pt_BR")
+    ['pt-BR', 'pt']
+    """
+    if not locale:
+        return []
+    parts = locale.replace("_", "-").split("-")
+    return ["-".join(parts[:i]) for i in range(len(parts), 0, -1)]
+
+
+def _best_labels(rows: list[Any], key: str, chain: list[str]) -> dict[str, Any]:
+    """Picks, per entity, the label row earliest in the fallback chain."""
+    rank = {locale: i for i, locale in enumerate(chain)}
+    best: dict[str, Any] = {}
+    for row in rows:
+        current = best.get(row[key])
+        if current is None or rank[row["locale"]] < rank[current["locale"]]:
+            best[row[key]] = row
+    return best
+
+
+def _pictogram_from_row(
+    row: Any,
+    localized: Any | None = None,
+    strings: dict[str, str] | None = None
+) -> Pictogram:
+    """Builds a Pictogram from a PICTOGRAM_QUERY row.
+
+    A localized label row, when given, overrides label and voice; a row
+    without a voice speaks its label, as the same string object.
+
+    Args:
+        row: The pictogram row.
+        localized: Its best label row in the active locale, if any.
+        strings: Strings seen so far in this load; repeated labels and
+                 asset fields (identical images) are shared through it.
+    """
+    intern = (strings if strings is not None else {}).setdefault
+    source = row if localized is None else localized
+    label = intern(source["label"], source["label"])
+    voice = source["voice_command"]
+    asset_hash = row["asset_hash"]
+    image_path = row["image_path"]
+    thumbnail_path = row["thumbnail_path"]
+    return Pictogram(
+        id=row["id"],
+        label=label,
+        voice_command=label if voice is None or voice == label else voice,
+        image_path=intern(image_path, image_path) if image_path else None,
+        thumbnail_path=(
+            intern(thumbnail_path, thumbnail_path) if thumbnail_path else None
+        ),
+        asset_hash=intern(asset_hash, asset_hash) if asset_hash else None
+    )
+
+
+def _image_file(pictogram: Pictogram) -> Path | None:
+    """The stored thumbnail or image of a pictogram, as a filesystem path."""
+    stored = pictogram.thumbnail_path or pictogram.image_path
+    return resolve_resource(stored) if stored else None
+
+
+def _marks(values: Sequence[Any]) -> str:
+    """Placeholders for an SQL IN list."""
+    return ", ".join("?" * len(values))
+
+
+class SQLiteRepository:
+    """PictogramRepository on the seeded SQLite database.
+
+    Bulk reads resolve locale fallbacks in memory, so the number of
+    statements per call never depends on the number of pictograms.
+    """
+    def __init__(self, db: DatabaseManager | None = None) -> None:
+        """Initialize the repository.
+
+        Args:
+            db: Database to read. Defaults to the application database.
+        """
+        self.db = db or DatabaseManager()
+
+    def locales(self) -> list[str]:
+        """Locales with at least one localized label."""
+        return [row["locale"] for row in self._fetch(
+            "SELECT locale FROM pictogram_labels "
+            "UNION SELECT locale FROM category_labels ORDER BY locale"
+        )]
+
+    def load_catalog(
+        self,
+        locale: str | None = None,
+        category_ids: Sequence[str] | None = None
+    ) -> Catalog:
+        """Loads every category and pictogram for a locale in bulk.
+
+        With ``category_ids``, loads just those categories' rows, at most
+        MAX_PARAMS categories per query.
+        """
+        chain = locale_chain(locale)
+        # None: a single pass over every row
+        scopes: list[list[str] | None] = [None]
+        if category_ids is not None:
+            unique = list(dict.fromkeys(category_ids))
+            scopes = [
+                unique[start:start + MAX_PARAMS]
+                for start in range(0, len(unique), MAX_PARAMS)
+            ]
+        cat_rows: list[Any] = []
+        pic_rows: list[Any] = []
+        pic_label_rows: list[Any] = []
+        cat_label_rows: list[Any] = []
+        with self.db.read_snapshot() as conn:
+            cursor = conn.cursor()
+            for scope in scopes:
+                cat_filter = pic_filter = label_filter = ""
+                if scope is not None:
+                    ids = _marks(scope)
+                    cat_filter = f" WHERE id IN ({ids})"
+                    pic_filter = f" WHERE p.category_id IN ({ids})"
+                    label_filter = (
+                        f" AND pictogram_id IN "
+                        f"(SELECT id FROM pictograms WHERE category_id IN ({ids}))"
+                    )
+                params = scope or []
+                cursor.execute("SELECT * FROM categories" + cat_filter, params)
+                cat_rows += cursor.fetchall()
+                cursor.execute(PICTOGRAM_QUERY + pic_filter, (BUTTON_SIZE, *params))
+                pic_rows += cursor.fetchall()
+                if chain:
+                    cursor.execute(
+                        f"SELECT * FROM pictogram_labels "
+                        f"WHERE locale IN ({_marks(chain)})" + label_filter,
+                        [*chain, *params]
+                    )
+                    pic_label_rows += cursor.fetchall()
+                    cursor.execute(
+                        f"SELECT * FROM category_labels "
+                        f"WHERE locale IN ({_marks(chain)})"
+                        + cat_filter.replace(" WHERE id", " AND category_id"),
+                        [*chain, *params]
+                    )
+                    cat_label_rows += cursor.fetchall()
+        pic_labels = _best_labels(pic_label_rows, "pictogram_id", chain)
+        cat_labels = _best_labels(cat_label_rows, "category_id", chain)
+
+        categories: dict[str, Category] = {}
+        for cat_row in cat_rows:
+            localized = cat_labels.get(cat_row["id"])
+            categories[cat_row["id"]] = Category(
+                id=cat_row["id"],
+                name=localized["name"] if localized else cat_row["name"],
+                pictograms=[],
+                parent_id=cat_row["parent_id"]
+            )
+        strings: dict[str, str] = {}
+        pictograms: dict[str, Pictogram] = {}
+        for row in pic_rows:
+            pictogram = _pictogram_from_row(
+                row, pic_labels.get(row["id"]), strings
+            )
+            pictograms[pictogram.id] = pictogram
+            owner = categories.get(row["category_id"])
+            if owner is not None:
+                owner.pictograms.append(pictogram)
+
+        catalog = Catalog(locale=locale, categories=categories, pictograms=pictograms)
+        catalog.link_children()
+        return catalog
+
+    def list_categories(self, locale: str | None = None) -> list[Category]:
+        """Every category with its pictograms, in board order."""
+        return list(self.load_catalog(locale))
+
+    def get_category(
+        self, category_id: str, locale: str | None = None
+    ) -> Category | None:
+        """One category with its pictograms (children are not loaded)."""
+        return self.load_catalog(locale, [category_id]).categories.get(category_id)
+
+    def get_pictograms(
+        self, pictogram_ids: Sequence[str], locale: str | None = None
+    ) -> list[Pictogram]:
+        """The pictograms found among ``pictogram_ids``, in that order."""
+        found: dict[str, Pictogram] = {}
+        unique = list(dict.fromkeys(pictogram_ids))
+        for start in range(0, len(unique), MAX_PARAMS):
+            chunk = unique[start:start + MAX_PARAMS]
+            found.update(self._pictograms(chunk, locale))
+        return [found[i] for i in pictogram_ids if i in found]
+
+    def list_pictograms(
+        self,
+        after: str | None = None,
+        limit: int = PAGE_SIZE,
+        locale: str | None = None
+    ) -> list[Pictogram]:
+        """One page of pictograms ordered by id (keyset pagination).
+
+        Args:
+            after: Last id of the previous page; None for the first page.
+            limit: Page size.
+            locale: Label language.
+        """
+        rows = self._fetch(
+            "SELECT id FROM pictograms WHERE id > ? ORDER BY id LIMIT ?",
+            (after or "", limit)
+        )
+        return self.get_pictograms([row["id"] for row in rows], locale)
+
+    def subtree_ids(self, category_id: str) -> list[str]:
+        """A category and every category below it, shallowest first."""
+        return self._ids(
+            "SELECT descendant FROM category_tree "
+            "WHERE ancestor = ? ORDER BY depth",
+            category_id
+        )
+
+    def ancestor_ids(self, category_id: str) -> list[str]:
+        """The path from the top level down to a category, inclusive."""
+        return self._ids(
+            "SELECT ancestor FROM category_tree "
+            "WHERE descendant = ? ORDER BY depth DESC",
+            category_id
+        )
+
+    def pictogram_ids_under(self, category_id: str) -> list[str]:
+        """Every pictogram in a category or any category below it."""
+        return self._ids(
+            "SELECT p.id FROM category_tree t "
+            "JOIN pictograms p ON p.category_id = t.descendant "
+            "WHERE t.ancestor = ? ORDER BY t.depth",
+            category_id
+        )
+
+    def get_atlas(self, category_id: str) -> Atlas | None:
+        """The sprite atlas of a category, if one was built."""
+        with self.db.read_snapshot() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT path FROM atlases WHERE category_id = ?", (category_id,)
+            )
+            atlas_row = cursor.fetchone()
+            if not atlas_row:
+                return None
+
+            cursor.execute(
+                "SELECT * FROM atlas_entries WHERE category_id = ?",
+                (category_id,)
+            )
+            return Atlas(
+                path=atlas_row["path"],
+                entries={
+                    row["asset_hash"]: (
+                        row["x"], row["y"], row["width"], row["height"]
+                    )
+                    for row in cursor.fetchall()
+                }
+            )
+
+    def image_file(self, pictogram: Pictogram) -> Path | None:
+        """The pictogram's thumbnail or image file."""
+        return _image_file(pictogram)
+
+    def _pictograms(
+        self, ids: Sequence[str], locale: str | None
+    ) -> dict[str, Pictogram]:
+        """Localized pictograms by id, in two statements at most."""
+        chain = locale_chain(locale)
+        with self.db.read_snapshot() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                PICTOGRAM_QUERY + f" WHERE p.id IN ({_marks(ids)})",
+                (BUTTON_SIZE, *ids)
+            )
+            rows = cursor.fetchall()
+            labels: dict[str, Any] = {}
+            if chain:
+                cursor.execute(
+                    f"SELECT * FROM pictogram_labels "
+                    f"WHERE locale IN ({_marks(chain)}) "
+                    f"AND pictogram_id IN ({_marks(ids)})",
+                    [*chain, *ids]
+                )
+                labels = _best_labels(cursor.fetchall(), "pictogram_id", chain)
+        strings: dict[str, str] = {}
+        return {
+            row["id"]: _pictogram_from_row(row, labels.get(row["id"]), strings)
+            for row in rows
+        }
+
+    def _ids(self, query: str, category_id: str) -> list[str]:
+        return [row[0] for row in self._fetch(query, (category_id,))]
+
+    def _fetch(self, query: str, params: Sequence[Any] = ()) -> list[Any]:
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+
+class MemoryRepository:
+    """PictogramRepository held entirely in dicts; never touches disk.
+
+    Holds one resolved catalog per locale. A locale that wasn't loaded
+    falls back along its chain ('pt-BR' -> 'pt') to the default labels.
+    Catalogs handed out are copies, so callers may patch them freely.
+    """
+    def __init__(
+        self,
+        catalogs: Iterable[Catalog],
+        atlases: dict[str, Atlas] | None = None
+    ) -> None:
+        """Index the given catalogs.
+
+        Args:
+            catalogs: One catalog per locale; the one with locale None
+                      holds the default labels.
+            atlases: Sprite atlases by category id.
+        """
+        self._catalogs = {catalog.locale: catalog for catalog in catalogs}
+        self._atlases = atlases or {}
+        default = self._catalog(None)
+        self._ids = sorted(default.pictograms)
+        self._ancestors: dict[str, list[str]] = {}
+        for category in default.categories.values():
+            path = [category.id]
+            parent = default.categories.get(category.parent_id or "")
+            while parent is not None:
+                path.append(parent.id)
+                parent = default.categories.get(parent.parent_id or "")
+            self._ancestors[category.id] = path[::-1]
+
+    @classmethod
+    def from_categories(cls, categories: Iterable[Category]) -> MemoryRepository:
+        """A single-locale repository over ready-made categories."""
+        categories = list(categories)
+        catalog = Catalog(
+            locale=None,
+            categories={c.id: c for c in categories},
+            pictograms={p.id: p for c in categories for p in c}
+        )
+        catalog.link_children()
+        return cls([catalog])
+
+    @classmethod
+    def snapshot(
+        cls,
+        source: PictogramRepository,
+        locales: Iterable[str] | None = None
+    ) -> MemoryRepository:
+        """Copies another repository into memory (e.g. for a kiosk).
+
+        Args:
+            source: Repository to read once.
+            locales: Locales to keep. Defaults to all of the source's.
+        """
+        wanted = source.locales() if locales is None else list(locales)
+        catalogs = [source.load_catalog(locale) for locale in (None, *wanted)]
+        atlases = {
+            category.id: atlas
+            for category in catalogs[0]
+            if (atlas := source.get_atlas(category.id)) is not None
+        }
+        return cls(catalogs, atlases)
+
+    def locales(self) -> list[str]:
+        """Locales with a loaded catalog."""
+        return sorted(locale for locale in self._catalogs if locale)
+
+    def load_catalog(
+        self,
+        locale: str | None = None,
+        category_ids: Sequence[str] | None = None
+    ) -> Catalog:
+        """A copy of the locale's catalog (or of just some categories)."""
+        source = self._catalog(locale)
+        wanted = source.categories.keys() if category_ids is None else category_ids
+        categories = {
+            cat_id: replace(
+                source.categories[cat_id],
+                pictograms=list(source.categories[cat_id].pictograms),
+                children=[]
+            )
+            for cat_id in wanted if cat_id in source.categories
+        }
+        catalog = Catalog(
+            locale=locale,
+            categories=categories,
+            pictograms={p.id: p for c in categories.values() for p in c}
+        )
+        catalog.link_children()
+        return catalog
+
+    def list_categories(self, locale: str | None = None) -> list[Category]:
+        """Every category with its pictograms, in board order."""
+        return list(self.load_catalog(locale))
+
+    def get_category(
+        self, category_id: str, locale: str | None = None
+    ) -> Category | None:
+        """One category with its pictograms (children are not loaded)."""
+        return self.load_catalog(locale, [category_id]).categories.get(category_id)
+
+    def get_pictograms(
+        self, pictogram_ids: Sequence[str], locale: str | None = None
+    ) -> list[Pictogram]:
+        """The pictograms found among ``pictogram_ids``, in that order."""
+        pictograms = self._catalog(locale).pictograms
+        return [pictograms[i] for i in pictogram_ids if i in pictograms]
+
+    def list_pictograms(
+        self,
+        after: str | None = None,
+        limit: int = PAGE_SIZE,
+        locale: str | None = None
+    ) -> list[Pictogram]:
+        """One page of pictograms ordered by id (keyset pagination)."""
+        start = bisect.bisect_right(self._ids, after) if after else 0
+        return self.get_pictograms(self._ids[start:start + limit], locale)
+
+    def subtree_ids(self, category_id: str) -> list[str]:
+        """A category and every category below it, shallowest first."""
+        category = self._catalog(None).categories.get(category_id)
+        if category is None:
+            return []
+        level = [category]
+        found: list[str] = []
+        while level:
+            found.extend(c.id for c in level)
+            level = [child for c in level for child in c.children]
+        return found
+
+    def ancestor_ids(self, category_id: str) -> list[str]:
+        """The path from the top level down to a category, inclusive."""
+        return list(self._ancestors.get(category_id, []))
+
+    def pictogram_ids_under(self, category_id: str) -> list[str]:
+        """Every pictogram in a category or any category below it."""
+        categories = self._catalog(None).categories
+        return [
+            p.id for cat_id in self.subtree_ids(category_id)
+            for p in categories[cat_id]
+        ]
+
+    def get_atlas(self, category_id: str) -> Atlas | None:
+        """The sprite atlas of a category, if the snapshot had one."""
+        return self._atlases.get(category_id)
+
+    def image_file(self, pictogram: Pictogram) -> Path | None:
+        """The pictogram's thumbnail or image file."""
+        return _image_file(pictogram)
+
+    def _catalog(self, locale: str | None) -> Catalog:
+        for candidate in locale_chain(locale):
+            if candidate in self._catalogs:
+                return self._catalogs[candidate]
+        if None not in self._catalogs:
+            raise KeyError("MemoryRepository needs a default (locale None) catalog")
+        return self._catalogs[None]
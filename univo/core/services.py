@@ -3,29 +3,188 @@
 Coordinates interactions between the UI and the persistence layer, 
 applying business rules and modern Pythonic patterns.
 """
-from collections.abc import Iterator
-from typing import Any
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
 
+from .atlas import Atlas
 from .database import DatabaseManager
 from .decorators import log_interaction
-from .domain import Category, Pictogram
+from .domain import Catalog, Category, Pictogram
+from .editing import BoardEdit
 from .interfaces import PictogramRepository
+from .repositories import SQLiteRepository
 
 
 class PictogramService:
     """Orchestrates pictogram and category logic.
     
     Provides high-level access to domain entities using generators,
-    properties, and the mapping protocol.
+    properties, and the mapping protocol. Reads are served from a
+    catalog built in one bulk load per locale and cached, so switching
+    between a bilingual user's languages costs at most one load each.
+    ``generation`` goes up whenever the cached catalogs change, so
+    anything derived from them can tell when it is stale.
+
+    Thread safety: each cached catalog is an immutable snapshot of one
+    version of the board (see Catalog). Every read method works on a
+    single snapshot, and never takes a lock once the locale's catalog
+    is loaded. Writers (refresh, invalidate, edits) build the next
+    version, sharing unchanged categories, and swap it in with one
+    assignment, so a reader sees either the old or the new board,
+    never a mix, and never waits for a writer. Pin ``catalog`` when
+    several reads must agree; a version is freed once no reader holds
+    it.
     """
-    def __init__(self, db_manager: PictogramRepository | None = None) -> None:
+    def __init__(
+        self,
+        db_manager: DatabaseManager | PictogramRepository | None = None,
+        locale: str | None = None
+    ) -> None:
         """Initialize the service with a repository.
         
         Args:
-            db_manager: A repository implementation. 
-                        Defaults to DatabaseManager.
+            db_manager: A repository implementation, or a database to read
+                        through a SQLiteRepository. Defaults to the
+                        application database.
+            locale: Active locale (e.g. 'pt-BR'). Labels fall back through
+                    'pt' to the seeded names. None uses the seeded names.
+        """
+        if db_manager is None or isinstance(db_manager, DatabaseManager):
+            db_manager = SQLiteRepository(db_manager)
+        self.repository: PictogramRepository = db_manager
+        # Database for usage, predictions and live reload; None when the
+        # catalog doesn't come from SQLite (e.g. an in-memory kiosk)
+        self.db: DatabaseManager | None = (
+            db_manager.db if isinstance(db_manager, SQLiteRepository) else None
+        )
+        self.locale = locale
+        self.generation = 0
+        self._catalogs: dict[str | None, Catalog] = {}
+        # Serializes catalog loads and swaps; reads never take it
+        self._lock = threading.RLock()
+
+    @property
+    def catalog(self) -> Catalog:
+        """The current snapshot of the active locale, loaded on first use."""
+        return self.catalog_for(self.locale)
+
+    def catalog_for(self, locale: str | None) -> Catalog:
+        """The current snapshot of any locale, without switching to it."""
+        catalog = self._catalogs.get(locale)
+        if catalog is None:
+            with self._lock:
+                catalog = self._catalogs.get(locale)
+                if catalog is None:
+                    catalog = self.repository.load_catalog(locale)
+                    # Not published yet, so still free to stamp
+                    catalog.version = self.generation
+                    self._catalogs = {**self._catalogs, locale: catalog}
+        return catalog
+
+    @log_interaction
+    def set_locale(self, locale: str | None) -> Catalog:
+        """Switches the active locale and returns its catalog."""
+        self.locale = locale
+        return self.catalog
+
+    @property
+    def locales(self) -> list[str]:
+        """Locales with at least one localized label."""
+        return self.repository.locales()
+
+    def next_locale(self) -> str | None:
+        """The locale after the active one, cycling through the seeded names."""
+        options: list[str | None] = [None, *self.locales]
+        if self.locale not in options:
+            return options[0]
+        return options[(options.index(self.locale) + 1) % len(options)]
+
+    def invalidate(self) -> None:
+        """Drops cached catalogs so the next read reloads them."""
+        with self._lock:
+            self._catalogs = {}
+            self.generation += 1
+
+    def shrink(self) -> int:
+        """Drops the cached catalogs of every locale but the active one.
+
+        Used by a MemoryBudget; dropped catalogs reload on next use.
+
+        Returns:
+            The number of catalogs dropped.
+        """
+        with self._lock:
+            kept = {
+                locale: catalog
+                for locale, catalog in self._catalogs.items()
+                if locale == self.locale
+            }
+            dropped = len(self._catalogs) - len(kept)
+            self._catalogs = kept
+        return dropped
+
+    @log_interaction
+    def refresh(self, category_ids: Iterable[str]) -> None:
+        """Reloads only the given categories in every cached catalog.
+
+        Categories that no longer exist are dropped, new ones added;
+        every other Category and Pictogram object is reused as is (see
+        Catalog.patched).
+        """
+        scope = list(category_ids)
+        if not scope:
+            return
+        with self._lock:
+            version = self.generation + 1
+            self._catalogs = {
+                locale: catalog.patched(
+                    self.repository.load_catalog(locale, scope), scope, version
+                )
+                for locale, catalog in self._catalogs.items()
+            }
+            self.generation = version
+
+    @contextmanager
+    def edit(self) -> Iterator[BoardEdit]:
+        """Groups board edits into a single transaction.
+
+        >>> with service.edit() as edit:  # doctest: +SKIP
+        ...     edit.add_category("toys", "Toys")
+        ...     edit.move_pictograms(["ball", "doll"], "toys")
+
+        Everything is committed at once when the block exits and only the
+        affected categories are reloaded; an exception discards it all.
+
+        Raises:
+            RuntimeError: If the catalog is read-only (not from SQLite).
+        """
+        db = self._writable()
+        board_edit = BoardEdit(db)
+        try:
+            yield board_edit
+        except BaseException:
+            board_edit.rollback()
+            raise
+        changed = board_edit.commit()
+        if board_edit.has_images:
+            db.refresh_thumbnails()
+        self.refresh(changed)
+
+    @log_interaction
+    def undo(self) -> set[str]:
+        """Reverts the most recent edit.
+
+        Returns:
+            The ids of the categories it changed; empty if there was
+            nothing to undo.
         """
-        self.db: PictogramRepository = db_manager or DatabaseManager()
+        changed = BoardEdit(self._writable()).undo()
+        if changed is None:
+            return set()
+        self.refresh(changed)
+        return changed
 
     @property
     @log_interaction
@@ -39,34 +198,41 @@ class PictogramService:
 
     @property
     def categories(self) -> Iterator[Category]:
-        """Generator that yields all categories with their pictograms.
-        
-        Lazy-loads pictograms for each category during iteration.
-        """
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM categories")
-            cat_rows: list[Any] = cursor.fetchall()
-            
-            for cat_row in cat_rows:
-                cat_id: str = cat_row["id"]
-                # Fetch pictograms for this category
-                cursor.execute(
-                    "SELECT * FROM pictograms WHERE category_id = ?", 
-                    (cat_id,)
-                )
-                pic_rows: list[Any] = cursor.fetchall()
-                
-                pictograms: list[Pictogram] = [
-                    Pictogram(
-                        id=row["id"],
-                        label=row["label"],
-                        voice_command=row["voice_command"],
-                        image_path=row["icon_path"]
-                    ) for row in pic_rows
-                ]
-                
-                yield Category(id=cat_id, name=cat_row["name"], pictograms=pictograms)
+        """Generator that yields all categories with their pictograms."""
+        yield from self.catalog
+
+    @property
+    def root_categories(self) -> list[Category]:
+        """Top-level categories; nested ones hang off their ``children``."""
+        return self.catalog.roots
+
+    @log_interaction
+    def subtree(self, category_id: str) -> list[Category]:
+        """A category and all categories below it, shallowest first."""
+        return self.catalog.subtree(category_id)
+
+    @log_interaction
+    def breadcrumbs(self, category_id: str) -> list[Category]:
+        """The path from the top level down to a category, inclusive."""
+        return self.catalog.ancestors(category_id)
+
+    @log_interaction
+    def pictograms_under(self, category_id: str) -> list[Pictogram]:
+        """Every pictogram in a category or any of its subcategories."""
+        return [
+            pictogram
+            for category in self.catalog.subtree(category_id)
+            for pictogram in category
+        ]
+
+    @property
+    def voice_commands(self) -> list[str]:
+        """Every distinct text the pictograms can speak in this locale."""
+        return list(dict.fromkeys(
+            p.voice_command
+            for p in self.catalog.pictograms.values()
+            if p.voice_command
+        ))
 
     def get_main_category(self) -> Category:
         """Deprecated: Use default_category property instead."""
@@ -75,59 +241,55 @@ class PictogramService:
     @log_interaction
     def get_category_by_id(self, category_id: str) -> Category | None:
         """Fetch a specific category and its pictograms by ID."""
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM categories WHERE id = ?", (category_id,))
-            cat_row = cursor.fetchone()
-            
-            if not cat_row:
-                return None
-                
-            cursor.execute(
-                "SELECT * FROM pictograms WHERE category_id = ?", 
-                (category_id,)
-            )
-            pic_rows = cursor.fetchall()
-            
-            pictograms = [
-                Pictogram(
-                    id=row["id"],
-                    label=row["label"],
-                    voice_command=row["voice_command"],
-                    image_path=row["icon_path"]
-                ) for row in pic_rows
-            ]
-            
-            return Category(
-                id=cat_row["id"], 
-                name=cat_row["name"], 
-                pictograms=pictograms
-            )
+        return self.catalog.categories.get(category_id)
+
+    @log_interaction
+    def get_atlas(self, category_id: str) -> Atlas | None:
+        """Fetch the sprite atlas of a category, if one was built."""
+        return self.repository.get_atlas(category_id)
+
+    def image_file(self, pictogram: Pictogram) -> Path | None:
+        """A file holding the pictogram's image, thumbnail first."""
+        return self.repository.image_file(pictogram)
 
     @log_interaction
     def __getitem__(self, pictogram_id: str) -> Pictogram | None:
         """Finds a pictogram by ID (Mapping protocol: service['id'])."""
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM pictograms WHERE id = ?", (pictogram_id,))
-            row: Any | None = cursor.fetchone()
-
-            
-            if row:
-                return Pictogram(
-                    id=row["id"],
-                    label=row["label"],
-                    voice_command=row["voice_command"],
-                    image_path=row["icon_path"]
-                )
-            return None
-
+        return self.catalog.pictograms.get(pictogram_id)
 
     def get_pictogram_by_id(self, pictogram_id: str) -> Pictogram | None:
         """Deprecated: Use service[id] instead."""
         return self[pictogram_id]
 
+    @log_interaction
+    def get_many(
+        self, pictogram_ids: Iterable[str]
+    ) -> tuple[list[Pictogram], list[str]]:
+        """Resolves several pictograms at once through the cached catalog.
+
+        Costs at most the one bulk load of the active locale's catalog,
+        however many ids are asked for.
+
+        Returns:
+            The pictograms found, in the order of ``pictogram_ids``, and
+            the ids that matched nothing.
+        """
+        pictograms = self.catalog.pictograms
+        found: list[Pictogram] = []
+        missing: list[str] = []
+        for pictogram_id in pictogram_ids:
+            pictogram = pictograms.get(pictogram_id)
+            if pictogram is None:
+                missing.append(pictogram_id)
+            else:
+                found.append(pictogram)
+        return found, missing
+
     def __iter__(self) -> Iterator[Category]:
         """Iterate over all categories (Iterable protocol)."""
         return self.categories
 
+    def _writable(self) -> DatabaseManager:
+        if self.db is None:
+            raise RuntimeError("This catalog is read-only")
+        return self.db
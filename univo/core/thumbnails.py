@@ -0,0 +1,131 @@
+"""Thumbnail generation for pictogram images.
+
+Source images are often far larger than the buttons that display them.
+This module renders device-sized copies into a content-addressed cache
+directory, using a process pool so large libraries decode in parallel.
+
+Pillow is optional: without it, no thumbnails are produced and the UIs
+keep using the original images.
+"""
+import hashlib
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+
+from .decorators import logger
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - depends on the environment
+    Image = None  # type: ignore[assignment]
+
+# Pictogram buttons are 100x100 in the Toga UI
+BUTTON_SIZE = 100
+THUMBNAIL_SIZES: tuple[int, ...] = (BUTTON_SIZE,)
+
+# Below this many jobs a process pool costs more than it saves
+MIN_PARALLEL_JOBS = 8
+
+
+def content_hash(path: Path) -> str:
+    """Returns the SHA-256 hex digest of a file's contents."""
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def render_thumbnail(source: str, destination: str, size: int) -> str:
+    """Renders one thumbnail fitting in a ``size`` square.
+
+    Writes through a temporary file so readers never see partial images.
+    Module-level so it can be pickled into pool workers.
+    """
+    tmp = f"{destination}.{os.getpid()}.tmp"
+    with Image.open(source) as src:
+        img = src.convert("RGBA")
+    img.thumbnail((size, size), Image.Resampling.LANCZOS)
+    img.save(tmp, format="PNG", optimize=True)
+    os.replace(tmp, destination)
+    return destination
+
+
+class ThumbnailCache:
+    """Directory of thumbnails keyed by source content hash and size.
+
+    Because names derive from the content, an edited source gets a new
+    entry while unchanged sources are never rendered twice.
+    """
+    def __init__(
+        self,
+        cache_dir: Path,
+        sizes: tuple[int, ...] = THUMBNAIL_SIZES
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.sizes = sizes
+
+    @property
+    def available(self) -> bool:
+        """Whether thumbnails can be rendered (Pillow is installed)."""
+        return Image is not None
+
+    def path_for(self, digest: str, size: int) -> Path:
+        """Cache location of the thumbnail for a content hash and size."""
+        return self.cache_dir / f"{digest}-{size}.png"
+
+    def render(
+        self,
+        jobs: Iterable[tuple[Path, str, int]]
+    ) -> dict[tuple[str, int], Path]:
+        """Renders missing thumbnails for ``(source, digest, size)`` jobs.
+
+        Returns the cache path for every job whose thumbnail exists
+        afterwards. Failures are logged and the job is left out.
+        """
+        done: dict[tuple[str, int], Path] = {}
+        pending: dict[tuple[str, int], tuple[str, str, int]] = {}
+        for source, digest, size in jobs:
+            dest = self.path_for(digest, size)
+            if dest.exists():
+                done[digest, size] = dest
+            elif (digest, size) not in pending:
+                pending[digest, size] = (str(source), str(dest), size)
+
+        if not pending or not self.available:
+            return done
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        results = self._run(list(pending.values()))
+        for key, result in zip(pending, results, strict=True):
+            if result is not None:
+                done[key] = Path(result)
+        return done
+
+    def _run(self, tasks: list[tuple[str, str, int]]) -> list[str | None]:
+        """Executes render tasks on a process pool, or inline if unavailable."""
+        if len(tasks) >= MIN_PARALLEL_JOBS:
+            try:
+                with ProcessPoolExecutor() as pool:
+                    futures = [pool.submit(render_thumbnail, *t) for t in tasks]
+                    return [_collect(future.result, task)
+                            for future, task in zip(futures, tasks, strict=True)]
+            except (OSError, NotImplementedError, BrokenProcessPool) as e:
+                # Some mobile platforms cannot spawn worker processes
+                logger.warning(f"Thumbnail pool unavailable ({e}); rendering inline")
+
+        return [_collect(partial(render_thumbnail, *task), task) for task in tasks]
+
+
+def _collect(
+    outcome: Callable[[], str],
+    task: tuple[str, str, int]
+) -> str | None:
+    """Returns a render result, logging (not raising) per-image failures."""
+    try:
+        return outcome()
+    except BrokenProcessPool:
+        raise
+    except Exception as e:
+        logger.warning(f"Thumbnail failed for {task[0]}: {e}")
+        return None
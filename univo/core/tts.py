@@ -0,0 +1,400 @@
+"""Text-to-speech for UniVo.
+
+Synthesis goes through a pluggable offline engine and lands in a disk
+cache keyed by engine, settings, voice and text. Audio for every
+``voice_command`` can be synthesized in the background ahead of time,
+so a tap plays cached audio immediately instead of waiting on the engine.
+"""
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+import wave
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from concurrent import futures
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .database import BASE_DIR
+from .decorators import logger
+from .interfaces import AudioPlayer, SpeechEngine
+
+CACHE_DIR = BASE_DIR / ".univo-cache" / "audio"
+PHRASE_DIR = BASE_DIR / ".univo-cache" / "phrases"
+PHRASE_BUDGET = 32 * 1024 * 1024
+DEFAULT_VOICE = "en"
+
+
+class EspeakEngine:
+    """Offline synthesis through the ``espeak-ng`` command line tool."""
+    name = "espeak-ng"
+
+    def __init__(self, rate: int = 150, pitch: int = 50) -> None:
+        self.settings: dict[str, Any] = {"rate": rate, "pitch": pitch}
+        self.executable = shutil.which("espeak-ng")
+
+    @property
+    def available(self) -> bool:
+        """Whether espeak-ng is installed."""
+        return self.executable is not None
+
+    def synthesize(self, text: str, voice: str, destination: Path) -> None:
+        """Render speech to a WAV file with espeak-ng."""
+        if self.executable is None:
+            raise RuntimeError("espeak-ng is not installed")
+        subprocess.run(
+            [
+                self.executable,
+                "-v", voice,
+                "-s", str(self.settings["rate"]),
+                "-p", str(self.settings["pitch"]),
+                "-w", str(destination),
+                text,
+            ],
+            check=True,
+            capture_output=True,
+        )
+
+
+class SilentEngine:
+    """Stand-in engine writing short silent WAVs (tests and benchmarks)."""
+    name = "silent"
+
+    def __init__(self, duration: float = 0.1, rate: int = 8000) -> None:
+        self.settings: dict[str, Any] = {"duration": duration, "rate": rate}
+        self.calls: list[tuple[str, str]] = []
+
+    def synthesize(self, text: str, voice: str, destination: Path) -> None:
+        """Write silence lasting ``duration`` seconds."""
+        self.calls.append((text, voice))
+        rate = self.settings["rate"]
+        with wave.open(str(destination), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(rate)
+            wav.writeframes(b"\x00\x00" * int(rate * self.settings["duration"]))
+
+
+class CommandPlayer:
+    """Plays audio through the first available system player.
+
+    Each file is handed to a child process, so playing never blocks.
+    """
+    COMMANDS = (("paplay",), ("aplay", "-q"), ("afplay",))
+
+    def __init__(self) -> None:
+        self.command: list[str] | None = None
+        for candidate in self.COMMANDS:
+            executable = shutil.which(candidate[0])
+            if executable:
+                self.command = [executable, *candidate[1:]]
+                break
+
+    def play(self, path: Path) -> None:
+        """Start playback in a child process."""
+        if self.command is None:
+            logger.warning(f"No audio player available for {path}")
+            return
+        subprocess.Popen(
+            [*self.command, str(path)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+
+class NullPlayer:
+    """Discards audio (headless runs, tests and benchmarks)."""
+
+    def play(self, path: Path) -> None:
+        """Do nothing."""
+
+
+def default_engine() -> SpeechEngine | None:
+    """Returns the best offline engine installed, if any."""
+    engine = EspeakEngine()
+    return engine if engine.available else None
+
+
+def voice_for_locale(locale: str | None) -> str:
+    """Engine voice for a locale: its language subtag ('pt-BR' -> 'pt')."""
+    if not locale:
+        return DEFAULT_VOICE
+    return locale.replace("_", "-").split("-")[0].lower()
+
+
+class AudioCache:
+    """Directory of synthesized audio keyed by engine, settings, voice, text."""
+    def __init__(self, cache_dir: Path = CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+
+    def path_for(self, engine: SpeechEngine, voice: str, text: str) -> Path:
+        """Cache location of ``text`` spoken by ``engine`` with ``voice``."""
+        key = json.dumps(
+            [engine.name, engine.settings, voice, text],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.cache_dir / f"{digest}.wav"
+
+    def get(self, engine: SpeechEngine, voice: str, text: str) -> Path | None:
+        """Returns cached audio, or None when it was never synthesized."""
+        path = self.path_for(engine, voice, text)
+        return path if path.is_file() else None
+
+    def store(self, engine: SpeechEngine, voice: str, text: str) -> Path:
+        """Synthesizes into the cache, atomically, and returns the file."""
+        path = self.path_for(engine, voice, text)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        engine.synthesize(text, voice, tmp)
+        os.replace(tmp, path)
+        return path
+
+
+class PhraseCache(AudioCache):
+    """Audio of whole utterances with least-recently-used eviction.
+
+    A phrase is keyed by its sequence of voice commands (joined as it
+    is spoken). Hits refresh the file's mtime, so recency survives
+    restarts; once the directory exceeds ``budget`` bytes, the phrases
+    spoken least recently are deleted.
+    """
+    def __init__(
+        self,
+        cache_dir: Path = PHRASE_DIR,
+        budget: int = PHRASE_BUDGET
+    ) -> None:
+        super().__init__(cache_dir)
+        self.budget = budget
+        self._lru: OrderedDict[Path, int] = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir.is_dir():
+            entries = sorted(
+                (entry.stat().st_mtime_ns, Path(entry.path), entry.stat().st_size)
+                for entry in os.scandir(cache_dir)
+                if entry.name.endswith(".wav")
+            )
+            for _, path, size in entries:
+                self._lru[path] = size
+
+    @property
+    def total_size(self) -> int:
+        """Bytes currently used by cached phrases."""
+        with self._lock:
+            return sum(self._lru.values())
+
+    def get(self, engine: SpeechEngine, voice: str, text: str) -> Path | None:
+        """Returns cached phrase audio and marks it most recently used."""
+        path = super().get(engine, voice, text)
+        if path is not None:
+            with self._lock:
+                self._lru[path] = self._lru.pop(path, path.stat().st_size)
+            os.utime(path)
+        return path
+
+    def store(self, engine: SpeechEngine, voice: str, text: str) -> Path:
+        """Synthesizes a phrase, then evicts down to the budget."""
+        path = super().store(engine, voice, text)
+        with self._lock:
+            self._lru.pop(path, None)
+            self._lru[path] = path.stat().st_size
+            total = sum(self._lru.values())
+            while total > self.budget and len(self._lru) > 1:
+                victim, size = self._lru.popitem(last=False)
+                victim.unlink(missing_ok=True)
+                total -= size
+        return path
+
+
+class SpeechService:
+    """Speaks text through a cached offline engine without blocking.
+
+    Synthesis runs on two background workers: one for audio to play
+    now, one for prefetching with prepare(), so a tap never waits
+    behind the vocabulary backlog. Duplicate requests for the same
+    audio share one job.
+    """
+    def __init__(
+        self,
+        engine: SpeechEngine | None = None,
+        cache: AudioCache | None = None,
+        player: AudioPlayer | None = None,
+        voice: str = DEFAULT_VOICE,
+        phrases: PhraseCache | None = None
+    ) -> None:
+        """Initialize the speech service.
+
+        Args:
+            engine: Synthesis engine. Defaults to espeak-ng when installed;
+                    without one, speak() reports that nothing was spoken.
+            cache: Audio cache. Defaults to '.univo-cache/audio'.
+            player: Audio output. Defaults to a system command player.
+            voice: Engine voice used for all speech.
+            phrases: Cache for whole sentences. Defaults to a PhraseCache
+                     in a 'phrases' folder beside the audio cache.
+        """
+        self.engine = engine or default_engine()
+        self.cache = cache or AudioCache()
+        self.phrases = phrases or PhraseCache(
+            self.cache.cache_dir.with_name("phrases")
+        )
+        self.player = player or CommandPlayer()
+        self.voice = voice
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="univo-tts"
+        )
+        self._prefetch_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="univo-tts-prefetch"
+        )
+        self._pending: dict[Path, Future[Path]] = {}
+        # Jobs queued by prepare(), which audio to play now may overtake
+        self._prefetching: set[Future[Path]] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether an engine is configured."""
+        return self.engine is not None
+
+    def prepare(self, texts: Iterable[str | None]) -> int:
+        """Queues background synthesis of every text not cached yet.
+
+        The queue replaces what earlier calls left unstarted (the
+        vocabulary or voice may have changed since), and speech to play
+        now always runs ahead of it.
+
+        Returns:
+            The number of texts queued.
+        """
+        if self.engine is None:
+            return 0
+        self.cancel_prepare()
+        queued = 0
+        for text in dict.fromkeys(t for t in texts if t):
+            if self._cached(text) is None:
+                self._synthesize(text, prefetch=True)
+                queued += 1
+        return queued
+
+    def cancel_prepare(self) -> int:
+        """Drops prefetching that hasn't started yet.
+
+        Returns:
+            The number of jobs dropped.
+        """
+        with self._lock:
+            jobs = list(self._prefetching)
+        return sum(job.cancel() for job in jobs)
+
+    def speak(self, text: str | None) -> bool:
+        """Plays ``text``, synthesizing it first if it isn't cached.
+
+        Never blocks: cached audio starts at once, anything else starts
+        when its background synthesis completes.
+
+        Returns:
+            False when there is no engine (callers should fall back to
+            showing the text), True otherwise.
+        """
+        if not text or self.engine is None:
+            return False
+
+        cached = self._cached(text)
+        if cached is not None:
+            self.player.play(cached)
+        else:
+            self._synthesize(text).add_done_callback(self._play_result)
+        return True
+
+    def speak_phrase(self, voice_commands: Sequence[str]) -> bool:
+        """Plays a whole utterance as a single piece of audio.
+
+        Frequent phrases come straight from the phrase cache; new ones
+        are synthesized in one pass (not word by word), ahead of any
+        prefetching, and cached.
+
+        Returns:
+            False when there is no engine or nothing to say.
+        """
+        text = " ".join(c for c in voice_commands if c)
+        if not text or self.engine is None:
+            return False
+
+        cached = self.phrases.get(self.engine, self.voice, text)
+        if cached is not None:
+            self.player.play(cached)
+        else:
+            self._synthesize(text, self.phrases).add_done_callback(
+                self._play_result
+            )
+        return True
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Blocks until the synthesis queued so far has finished."""
+        with self._lock:
+            pending = list(self._pending.values())
+        futures.wait(pending, timeout=timeout)
+
+    def close(self) -> None:
+        """Stops the workers, dropping queued synthesis."""
+        self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _cached(self, text: str) -> Path | None:
+        if self.engine is None:
+            return None
+        return self.cache.get(self.engine, self.voice, text)
+
+    def _synthesize(
+        self,
+        text: str,
+        cache: AudioCache | None = None,
+        prefetch: bool = False
+    ) -> Future[Path]:
+        """Returns the job producing audio for ``text``, creating it once.
+
+        A job to play now takes over a prefetch job for the same audio
+        that is still queued, instead of waiting for its turn.
+        """
+        assert self.engine is not None
+        engine, voice, cache = self.engine, self.voice, cache or self.cache
+        path = cache.path_for(engine, voice, text)
+        while True:
+            with self._lock:
+                future = self._pending.get(path)
+                if future is None:
+                    executor = self._prefetch_executor if prefetch else self._executor
+                    future = executor.submit(cache.store, engine, voice, text)
+                    self._pending[path] = future
+                    if prefetch:
+                        self._prefetching.add(future)
+                    break
+                if prefetch or future not in self._prefetching:
+                    return future
+            # Cancelling runs the job's callbacks, so outside the lock
+            if not future.cancel():
+                return future
+            self._forget(path, future)
+        # Outside the lock: the callback runs inline if the job already ended
+        future.add_done_callback(lambda done: self._forget(path, done))
+        return future
+
+    def _forget(self, path: Path, future: Future[Path]) -> None:
+        with self._lock:
+            self._prefetching.discard(future)
+            if self._pending.get(path) is future:
+                del self._pending[path]
+
+    def _play_result(self, future: Future[Path]) -> None:
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Speech synthesis failed: {error}")
+            return
+        self.player.play(future.result())
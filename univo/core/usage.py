@@ -0,0 +1,202 @@
+"""Usage event log for UniVo.
+
+Records which pictograms are selected without adding latency to taps:
+events go into an in-memory queue and a background writer stores them
+in group-committed batches, updating per-day and per-pictogram rollups
+in the same transaction. Reports read the rollups, never the raw events.
+"""
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from .decorators import logger
+from .interfaces import ConnectionProvider
+
+
+@dataclass(frozen=True, slots=True)
+class UsageEvent:
+    """A single pictogram selection.
+
+    Attributes:
+        pictogram_id: The selected pictogram.
+        category_id: The category it was selected from, if any.
+        occurred_at: Unix timestamp of the selection.
+    """
+    pictogram_id: str
+    category_id: str | None
+    occurred_at: float
+
+    @property
+    def day(self) -> str:
+        """Local calendar day of the event (YYYY-MM-DD)."""
+        return time.strftime("%Y-%m-%d", time.localtime(self.occurred_at))
+
+
+_STOP = object()
+
+
+class UsageLog:
+    """Batched, asynchronous writer for usage events.
+
+    record() only enqueues. A writer thread waits for the first event,
+    keeps collecting for up to ``flush_interval`` seconds (or until
+    ``batch_size`` events), then commits the whole batch at once.
+    Everything still queued is written on close(), which also runs at
+    interpreter exit.
+    """
+    def __init__(
+        self,
+        db: ConnectionProvider | None,
+        batch_size: int = 64,
+        flush_interval: float = 1.0
+    ) -> None:
+        """Start the background writer.
+
+        Args:
+            db: Provider of connections to the UniVo database. None
+                (a catalog without a database) records nothing.
+            batch_size: Most events committed in a single transaction.
+            flush_interval: Longest an event waits before being committed.
+        """
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._closed = db is None
+        self._writer = threading.Thread(
+            target=self._run, name="univo-usage", daemon=True
+        )
+        if db is not None:
+            self._writer.start()
+            atexit.register(self.close)
+
+    def record(self, pictogram_id: str, category_id: str | None = None) -> None:
+        """Queues a selection; returns immediately."""
+        if self.db is None:
+            return
+        if self._closed:
+            logger.warning(f"Usage log closed; dropping {pictogram_id!r}")
+            return
+        self._queue.put(UsageEvent(pictogram_id, category_id, time.time()))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Blocks until everything recorded so far is committed.
+
+        Returns:
+            False if the writer did not catch up within ``timeout``.
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Writes any queued events and stops the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    def daily_totals(self) -> list[tuple[str, int]]:
+        """Selections per day, oldest first."""
+        return self._query(
+            "SELECT day, SUM(count) FROM usage_daily GROUP BY day ORDER BY day"
+        )
+
+    def day_counts(self, day: str) -> list[tuple[str, int]]:
+        """Selections per pictogram on one day (YYYY-MM-DD), most used first."""
+        return self._query(
+            "SELECT pictogram_id, count FROM usage_daily WHERE day = ? "
+            "ORDER BY count DESC, pictogram_id",
+            (day,)
+        )
+
+    def pictogram_counts(self, limit: int = -1) -> list[tuple[str, int]]:
+        """All-time selections per pictogram, most used first."""
+        return self._query(
+            "SELECT pictogram_id, count FROM usage_totals "
+            "ORDER BY count DESC, pictogram_id LIMIT ?",
+            (limit,)
+        )
+
+    def _query(self, sql: str, params: tuple[Any, ...] = ()) -> list[tuple[str, int]]:
+        if self.db is None:
+            return []
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def _run(self) -> None:
+        """Writer loop: collect a batch, commit it, repeat until stopped."""
+        assert self.db is not None
+        with self.db.get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            stopping = False
+            while not stopping:
+                batch: list[UsageEvent] = []
+                waiters: list[threading.Event] = []
+                item = self._queue.get()
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    if isinstance(item, threading.Event):
+                        # A flush request ends the batch early
+                        waiters.append(item)
+                        break
+                    batch.append(item)
+                    remaining = deadline - time.monotonic()
+                    if len(batch) >= self.batch_size or remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+
+                self._write(conn, batch)
+                for waiter in waiters:
+                    waiter.set()
+
+    def _write(self, conn: sqlite3.Connection, batch: list[UsageEvent]) -> None:
+        """Commits a batch of events and their rollups in one transaction."""
+        if not batch:
+            return
+        daily = Counter((event.day, event.pictogram_id) for event in batch)
+        totals = Counter(event.pictogram_id for event in batch)
+        last_used: dict[str, float] = {}
+        for event in batch:
+            last_used[event.pictogram_id] = event.occurred_at
+
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO usage_events "
+                    "(pictogram_id, category_id, occurred_at) VALUES (?, ?, ?)",
+                    [(e.pictogram_id, e.category_id, e.occurred_at) for e in batch]
+                )
+                conn.executemany(
+                    "INSERT INTO usage_daily (day, pictogram_id, count) "
+                    "VALUES (?, ?, ?) ON CONFLICT (day, pictogram_id) "
+                    "DO UPDATE SET count = count + excluded.count",
+                    [(day, pic, n) for (day, pic), n in daily.items()]
+                )
+                conn.executemany(
+                    "INSERT INTO usage_totals (pictogram_id, count, last_used) "
+                    "VALUES (?, ?, ?) ON CONFLICT (pictogram_id) "
+                    "DO UPDATE SET count = count + excluded.count, "
+                    "last_used = MAX(last_used, excluded.last_used)",
+                    [(pic, n, last_used[pic]) for pic, n in totals.items()]
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write {len(batch)} usage events: {e}")
@@ -0,0 +1,329 @@
+"""Live watching of the pictogram resources directory.
+
+Symbols copied into (or removed from) the resources tree while the app
+runs are picked up without restarting: filesystem events are collected
+by an inotify backend on Linux, or by periodic polling elsewhere,
+debounced, and applied to the database as an incremental sync of the
+affected categories only. Listeners then hear which category ids
+changed so they can refresh just those views.
+
+The same thread finishes a progressive first launch before it starts
+watching, so listeners also hear about categories as they are seeded.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from .database import DatabaseManager
+from .decorators import logger
+
+ChangeListener = Callable[[set[str]], None]
+
+# inotify(7) constants
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollingBackend:
+    """Finds changed folders by comparing directory snapshots."""
+    name = "polling"
+
+    def __init__(self, root: Path, interval: float = 2.0) -> None:
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._woken = threading.Event()
+
+    def changes(self, timeout: float) -> set[Path]:
+        """Folders whose entries changed since the last call.
+
+        Sleeps at most ``timeout`` (or one polling interval).
+        """
+        if self._woken.wait(min(timeout, self.interval)):
+            return set()
+        current = self._scan()
+        changed = {
+            folder for folder in current.keys() | self._snapshot.keys()
+            if current.get(folder) != self._snapshot.get(folder)
+        }
+        self._snapshot = current
+        return changed
+
+    def wake(self) -> None:
+        """Interrupts a pending changes() call for good."""
+        self._woken.set()
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+    def _scan(self) -> dict[Path, dict[str, tuple[int, int]]]:
+        """Every folder under the root with its entries' mtime and size."""
+        snapshot: dict[Path, dict[str, tuple[int, int]]] = {}
+        pending = [self.root]
+        while pending:
+            folder = pending.pop()
+            entries: dict[str, tuple[int, int]] = {}
+            try:
+                with os.scandir(folder) as scan:
+                    for entry in scan:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(Path(entry.path))
+                        stat = entry.stat(follow_symlinks=False)
+                        entries[entry.name] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                continue
+            snapshot[folder] = entries
+        return snapshot
+
+
+class InotifyBackend:
+    """Linux inotify events for every folder in the tree, via libc.
+
+    Raises:
+        OSError: If inotify is unavailable (not Linux, or out of watches).
+    """
+    name = "inotify"
+
+    def __init__(self, root: Path) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.root = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: dict[int, Path] = {}
+        for folder in _folders(root):
+            self._watch(folder)
+        self._wake_read, self._wake_write = os.pipe()
+
+    def changes(self, timeout: float) -> set[Path]:
+        """Folders touched by events arriving within ``timeout`` seconds."""
+        ready, _, _ = select.select([self._fd, self._wake_read], [], [], timeout)
+        if self._fd not in ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(
+                errors="surrogateescape"
+            )
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: treat every folder as changed
+                changed.update(_folders(self.root))
+                continue
+            folder = self._watches.get(wd)
+            if folder is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._watches[wd]
+                continue
+            changed.add(folder)
+            if mask & IN_ISDIR and name:
+                subfolder = folder / name
+                changed.add(subfolder)
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Watch the new tree; files copied in before the
+                    # watch existed are found by the sync itself
+                    for new_folder in _folders(subfolder):
+                        self._watch(new_folder)
+        return changed
+
+    def wake(self) -> None:
+        """Interrupts a pending changes() call for good."""
+        os.write(self._wake_write, b"\0")
+
+    def close(self) -> None:
+        """Releases the inotify descriptor and all its watches."""
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            os.close(fd)
+
+    def _watch(self, folder: Path) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(folder), WATCH_MASK
+        )
+        if wd >= 0:
+            self._watches[wd] = folder
+
+
+class ResourceWatcher:
+    """Keeps the database in step with the resources directory.
+
+    A background thread gathers changed folders; once no event has
+    arrived for ``debounce`` seconds (so a bulk copy is one update), the
+    affected categories are synced and every listener is called with the
+    ids of the categories that changed. Folders still queued by a
+    progressive first launch are seeded first, one batch per
+    notification. Listeners run on the watcher thread and must hand work
+    over to their UI loop themselves.
+    """
+    def __init__(
+        self,
+        db: DatabaseManager,
+        debounce: float = 0.5,
+        poll_interval: float = 2.0,
+        use_inotify: bool = True
+    ) -> None:
+        """Initialize the watcher; nothing is watched until start().
+
+        Args:
+            db: Database whose resources directory is watched.
+            debounce: Quiet time required before changes are applied.
+            poll_interval: Scan period of the polling fallback.
+            use_inotify: Try inotify before falling back to polling.
+        """
+        self.db = db
+        self.root = Path(db.resources_dir)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend: InotifyBackend | PollingBackend | None = None
+        self._listeners: list[ChangeListener] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Calls ``listener`` with the changed category ids after each sync."""
+        self._listeners.append(listener)
+
+    def start(self) -> bool:
+        """Starts watching in the background.
+
+        Returns:
+            False if the resources directory doesn't exist.
+        """
+        if self._thread is not None:
+            return True
+        if not self.root.is_dir():
+            logger.warning(f"Not watching missing directory {self.root}")
+            return False
+        self.backend = self._open_backend()
+        logger.info(f"Watching {self.root} ({self.backend.name})")
+        self._thread = threading.Thread(
+            target=self._run, name="univo-watcher", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def close(self) -> None:
+        """Stops watching and waits for the thread to exit."""
+        self._stop.set()
+        if self.backend is not None:
+            self.backend.wake()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
+
+    def apply(self, folders: set[Path]) -> set[str]:
+        """Syncs the categories of changed folders and notifies listeners.
+
+        Returns:
+            The ids of the categories that changed.
+        """
+        category_ids = {
+            folder.relative_to(self.root).as_posix()
+            for folder in folders
+            if folder != self.root and folder.is_relative_to(self.root)
+        }
+        if not category_ids:
+            return set()
+        changed = self.db.sync_resources(category_ids)
+        if changed:
+            logger.info(f"Resources changed: {sorted(changed)}")
+            self._notify(changed)
+        return changed
+
+    def seed(self) -> int:
+        """Seeds every folder a progressive first launch left queued.
+
+        Listeners hear each batch as it is committed. Stops early, with
+        the rest still queued, when the watcher is closed.
+
+        Returns:
+            The number of batches seeded.
+        """
+        batches = 0
+        while not self._stop.is_set():
+            changed = self.db.seed_pending()
+            if not changed:
+                break
+            batches += 1
+            self._notify(changed)
+        if batches:
+            done, total = self.db.seed_progress
+            logger.info(f"Seeded {done} of {total} categories in {batches} batches")
+        return batches
+
+    def _notify(self, changed: set[str]) -> None:
+        for listener in self._listeners:
+            listener(changed)
+
+    def _open_backend(self) -> InotifyBackend | PollingBackend:
+        if self.use_inotify:
+            try:
+                return InotifyBackend(self.root)
+            except (OSError, AttributeError) as exc:
+                logger.info(f"inotify unavailable ({exc}); polling instead")
+        return PollingBackend(self.root, self.poll_interval)
+
+    def _run(self) -> None:
+        assert self.backend is not None
+        try:
+            self.seed()
+        except Exception:
+            logger.exception("Failed to seed resources")
+        pending: set[Path] = set()
+        last_event = 0.0
+        while not self._stop.is_set():
+            timeout = self.debounce if pending else self.poll_interval
+            changed = self.backend.changes(timeout)
+            if changed:
+                pending |= changed
+                last_event = time.monotonic()
+            elif pending and time.monotonic() - last_event >= self.debounce:
+                folders, pending = pending, set()
+                try:
+                    self.apply(folders)
+                except Exception:
+                    logger.exception("Failed to apply resource changes")
+
+
+def _folders(root: Path) -> Iterator[Path]:
+    """A folder and every folder below it."""
+    yield root
+    for folder, subfolders, _ in os.walk(root):
+        for name in subfolders:
+            yield Path(folder) / name
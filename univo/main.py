@@ -1,9 +1,42 @@
 import argparse
+from pathlib import Path
 
+from univo.core.memory import MemoryBudget, memory_report, start_tracing
+from univo.core.pack import PackRepository, export_pack, import_pack
+from univo.core.profiles import DEFAULT_PROFILE, ProfileStore
+from univo.core.profiling import PROFILERS, Profiler
+from univo.core.remote import (
+    DEFAULT_PORT,
+    BoardServer,
+    RemoteRepository,
+    RemoteWatcher,
+)
+from univo.core.repositories import MemoryRepository, SQLiteRepository
+from univo.core.services import PictogramService
+from univo.core.watcher import ResourceWatcher
 from univo.ui.toga.app import UniVoTogaApp
 from univo.ui.tui.app import UniVoTUIApp
 
 
+def serve(service: PictogramService, host: str, port: int) -> None:
+    """Serves the board to thin clients until interrupted."""
+    server = BoardServer(service, host, port)
+    watcher = None
+    if service.db is not None:
+        watcher = ResourceWatcher(service.db)
+        watcher.subscribe(server.refresh)
+        watcher.start()
+    print(f"Serving the board on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if watcher is not None:
+            watcher.close()
+        server.httpd.server_close()
+
+
 def main() -> None:
     """Parses arguments and starts the selected user interface."""
     parser = argparse.ArgumentParser(description="UniVo - AAC Application")
@@ -13,15 +46,167 @@ def main() -> None:
         default="toga",
         help="Choose UI interface (default: toga)"
     )
+    parser.add_argument(
+        "--atlas",
+        action="store_true",
+        help="Load category grids from sprite atlases (toga only)"
+    )
+    parser.add_argument(
+        "--locale",
+        help="Label language, e.g. 'pt-BR' (default: the file names)"
+    )
+    parser.add_argument(
+        "--user",
+        default=DEFAULT_PROFILE,
+        metavar="NAME",
+        help="User profile to open, created on first use (default: default)"
+    )
+    parser.add_argument(
+        "--kiosk",
+        action="store_true",
+        help="Read-only mode: load the catalog into memory once at startup"
+    )
+    parser.add_argument(
+        "--pack",
+        type=Path,
+        help="Read-only mode: serve the board from a board pack file"
+    )
+    parser.add_argument(
+        "--export-pack",
+        type=Path,
+        metavar="PATH",
+        help="Write the board and its images to a board pack, then exit"
+    )
+    parser.add_argument(
+        "--import-pack",
+        type=Path,
+        metavar="PATH",
+        help="Merge a board pack into the database, then exit"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Serve the board over HTTP to thin clients instead of a UI"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Interface to serve on (default: 127.0.0.1; 0.0.0.0 for a LAN)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to serve on (default: {DEFAULT_PORT})"
+    )
+    parser.add_argument(
+        "--remote",
+        metavar="URL",
+        help="Thin client: read the board from a hub started with --serve"
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Trace allocations and print a breakdown by subsystem on exit"
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        metavar="MB",
+        help="Shrink caches (catalogs, then icons, then widgets) above this size"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sample",
+        choices=PROFILERS,
+        help="Profile CPU use from startup to exit: 'sample' (low overhead, "
+             "the default) or 'cprofile'; results go to univo/profiling"
+    )
     args = parser.parse_args()
 
-    if args.ui == "toga":
+    if args.memory:
+        # Before anything is loaded, so every allocation is attributed
+        start_tracing()
+    profiler = Profiler(args.profile or "sample")
+    if args.profile:
+        profiler.start()
+    try:
+        run(args, profiler)
+    finally:
+        profiler.stop()
+        if profiler.last_output is not None:
+            print(f"CPU profile written to {profiler.last_output}")
+        if args.memory:
+            print(memory_report())
+
+
+def run(args: argparse.Namespace, profiler: Profiler | None = None) -> None:
+    """Runs the command or user interface selected by the arguments.
+
+    Args:
+        args: Parsed command line.
+        profiler: CPU profiler the user interface can toggle.
+    """
+    profiles = ProfileStore(atlases=args.atlas)
+    if args.export_pack:
+        count = export_pack(
+            profiles.open(args.user, progressive=False), args.export_pack
+        )
+        print(f"Packed {count} images into {args.export_pack}")
+        return
+    if args.import_pack:
+        count = import_pack(
+            args.import_pack, profiles.open(args.user, progressive=False)
+        )
+        print(f"Imported {count} pictograms from {args.import_pack}")
+        return
+
+    watcher = None
+    if args.remote:
+        remote = RemoteRepository(args.remote)
+        service = PictogramService(remote, locale=args.locale)
+        watcher = RemoteWatcher(remote)
+    elif args.pack:
+        service = PictogramService(PackRepository(args.pack), locale=args.locale)
+    elif args.kiosk:
+        repository = MemoryRepository.snapshot(
+            SQLiteRepository(profiles.open(args.user, progressive=False))
+        )
+        service = PictogramService(repository, locale=args.locale)
+    else:
+        service = PictogramService(profiles.open(args.user), locale=args.locale)
+
+    budget = None
+    if args.memory_budget:
+        budget = MemoryBudget(args.memory_budget * 2**20)
+
+    if args.serve:
+        serve(service, args.host, args.port)
+    elif args.ui == "toga":
         # Toga app instantiation
-        app = UniVoTogaApp("UniVo", "org.univo.app")
+        app = UniVoTogaApp(
+            "UniVo",
+            "org.univo.app",
+            service=service,
+            use_atlas=args.atlas,
+            locale=args.locale,
+            watcher=watcher,
+            memory_budget=budget,
+            profiles=profiles,
+            profiler=profiler
+        )
         app.main_loop()
     else:
         # Textual TUI app instantiation
-        tui_app = UniVoTUIApp()
+        tui_app = UniVoTUIApp(
+            service,
+            locale=args.locale,
+            watcher=watcher,
+            memory_budget=budget,
+            profiles=profiles,
+            profiler=profiler
+        )
         tui_app.run()
 
 
@@ -4,6 +4,7 @@ Provides a responsive, cross-platform interface for pictogram-based communicatio
 Uses a dynamic render loop to switch between Home (categories) and Category views.
 """
 from collections.abc import Callable
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, cast
 
@@ -13,11 +14,25 @@ from toga.style import Pack
 # mypy doesn't see these exports easily in some toga versions
 from toga.style.pack import CENTER, COLUMN, ROW  # type: ignore
 
+from univo.core.database import DatabaseManager
+from univo.core.domain import Sentence
+from univo.core.interfaces import BoardWatcher
+from univo.core.maintenance import MaintenanceScheduler
+from univo.core.memory import MemoryBudget
+from univo.core.prediction import PredictionService
+from univo.core.profiles import DEFAULT_PROFILE, ProfileStore
+from univo.core.profiling import Profiler
 from univo.core.services import PictogramService
+from univo.core.tts import SpeechService, voice_for_locale
+from univo.core.usage import UsageLog
+from univo.core.watcher import ResourceWatcher
 
 if TYPE_CHECKING:
     from univo.core.domain import Category, Pictogram
 
+# Base path for resources
+BASE_PATH = Path(__file__).parent.parent.parent
+
 
 class UniVoTogaApp(toga.App):
     """The main Toga application class for UniVo.
@@ -25,19 +40,147 @@ class UniVoTogaApp(toga.App):
     Manages navigation state and coordinate widget rendering on the main window.
     """
 
+    def __init__(
+        self,
+        *args: Any,
+        service: PictogramService | None = None,
+        use_atlas: bool = False,
+        speech: SpeechService | None = None,
+        usage: UsageLog | None = None,
+        prediction: PredictionService | None = None,
+        locale: str | None = None,
+        watcher: BoardWatcher | None = None,
+        memory_budget: MemoryBudget | None = None,
+        profiles: ProfileStore | None = None,
+        profiler: Profiler | None = None,
+        **kwargs: Any
+    ) -> None:
+        """Initialize the Toga app.
+
+        Args:
+            service: The pictogram service to render.
+                     Defaults to a PictogramService on the default database.
+            use_atlas: Load category grids from per-category sprite atlases
+                       instead of one image file per pictogram.
+            speech: Text-to-speech output. Defaults to a SpeechService
+                    on the best installed offline engine.
+            usage: Log of pictogram selections. Defaults to a UsageLog
+                   on the service's database.
+            prediction: Next-pictogram suggestions. Defaults to a
+                        PredictionService learning from this service.
+            locale: Label language (e.g. 'pt-BR'). Defaults to the
+                    service's active locale.
+            watcher: Source of live board changes. Defaults to watching
+                     the resources directory of the service's database,
+                     if it has one.
+            memory_budget: Budget to keep to by shrinking the service's
+                           catalogs and the icon caches. None for no
+                           budget.
+            profiles: User profiles to switch between. Defaults to the
+                      device's profiles when no service is given, and
+                      to none otherwise.
+            profiler: CPU profiler toggled from the Help menu, possibly
+                      already running. Defaults to an idle sampling
+                      profiler.
+        """
+        self._initial_locale = locale
+        self._initial_watcher = watcher
+        self._initial_service = service
+        self._initial_speech = speech
+        self._initial_usage = usage
+        self._initial_prediction = prediction
+        self._initial_profiles = profiles
+        self.use_atlas = use_atlas
+        self.memory_budget = memory_budget
+        self.profiler = profiler or Profiler()
+        super().__init__(*args, **kwargs)
+
     def startup(self) -> None:
-        self.service = PictogramService()
+        service = self._initial_service
+        self.profiles = self._initial_profiles
+        if service is None:
+            self.profiles = self.profiles or ProfileStore(atlases=self.use_atlas)
+            service = PictogramService(self.profiles.open(DEFAULT_PROFILE))
+        self.service = service
+        # Name of the active profile; None when the service isn't one
+        self.profile = (
+            self.profiles.name_of(service.db) if self.profiles else None
+        )
+        if self._initial_locale is not None:
+            self.service.set_locale(self._initial_locale)
+        self.speech = self._initial_speech or SpeechService()
+        self.speech.voice = voice_for_locale(self.service.locale)
+        # Pre-synthesize every voice command so taps play at once
+        self.speech.prepare(self.service.voice_commands)
+        self.usage = self._initial_usage or UsageLog(self.service.db)
+        self.prediction = (
+            self._initial_prediction or PredictionService(self.service)
+        )
+        self.watcher = self._initial_watcher
+        if self.watcher is None and isinstance(self.service.db, DatabaseManager):
+            self.watcher = ResourceWatcher(self.service.db)
+        if self.watcher is not None:
+            self.watcher.subscribe(self.on_resources_changed)
+            self.watcher.start()
+        self.maintenance = MaintenanceScheduler(
+            self.service.db if isinstance(self.service.db, DatabaseManager) else None
+        )
+        self.maintenance.start()
+        self.commands.add(
+            toga.Command(
+                self.switch_locale,
+                text="Switch Language",
+                shortcut=toga.Key.MOD_1 + "l",
+                group=toga.Group.VIEW
+            )
+        )
+        self.commands.add(
+            toga.Command(
+                self.toggle_profiling,
+                text="Start/Stop Profiling",
+                shortcut=toga.Key.MOD_1 + "f",
+                group=toga.Group.HELP
+            )
+        )
+        if self.profile is not None:
+            self.commands.add(
+                toga.Command(
+                    self.switch_profile,
+                    text="Switch User",
+                    shortcut=toga.Key.MOD_1 + "u",
+                    group=toga.Group.VIEW
+                )
+            )
         # MainWindow might be seen as untyped or returning Union
         self.main_window = cast(Any, toga.MainWindow)(title=self.formal_name)
         
         # State: None means home (categories list), otherwise category ID
         self.current_category_id: str | None = None
+        # Icons keyed by asset hash (or path when the asset is unknown)
+        self.icons: dict[str, toga.Icon] = {}
+        # Images cut from category atlases, keyed by asset hash
+        self.atlas_images: dict[str, toga.Image] = {}
+        self.loaded_atlases: set[str] = set()
+        if self.memory_budget is not None:
+            self.memory_budget.register("service", self.shrink_service)
+            self.memory_budget.register("icons", self.shrink_icons)
         
         self.main_box = toga.Box(style=Pack(direction=COLUMN, margin=10))
+        # Title and grid of the current view, rebuilt on navigation
+        self.view_box = toga.Box(style=Pack(direction=COLUMN, flex=1))
         self.scroll_container = toga.ScrollContainer(
             horizontal=False, 
             style=Pack(flex=1)
         )
+        self.suggestion_box = toga.Box(
+            style=Pack(direction=ROW, margin_bottom=10, align_items=CENTER)
+        )
+        self.sentence = Sentence()
+        self.sentence_box = toga.Box(
+            style=Pack(direction=ROW, margin_bottom=10, align_items=CENTER)
+        )
+        # Shown while a first launch is still seeding categories
+        self.seed_bar = toga.ProgressBar(style=Pack(margin_top=10))
         
         self.render()
 
@@ -55,8 +198,7 @@ class UniVoTogaApp(toga.App):
         """
         self.main_box.clear()
         
-        # Base path for resources
-        base_path = Path(__file__).parent.parent.parent
+        base_path = BASE_PATH
         
         # --- Fixed Top Bar (Always Present) ---
         fixed_box = toga.Box(
@@ -71,19 +213,46 @@ class UniVoTogaApp(toga.App):
         )
         fixed_box.add(home_btn)
 
-        yes_pic = self.service.get_pictogram_by_id("yes")
-        if yes_pic:
-            fixed_box.add(self.create_pictogram_widget(yes_pic, base_path))
-            
-        fixed_box.add(toga.Box(style=Pack(width=10)))
-        
-        no_pic = self.service.get_pictogram_by_id("no")
-        if no_pic:
-            fixed_box.add(self.create_pictogram_widget(no_pic, base_path))
+        fixed, _ = self.service.get_many(["yes", "no"])
+        for i, pictogram in enumerate(fixed):
+            if i:
+                fixed_box.add(toga.Box(style=Pack(width=10)))
+            fixed_box.add(self.create_pictogram_widget(pictogram, base_path))
             
         self.main_box.add(fixed_box)
         # -------------------------
 
+        # --- Sentence Strip (Utterance Being Built) ---
+        self.render_sentence()
+        self.main_box.add(self.sentence_box)
+
+        # --- Suggestion Row (Predicted Next Pictograms) ---
+        self.render_suggestions(base_path)
+        self.main_box.add(self.suggestion_box)
+
+        self.render_view()
+        self.main_box.add(self.view_box)
+        self.render_seed_progress()
+
+    def render_seed_progress(self) -> None:
+        """Shows how many categories are seeded, until seeding is done."""
+        db = self.service.db
+        done, total = (
+            db.seed_progress if isinstance(db, DatabaseManager) else (0, 0)
+        )
+        if done < total:
+            self.seed_bar.max = total
+            self.seed_bar.value = done
+            if self.seed_bar not in self.main_box.children:
+                self.main_box.add(self.seed_bar)
+        elif self.seed_bar in self.main_box.children:
+            self.main_box.remove(self.seed_bar)
+
+    def render_view(self) -> None:
+        """Rebuilds only the current view (Home or Category)."""
+        self.maintenance.touch()
+        self.view_box.clear()
+        base_path = BASE_PATH
         grid_content = toga.Box(style=Pack(direction=COLUMN))
         
         if self.current_category_id is None:
@@ -98,7 +267,155 @@ class UniVoTogaApp(toga.App):
             )
 
         self.scroll_container.content = grid_content
-        self.main_box.add(self.scroll_container)
+        self.view_box.add(self.scroll_container)
+        if self.memory_budget is not None:
+            self.memory_budget.check()
+
+    def on_resources_changed(self, category_ids: set[str]) -> None:
+        """Watcher callback: hands the change over to the UI loop."""
+        self.loop.call_soon_threadsafe(self.apply_resource_changes, category_ids)
+
+    def apply_resource_changes(self, category_ids: set[str]) -> None:
+        """Patches the catalog and re-renders only an affected view."""
+        self.service.refresh(category_ids)
+        self.loaded_atlases -= category_ids
+        self.speech.prepare(self.service.voice_commands)
+        current = self.current_category_id
+        if current is None:
+            affected = any(
+                category is None or category.parent_id is None
+                for category in map(self.service.get_category_by_id, category_ids)
+            )
+        else:
+            affected = current in category_ids
+            if self.service.get_category_by_id(current) is None:
+                self.current_category_id = None
+        if affected:
+            self.render_view()
+        self.render_seed_progress()
+
+    def switch_locale(self, command: toga.Command, **kwargs: Any) -> bool:
+        """Cycles the label language and re-renders every label.
+
+        Returns:
+            True, as the command was handled.
+        """
+        catalog = self.service.set_locale(self.service.next_locale())
+        self.speech.voice = voice_for_locale(catalog.locale)
+        self.speech.prepare(self.service.voice_commands)
+        # Keep the sentence, relabelled in the new language
+        self.sentence = Sentence(
+            self.service.get_many([p.id for p in self.sentence])[0]
+        )
+        self.render()
+        return True
+
+    def toggle_profiling(self, command: toga.Command, **kwargs: Any) -> bool:
+        """Starts CPU profiling, or stops it and shows where it was saved.
+
+        Returns:
+            True, as the command was handled.
+        """
+        path = self.profiler.toggle()
+        if path is not None and self.main_window and not isinstance(
+            self.main_window, str
+        ):
+            self.loop.create_task(self.main_window.dialog(
+                toga.InfoDialog("Profiling", f"Profile saved to {path}")
+            ))
+        return True
+
+    def switch_profile(self, command: toga.Command, **kwargs: Any) -> bool:
+        """Switches to the next user profile.
+
+        Returns:
+            True, as the command was handled.
+        """
+        assert self.profiles is not None
+        self.use_profile(self.profiles.next_name(self.profile))
+        return True
+
+    def use_profile(self, name: str) -> None:
+        """Switches to a user profile's board, history and predictions.
+
+        Only the profile's metadata is loaded: icons (keyed by asset
+        hash) and the speech engine with its audio cache are kept.
+        """
+        assert self.profiles is not None
+        db = self.profiles.open(name)
+        if self.watcher is not None:
+            self.watcher.close()
+        self.usage.close()
+        self.prediction.close()
+        self.maintenance.close()
+
+        self.service = PictogramService(db, locale=self.service.locale)
+        self.usage = UsageLog(db)
+        self.prediction = PredictionService(self.service)
+        self.watcher = ResourceWatcher(db)
+        self.watcher.subscribe(self.on_resources_changed)
+        self.watcher.start()
+        self.maintenance = MaintenanceScheduler(db)
+        self.maintenance.start()
+        self.profile = name
+
+        self.current_category_id = None
+        self.sentence = Sentence()
+        # Atlases are per category, and category ids are per profile
+        self.loaded_atlases.clear()
+        self.speech.prepare(self.service.voice_commands)
+        self.render()
+
+    def render_sentence(self) -> None:
+        """Fills the sentence strip with the utterance and its controls."""
+        self.maintenance.touch()
+        self.sentence_box.clear()
+        self.sentence_box.add(
+            toga.Label(
+                str(self.sentence) or "…",
+                style=Pack(flex=1, font_size=14, font_weight="bold")
+            )
+        )
+        for text, action in (
+            ("🔊 Speak", self.speak_sentence),
+            ("⌫", self.remove_last_word),
+            ("✖", self.clear_sentence),
+        ):
+            self.sentence_box.add(
+                toga.Button(text, on_press=action, style=Pack(margin_left=5))
+            )
+
+    async def speak_sentence(self, widget: Any) -> None:
+        """Speaks the whole sentence as one phrase."""
+        if self.speech.speak_phrase(self.sentence.voice_commands):
+            return
+        # Text fallback when no TTS engine is installed
+        if self.sentence and self.main_window and not isinstance(
+            self.main_window, str
+        ):
+            await self.main_window.dialog(
+                toga.InfoDialog("Sentence", self.sentence.text)
+            )
+
+    def remove_last_word(self, widget: Any) -> None:
+        """Removes the last pictogram from the sentence."""
+        self.sentence.pop()
+        self.render_sentence()
+
+    def clear_sentence(self, widget: Any) -> None:
+        """Starts a new sentence (and a new prediction context)."""
+        self.sentence.clear()
+        self.prediction.reset()
+        self.render_sentence()
+        self.render_suggestions(BASE_PATH)
+
+    def render_suggestions(self, base_path: Path) -> None:
+        """Fills the suggestion row with the likely next pictograms."""
+        self.suggestion_box.clear()
+        for pictogram in self.prediction.suggest():
+            self.suggestion_box.add(
+                self.create_pictogram_widget(pictogram, base_path)
+            )
 
     def render_home(self, container: toga.Box, base_path: Path) -> None:
         """Displays all categories as interactive folder-like buttons."""
@@ -106,10 +423,10 @@ class UniVoTogaApp(toga.App):
             "Categories", 
             style=Pack(margin_bottom=10, font_size=16, font_weight="bold")
         )
-        self.main_box.add(title)
+        self.view_box.add(title)
         
         current_row: toga.Box | None = None
-        for i, category in enumerate(self.service.categories):
+        for i, category in enumerate(self.service.root_categories):
             if i % 3 == 0:
                 current_row = toga.Box(style=Pack(direction=ROW, margin=5))
                 container.add(current_row)
@@ -131,13 +448,38 @@ class UniVoTogaApp(toga.App):
             self.go_home(None) # Go back to home if category not found
             return
 
+        self.load_atlas(cat_id)
+
+        # One query for the whole path, however deep
+        crumbs = self.service.breadcrumbs(cat_id) or [category]
+        if len(crumbs) > 1:
+            crumb_box = toga.Box(style=Pack(direction=ROW, margin_bottom=5))
+            for ancestor in crumbs[:-1]:
+                crumb_box.add(
+                    toga.Button(
+                        f"📂 {ancestor.name}",
+                        on_press=partial(self.open_category, ancestor.id),
+                        style=Pack(margin_right=5)
+                    )
+                )
+            self.view_box.add(crumb_box)
+
         title = toga.Label(
-            f"Category: {category.name}", 
+            f"Category: {' › '.join(c.name for c in crumbs)}", 
             style=Pack(margin_bottom=10, font_size=16, font_weight="bold")
         )
-        self.main_box.add(title)
-        
+        self.view_box.add(title)
+
+        # Subcategories come from the cached catalog: no query per level
         current_row: toga.Box | None = None
+        for i, child in enumerate(category.children):
+            if i % 3 == 0:
+                current_row = toga.Box(style=Pack(direction=ROW, margin=5))
+                container.add(current_row)
+            if current_row:
+                current_row.add(self.create_category_widget(child))
+
+        current_row = None
         for i, pictogram in enumerate(category.pictograms):
             if i % 3 == 0:
                 current_row = toga.Box(style=Pack(direction=ROW, margin=5))
@@ -147,6 +489,10 @@ class UniVoTogaApp(toga.App):
             if current_row:
                 current_row.add(widget)
 
+    def open_category(self, cat_id: str, widget: Any) -> None:
+        """Navigation handler opening a category (e.g. a breadcrumb)."""
+        self.select_category(cat_id)
+
     def go_home(self, widget: Any) -> None:
         """Navigation handler to return to the category list."""
         self.current_category_id = None
@@ -203,14 +549,18 @@ class UniVoTogaApp(toga.App):
             style=Pack(direction=COLUMN, margin=5, width=120, align_items=CENTER)
         )
         
-        # Resolve Icon Path
-        icon = None
-        if pictogram.image_path:
-            full_path = base_path / pictogram.image_path
-            if full_path.exists():
-                icon = toga.Icon(full_path)
-            else:
-                print(f"Warning: Icon not found at {full_path}")
+        atlas_image = self.atlas_images.get(pictogram.asset_hash or "")
+        if atlas_image:
+            # Atlas cuts are images, not icons: show them above a text button
+            item_box.add(
+                toga.ImageView(atlas_image, style=Pack(width=100, height=100))
+            )
+            item_box.add(
+                toga.Button(pictogram.label, on_press=handler, style=Pack(width=100))
+            )
+            return item_box
+
+        icon = self.load_icon(pictogram, base_path)
         
         # Create Button (Icon OR Text, not both)
         if icon:
@@ -239,17 +589,65 @@ class UniVoTogaApp(toga.App):
         
         return item_box
 
+    def load_icon(self, pictogram: Pictogram, base_path: Path) -> toga.Icon | None:
+        """Returns the icon for a pictogram, preferring its thumbnail.
+
+        Icons are cached per asset, so identical images placed in several
+        categories are decoded once. The file comes from the repository,
+        which may first extract it (e.g. from a board pack).
+        """
+        image_path = pictogram.thumbnail_path or pictogram.image_path
+        if not image_path:
+            return None
+
+        key = pictogram.asset_hash or image_path
+        icon = self.icons.get(key)
+        if icon is None:
+            full_path = self.service.image_file(pictogram) or base_path / image_path
+            if not full_path.exists():
+                print(f"Warning: Icon not found at {full_path}")
+                return None
+            icon = self.icons[key] = toga.Icon(full_path)
+        return icon
+
+    def shrink_service(self) -> None:
+        """Drops the active service's catalogs of other languages."""
+        self.service.shrink()
+
+    def shrink_icons(self) -> None:
+        """Drops decoded icons and atlas cuts; widgets on screen keep theirs."""
+        self.icons = {}
+        self.atlas_images = {}
+        self.loaded_atlases = set()
+
+    def load_atlas(self, cat_id: str) -> None:
+        """Cuts a category's atlas into images, reading it once per category."""
+        if not self.use_atlas or cat_id in self.loaded_atlases:
+            return
+        atlas = self.service.get_atlas(cat_id)
+        if atlas:
+            for asset_hash, image in atlas.load().items():
+                self.atlas_images[asset_hash] = toga.Image(image)
+        self.loaded_atlases.add(cat_id)
+
     def create_handler(self, pictogram: Pictogram) -> Callable[[Any], Any]:
         """Creates an async handler for pictogram selection.
         
-        Eventually this will trigger TTS. Currently shows a dialog.
+        Speaks the voice command; without a TTS engine, shows it in a dialog.
         """
         async def handler(widget: Any) -> None:
             print(
                 f"Pictogram pressed: {pictogram.label}, "
                 f"Command: {pictogram.voice_command}"
             )
-            # Placeholder for TTS
+            self.usage.record(pictogram.id, self.current_category_id)
+            self.prediction.observe(pictogram.id)
+            self.sentence.append(pictogram)
+            self.render_sentence()
+            self.render_suggestions(BASE_PATH)
+            if self.speech.speak(pictogram.voice_command or pictogram.label):
+                return
+            # Text fallback when no TTS engine is installed
             if self.main_window and not isinstance(self.main_window, str):
                 await self.main_window.dialog(
                     toga.InfoDialog(
@@ -261,3 +659,14 @@ class UniVoTogaApp(toga.App):
 
         return handler
 
+    def on_exit(self) -> bool:
+        """Stops background work and flushes pending writes before quitting."""
+        if self.watcher is not None:
+            self.watcher.close()
+        self.speech.close()
+        self.usage.close()
+        self.prediction.close()
+        self.maintenance.close()
+        # Keep what a session toggled on measured
+        self.profiler.stop()
+        return True
@@ -3,11 +3,27 @@
 Provides a fast, keyboard-friendly interface for communication in the terminal.
 Uses a reactive component model to re-render the main view upon navigation.
 """
+import asyncio
+import hashlib
+import re
+from collections.abc import Iterable
+
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, ScrollableContainer
-from textual.widgets import Button, Footer, Header, Static
+from textual.widgets import Button, Footer, Header, ProgressBar, Static
 
+from univo.core.database import DatabaseManager
+from univo.core.domain import Category, Pictogram, Sentence
+from univo.core.interfaces import BoardWatcher
+from univo.core.maintenance import MaintenanceScheduler
+from univo.core.memory import MemoryBudget, memory_report
+from univo.core.prediction import PredictionService
+from univo.core.profiles import DEFAULT_PROFILE, ProfileStore
+from univo.core.profiling import Profiler
 from univo.core.services import PictogramService
+from univo.core.tts import SpeechService, voice_for_locale
+from univo.core.usage import UsageLog
+from univo.core.watcher import ResourceWatcher
 
 
 class UniVoTUIApp(App[None]):
@@ -25,9 +41,37 @@ class UniVoTUIApp(App[None]):
         content-align: center middle;
         padding: 1;
     }
+    #sentence {
+        height: auto;
+    }
+    #sentence Button {
+        width: 8;
+    }
+    #sentence-text {
+        width: 1fr;
+        padding: 1;
+        text-style: bold;
+    }
+    #breadcrumbs {
+        height: auto;
+    }
+    #breadcrumbs Button {
+        width: auto;
+    }
+    #suggestions {
+        height: auto;
+    }
+    .suggestion-btn {
+        width: 1fr;
+        border: tall $accent;
+    }
     #main-container {
         padding: 1;
     }
+    #seed-progress {
+        height: auto;
+        padding: 0 1;
+    }
     .grid {
         layout: grid;
         grid-size: 3;
@@ -61,25 +105,294 @@ class UniVoTUIApp(App[None]):
 
     """
     
-    BINDINGS = [("d", "toggle_dark", "Toggle dark mode"), ("q", "quit", "Quit")]
+    BINDINGS = [
+        ("d", "toggle_dark", "Toggle dark mode"),
+        ("l", "switch_locale", "Switch language"),
+        ("m", "memory_report", "Memory"),
+        ("u", "switch_profile", "Switch user"),
+        ("f", "toggle_profiling", "Profile"),
+        ("q", "quit", "Quit"),
+    ]
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        service: PictogramService | None = None,
+        speech: SpeechService | None = None,
+        usage: UsageLog | None = None,
+        prediction: PredictionService | None = None,
+        *,
+        locale: str | None = None,
+        watcher: BoardWatcher | None = None,
+        memory_budget: MemoryBudget | None = None,
+        profiles: ProfileStore | None = None,
+        profiler: Profiler | None = None
+    ) -> None:
+        """Initialize the TUI.
+
+        Args:
+            service: The pictogram service to render.
+                     Defaults to a PictogramService on the default database.
+            speech: Text-to-speech output. Defaults to a SpeechService
+                    on the best installed offline engine.
+            usage: Log of pictogram selections. Defaults to a UsageLog
+                   on the service's database.
+            prediction: Next-pictogram suggestions. Defaults to a
+                        PredictionService learning from this service.
+            locale: Label language (e.g. 'pt-BR'). Defaults to the
+                    service's active locale.
+            watcher: Source of live board changes. Defaults to watching
+                     the resources directory of the service's database,
+                     if it has one.
+            memory_budget: Budget to keep to by shrinking the service's
+                           catalogs and the widget id map. None for no
+                           budget.
+            profiles: User profiles to switch between. Defaults to the
+                      device's profiles when no service is given, and
+                      to none otherwise.
+            profiler: CPU profiler toggled with ``f``, possibly already
+                      running. Defaults to an idle sampling profiler.
+        """
         super().__init__()
-        self.service = PictogramService()
+        if service is None:
+            profiles = profiles or ProfileStore()
+            service = PictogramService(profiles.open(DEFAULT_PROFILE))
+        self.service = service
+        self.profiles = profiles
+        # Name of the active profile; None when the service isn't one
+        self.profile = profiles.name_of(service.db) if profiles else None
+        if locale is not None:
+            self.service.set_locale(locale)
+        self.speech = speech or SpeechService()
+        self.speech.voice = voice_for_locale(self.service.locale)
+        self.usage = usage or UsageLog(self.service.db)
+        self.prediction = prediction or PredictionService(self.service)
+        if watcher is None and isinstance(self.service.db, DatabaseManager):
+            watcher = ResourceWatcher(self.service.db)
+        self.watcher = watcher
+        self.maintenance = MaintenanceScheduler(
+            self.service.db if isinstance(self.service.db, DatabaseManager) else None
+        )
         self.current_category_id: str | None = None
+        self.sentence = Sentence()
+        # Widget id -> category or pictogram id it stands for
+        self.targets: dict[str, str] = {}
+        self.profiler = profiler or Profiler()
+        self.memory_budget = memory_budget
+        if memory_budget is not None:
+            memory_budget.register("service", self.shrink_service)
+            memory_budget.register("widgets", self.shrink_targets)
 
     def compose(self) -> ComposeResult:
         """Defines the initial layout of the application."""
         yield Header()
         with Horizontal(id="fixed-bar"):
             yield Button("🏠 Home", id="btn-home")
-            yield Button("Sim", id="btn-yes", variant="success")
-            yield Button("Não", id="btn-no", variant="error")
-            
+            yes, no = self.labels_of(["yes", "no"])
+            yield Button(yes, id="btn-yes", variant="success")
+            yield Button(no, id="btn-no", variant="error")
+
+        with Horizontal(id="sentence"):
+            yield Static("…", id="sentence-text")
+            yield Button("🔊", id="act-speak")
+            yield Button("⌫", id="act-back")
+            yield Button("✖", id="act-clear")
+
+        yield Horizontal(*self.render_suggestions(), id="suggestions")
+
         with ScrollableContainer(id="main-container"):
             yield from self.render_content()
+        # Shown while a first launch is still seeding categories
+        yield ProgressBar(id="seed-progress", show_eta=False)
         yield Footer()
 
+    def on_mount(self) -> None:
+        """Pre-synthesizes every voice command so taps play at once."""
+        self.speech.prepare(self.service.voice_commands)
+        self.refresh_seed_progress()
+        if self.watcher is not None:
+            self.watcher.subscribe(self.on_resources_changed)
+            self.watcher.start()
+        self.maintenance.start()
+
+    def on_unmount(self) -> None:
+        """Stops background work and flushes pending writes."""
+        if self.watcher is not None:
+            self.watcher.close()
+        self.speech.close()
+        self.usage.close()
+        self.prediction.close()
+        self.maintenance.close()
+        # Keep what a session toggled on measured
+        self.profiler.stop()
+
+    def on_resources_changed(self, category_ids: set[str]) -> None:
+        """Watcher callback: hands the change over to the UI thread."""
+        try:
+            self.call_from_thread(self.apply_resource_changes, category_ids)
+        except RuntimeError:
+            pass  # The app is shutting down
+
+    def apply_resource_changes(self, category_ids: set[str]) -> None:
+        """Patches the catalog and re-renders only an affected view."""
+        self.service.refresh(category_ids)
+        self.speech.prepare(self.service.voice_commands)
+        current = self.current_category_id
+        if current is None:
+            affected = any(
+                category is None or category.parent_id is None
+                for category in map(self.service.get_category_by_id, category_ids)
+            )
+        else:
+            affected = current in category_ids
+            if self.service.get_category_by_id(current) is None:
+                self.current_category_id = None
+        if affected:
+            self.call_later(self.refresh_view)
+        self.refresh_seed_progress()
+
+    def refresh_seed_progress(self) -> None:
+        """Shows how many categories are seeded, until seeding is done."""
+        db = self.service.db
+        done, total = (
+            db.seed_progress if isinstance(db, DatabaseManager) else (0, 0)
+        )
+        bar = self.query_one("#seed-progress", ProgressBar)
+        bar.display = done < total
+        bar.update(total=total, progress=done)
+
+    def widget_id(self, prefix: str, target_id: str) -> str:
+        """A valid widget id for a category or pictogram id.
+
+        Ids Textual would reject (e.g. the '/' of nested categories) are
+        sanitized and suffixed with a short hash to stay unique.
+        """
+        safe = re.sub(r"[^A-Za-z0-9_-]", "-", target_id)
+        if safe != target_id:
+            digest = hashlib.sha1(target_id.encode(), usedforsecurity=False)
+            safe = f"{safe}-{digest.hexdigest()[:8]}"
+        widget_id = f"{prefix}-{safe}"
+        self.targets[widget_id] = target_id
+        return widget_id
+
+    def target_of(self, widget_id: str) -> str:
+        """The category or pictogram id behind a widget id."""
+        return self.targets.get(widget_id, widget_id.partition("-")[2])
+
+    def shrink_service(self) -> None:
+        """Drops the active service's catalogs of other languages."""
+        self.service.shrink()
+
+    def shrink_targets(self) -> None:
+        """Forgets the ids of widgets that are no longer mounted."""
+        mounted = {widget.id for widget in self.query(Button)}
+        self.targets = {
+            widget_id: target
+            for widget_id, target in self.targets.items()
+            if widget_id in mounted
+        }
+
+    def labels_of(self, pictogram_ids: list[str]) -> list[str]:
+        """Labels of pictograms in the active locale (the id if unknown)."""
+        found, _ = self.service.get_many(pictogram_ids)
+        labels = {p.id: p.label for p in found}
+        return [labels.get(pic_id, pic_id) for pic_id in pictogram_ids]
+
+    async def action_switch_locale(self) -> None:
+        """Cycles the label language and re-renders every label."""
+        catalog = self.service.set_locale(self.service.next_locale())
+        self.speech.voice = voice_for_locale(catalog.locale)
+        self.speech.prepare(self.service.voice_commands)
+        # Keep the sentence, relabelled in the new language
+        self.sentence = Sentence(
+            self.service.get_many([p.id for p in self.sentence])[0]
+        )
+        self.refresh_fixed_labels()
+        self.refresh_sentence()
+        await self.refresh_suggestions()
+        await self.refresh_view()
+        self.notify(f"Language: {catalog.locale or 'default'}")
+
+    async def action_switch_profile(self) -> None:
+        """Switches to the next user profile."""
+        if self.profiles is None or self.profile is None:
+            self.notify("No user profiles on this board", severity="warning")
+            return
+        await self.use_profile(self.profiles.next_name(self.profile))
+
+    async def use_profile(self, name: str) -> None:
+        """Switches to a user profile's board, history and predictions.
+
+        Only the profile's metadata is loaded: the speech engine and
+        its audio cache stay as they are.
+        """
+        assert self.profiles is not None
+        db = self.profiles.open(name)
+        if self.watcher is not None:
+            # Off the event loop: the watcher may be waiting on it to
+            # deliver a change (call_from_thread)
+            await asyncio.to_thread(self.watcher.close)
+        self.usage.close()
+        self.prediction.close()
+        self.maintenance.close()
+
+        self.service = PictogramService(db, locale=self.service.locale)
+        self.usage = UsageLog(db)
+        self.prediction = PredictionService(self.service)
+        self.watcher = ResourceWatcher(db)
+        self.watcher.subscribe(self.on_resources_changed)
+        self.watcher.start()
+        self.maintenance = MaintenanceScheduler(db)
+        self.maintenance.start()
+        self.profile = name
+
+        self.current_category_id = None
+        self.sentence = Sentence()
+        self.speech.prepare(self.service.voice_commands)
+        self.refresh_fixed_labels()
+        self.refresh_sentence()
+        await self.refresh_suggestions()
+        await self.refresh_view()
+        self.refresh_seed_progress()
+        self.notify(f"User: {name}")
+
+    def refresh_fixed_labels(self) -> None:
+        """Relabels the fixed yes/no buttons."""
+        yes, no = self.labels_of(["yes", "no"])
+        self.query_one("#btn-yes", Button).label = yes
+        self.query_one("#btn-no", Button).label = no
+
+    def action_toggle_profiling(self) -> None:
+        """Starts CPU profiling, or stops it and saves the results."""
+        path = self.profiler.toggle()
+        if path is None:
+            self.notify(f"Profiling ({self.profiler.mode}); press f again to stop")
+        else:
+            self.notify(f"Profile saved to {path}", title="Profiling", timeout=10)
+
+    def action_memory_report(self) -> None:
+        """Shows where memory goes, by subsystem (starts tracing at first)."""
+        self.notify(memory_report(), title="Memory", timeout=10)
+
+    def render_suggestions(self) -> list[Button]:
+        """Buttons for the likely next pictograms."""
+        return [
+            Button(
+                f"➜ {pictogram.label}",
+                id=self.widget_id("sug", pictogram.id),
+                classes="suggestion-btn"
+            ) for pictogram in self.prediction.suggest()
+        ]
+
+    def refresh_sentence(self) -> None:
+        """Shows the current sentence in the strip."""
+        self.query_one("#sentence-text", Static).update(str(self.sentence) or "…")
+
+    async def refresh_suggestions(self) -> None:
+        """Replaces the suggestion row after a selection."""
+        row = self.query_one("#suggestions")
+        await row.remove_children()
+        await row.mount_all(self.render_suggestions())
+
     def render_content(self) -> ComposeResult:
         """Renders the dynamic part of the UI (Home or Category)."""
         if self.current_category_id is None:
@@ -87,13 +400,7 @@ class UniVoTUIApp(App[None]):
             yield Static("Categories", classes="title")
 
             yield Horizontal(
-                *[
-                    Button(
-                        f"📂 {category.name}", 
-                        id=f"cat-{category.id}",
-                        classes="category-btn"
-                    ) for category in self.service.categories
-                ],
+                *self.category_buttons(self.service.root_categories),
                 classes="grid"
             )
 
@@ -102,20 +409,46 @@ class UniVoTUIApp(App[None]):
             cat_id = self.current_category_id
             category_obj = self.service.get_category_by_id(cat_id)
             if category_obj:
-                yield Static(f"Category: {category_obj.name}", classes="title")
+                # One query for the whole path, however deep
+                crumbs = self.service.breadcrumbs(cat_id)
+                if len(crumbs) > 1:
+                    yield Horizontal(
+                        *self.category_buttons(crumbs[:-1]), id="breadcrumbs"
+                    )
+                path = " › ".join(c.name for c in crumbs) or category_obj.name
+                yield Static(f"Category: {path}", classes="title")
+                if category_obj.children:
+                    yield Horizontal(
+                        *self.category_buttons(category_obj.children),
+                        classes="grid"
+                    )
                 yield Horizontal(
                     *[
-                        Button(pictogram.label, id=f"btn-{pictogram.id}")
+                        Button(
+                            pictogram.label,
+                            id=self.widget_id("btn", pictogram.id)
+                        )
                         for pictogram in category_obj.pictograms
                     ],
                     classes="grid"
                 )
 
+    def category_buttons(self, categories: Iterable[Category]) -> list[Button]:
+        """Folder buttons opening each category."""
+        return [
+            Button(
+                f"📂 {category.name}", 
+                id=self.widget_id("cat", category.id),
+                classes="category-btn"
+            ) for category in categories
+        ]
+
 
 
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Global button click handler for navigation and selection."""
+        self.maintenance.touch()
         button_id = event.button.id
         if not button_id:
             return
@@ -124,17 +457,37 @@ class UniVoTUIApp(App[None]):
             self.current_category_id = None
             await self.refresh_view()
         elif button_id.startswith("cat-"):
-            self.current_category_id = button_id.replace("cat-", "")
+            self.current_category_id = self.target_of(button_id)
             await self.refresh_view()
-        elif button_id == "btn-yes":
-            self.notify("Selecionado: Sim")
-        elif button_id == "btn-no":
-            self.notify("Selecionado: Não")
-        elif button_id.startswith("btn-"):
-            pic_id = button_id.replace("btn-", "")
-            pictogram = self.service.get_pictogram_by_id(pic_id)
+        elif button_id == "act-speak":
+            if not self.speech.speak_phrase(self.sentence.voice_commands):
+                self.notify(self.sentence.text or "…")
+        elif button_id == "act-back":
+            self.sentence.pop()
+            self.refresh_sentence()
+        elif button_id == "act-clear":
+            self.sentence.clear()
+            self.prediction.reset()
+            self.refresh_sentence()
+            await self.refresh_suggestions()
+        elif button_id.startswith(("btn-", "sug-")):
+            pic_id = self.target_of(button_id)
+            pictogram = await self.select_pictogram(pic_id)
             if pictogram:
-                self.notify(f"Selecionado: {pictogram.label}")
+                # The label is already in the active language
+                self.notify(pictogram.label)
+
+    async def select_pictogram(self, pictogram_id: str) -> Pictogram | None:
+        """Speaks and logs a pictogram selection without blocking the UI."""
+        pictogram = self.service.get_pictogram_by_id(pictogram_id)
+        if pictogram:
+            self.usage.record(pictogram.id, self.current_category_id)
+            self.speech.speak(pictogram.voice_command or pictogram.label)
+            self.prediction.observe(pictogram.id)
+            self.sentence.append(pictogram)
+            self.refresh_sentence()
+            await self.refresh_suggestions()
+        return pictogram
 
     async def refresh_view(self) -> None:
         """Clears the main container and re-mounts the current content."""
@@ -145,6 +498,8 @@ class UniVoTUIApp(App[None]):
         
         # Mount new content
         await container.mount_all(list(self.render_content()))
+        if self.memory_budget is not None:
+            self.memory_budget.check()
 
 
 if __name__ == "__main__":